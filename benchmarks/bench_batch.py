@@ -0,0 +1,52 @@
+"""
+Benchmark: many small plans, one Scheduler setup each vs. plan_many.
+
+"per plan" mimics the old usage (new loader and scheduler, transport
+re-read, runtime logged per plan); plan_many shares the parsed modes
+and reuses worker processes.
+
+Usage:
+    python benchmarks/bench_batch.py [n_scenarios] [relatives_per_scenario] [workers]
+"""
+
+import contextlib
+import io
+import sys
+import time
+
+from minseo_planner.batch import plan_many
+from minseo_planner.data_loader import DataLoader
+from minseo_planner.scheduler import Scheduler
+from minseo_planner.synthetic import generate_relatives
+
+RESTARTS = 20
+
+
+def per_plan(scenarios):
+    for relatives in scenarios:
+        modes = DataLoader().load_transport("transport.csv")
+        with contextlib.redirect_stdout(io.StringIO()):
+            Scheduler(restarts=RESTARTS, seed=0).generate_best_schedule(relatives, modes)
+
+
+def main(argv):
+    n = int(argv[0]) if argv else 200
+    size = int(argv[1]) if len(argv) > 1 else 30
+    workers = int(argv[2]) if len(argv) > 2 else 2
+    scenarios = [generate_relatives(size, seed=i) for i in range(n)]
+
+    start = time.perf_counter()
+    per_plan(scenarios)
+    print(f"per plan           : {time.perf_counter() - start:7.3f} s")
+
+    for w in (1, workers):
+        start = time.perf_counter()
+        results = list(plan_many(
+            [{"relatives": r} for r in scenarios], workers=w, restarts=RESTARTS, seed=0
+        ))
+        failed = sum(not r["ok"] for r in results)
+        print(f"plan_many workers={w}: {time.perf_counter() - start:7.3f} s  ({failed} failed)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,98 @@
+"""
+Benchmark: pairwise distance construction and lookup cost.
+
+Compares the previous networkx graph (one haversine() call per pair,
+distance stored as an edge attribute) against the dense NumPy matrix
+built by utils.distance_matrix().
+
+Usage:
+    python benchmarks/bench_distance.py [n ...]
+"""
+
+import random
+import sys
+import time
+
+import numpy as np
+
+from minseo_planner.utils import haversine, distance_matrix
+
+try:
+    import networkx as nx
+except ImportError:  # networkx is no longer a planner dependency
+    nx = None
+
+# Above this size the pure-Python graph build takes minutes and GBs of RAM
+GRAPH_LIMIT = 1000
+LOOKUPS = 200_000
+
+
+def random_points(n, seed=0):
+    rng = random.Random(seed)
+    lats = [37.45 + rng.random() * 0.2 for _ in range(n)]
+    lons = [126.90 + rng.random() * 0.25 for _ in range(n)]
+    return lats, lons
+
+
+def build_graph(lats, lons):
+    G = nx.Graph()
+    n = len(lats)
+    G.add_nodes_from(range(n))
+    for i in range(n):
+        for j in range(i + 1, n):
+            G.add_edge(i, j, distance_km=haversine(lats[i], lons[i], lats[j], lons[j]))
+    return G
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def bench(n):
+    lats, lons = random_points(n)
+    rng = random.Random(1)
+    pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(LOOKUPS)]
+    pairs = [(i, j) for i, j in pairs if i != j]
+
+    row = {"n": n}
+
+    D64, row["matrix64_build_s"] = timed(distance_matrix, lats, lons)
+    D32, row["matrix32_build_s"] = timed(distance_matrix, lats, lons, dtype=np.float32)
+    row["matrix64_mb"] = D64.nbytes / 1e6
+    row["matrix32_mb"] = D32.nbytes / 1e6
+
+    start = time.perf_counter()
+    for i, j in pairs:
+        D64[i, j]
+    row["matrix_lookup_ns"] = (time.perf_counter() - start) / len(pairs) * 1e9
+
+    if nx is not None and n <= GRAPH_LIMIT:
+        G, row["graph_build_s"] = timed(build_graph, lats, lons)
+        start = time.perf_counter()
+        for i, j in pairs:
+            G[i][j]["distance_km"]
+        row["graph_lookup_ns"] = (time.perf_counter() - start) / len(pairs) * 1e9
+
+    return row
+
+
+def main(argv):
+    sizes = [int(a) for a in argv] or [10, 1000, 10000]
+    for n in sizes:
+        row = bench(n)
+        print(f"n={row['n']}")
+        print(f"  matrix build  : float64 {row['matrix64_build_s']:.4f}s "
+              f"({row['matrix64_mb']:.1f} MB), float32 {row['matrix32_build_s']:.4f}s "
+              f"({row['matrix32_mb']:.1f} MB)")
+        print(f"  matrix lookup : {row['matrix_lookup_ns']:.0f} ns")
+        if "graph_build_s" in row:
+            print(f"  graph build   : {row['graph_build_s']:.4f}s")
+            print(f"  graph lookup  : {row['graph_lookup_ns']:.0f} ns")
+        else:
+            print("  graph         : skipped")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,63 @@
+"""
+Benchmark: relative loading, row-by-row csv vs. columnar parse vs. npz cache.
+
+Writes a synthetic relatives CSV of n rows to a temporary directory.
+
+Usage:
+    python benchmarks/bench_loader.py [n_rows]
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import time
+
+from minseo_planner.data_loader import DataLoader
+from minseo_planner.models import Relative
+from minseo_planner.synthetic import generate_relatives, write_relatives_csv
+
+
+def dict_reader_load(path):
+    """The previous loader: csv.DictReader, one Relative per row."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [
+            Relative(
+                name=row["Relative"], district=row["District"],
+                latitude=float(row["Lat"]), longitude=float(row["Lon"]),
+                preferred_days=[d.strip() for d in row["PreferredDays"].split(",")],
+                preferred_window=tuple(row["PreferredTime"].split("-")),
+                happiness_bonus=float(row["Bonus"]), duration=int(row["Duration"]),
+            )
+            for row in csv.DictReader(f)
+        ]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main(argv):
+    n = int(argv[0]) if argv else 200000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "relatives.csv")
+        write_relatives_csv(path, generate_relatives(n))
+        loader = DataLoader(cache_dir=os.path.join(tmp, "cache"))
+
+        print(f"rows: {n}")
+        seconds, _ = timed(lambda: dict_reader_load(path))
+        print(f"  csv.DictReader -> objects : {seconds:7.3f} s")
+        seconds, _ = timed(lambda: loader.load_relative_table(path))
+        print(f"  columnar, cold (+ cache)  : {seconds:7.3f} s")
+        seconds, _ = timed(lambda: loader.load_relative_table(path))
+        print(f"  columnar, warm cache      : {seconds:7.3f} s  (hit={loader.cache_hit})")
+        os.utime(path)
+        seconds, _ = timed(lambda: loader.load_relative_table(path))
+        print(f"  touched file (hash check) : {seconds:7.3f} s  (hit={loader.cache_hit})")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,63 @@
+"""
+Benchmark: local search vs. pure random restarts at equal wall-clock time.
+
+For each time budget, "restarts" keeps running greedy restarts until
+the budget is spent; "restarts+ls" runs restarts for half the budget
+and spends the rest improving the best one with LocalSearch.
+
+Usage:
+    python benchmarks/bench_local_search.py [n_relatives] [budget_s ...]
+"""
+
+import sys
+import time
+
+from minseo_planner.data_loader import DataLoader
+from minseo_planner.scheduler import Scheduler
+from minseo_planner.synthetic import generate_relatives
+
+CHUNK = 10
+
+
+def restarts_for(scheduler, relatives, modes, budget):
+    """Best restart found within `budget` seconds."""
+    deadline = time.perf_counter() + budget
+    best = None
+    index = 0
+    while time.perf_counter() < deadline:
+        winner, _ = scheduler.best_of_restarts(relatives, modes, 0, index, index + CHUNK)
+        index += CHUNK
+        if best is None or winner[1] > best[1]:
+            best = winner
+    return best, index
+
+
+def main(argv):
+    n = int(argv[0]) if argv else 0
+    budgets = [float(a) for a in argv[1:]] or [0.1, 0.5, 2.0]
+
+    loader = DataLoader()
+    modes = loader.load_transport("transport.csv")
+    relatives = generate_relatives(n) if n else loader.load_relatives("relatives.csv")
+    print(f"relatives: {len(relatives)}")
+
+    scheduler = Scheduler(improve_time=None)
+    scheduler.build_travel_table(relatives, modes)
+
+    for budget in budgets:
+        pure, pure_restarts = restarts_for(scheduler, relatives, modes, budget)
+
+        start = time.perf_counter()
+        half, half_restarts = restarts_for(scheduler, relatives, modes, budget / 2)
+        scheduler.improve_time = budget - (time.perf_counter() - start)
+        _, totals, stats = scheduler.improve_schedule(half[2], relatives)
+
+        print(f"budget {budget:.2f}s")
+        print(f"  restarts    : {pure[1]:8.2f}  ({pure_restarts} restarts)")
+        print(f"  restarts+ls : {totals['final_score']:8.2f}  ({half_restarts} restarts, "
+              f"{stats['evaluations']} moves evaluated, stopped by {stats['stopped_by']})")
+        print(f"  gain        : {totals['final_score'] - pure[1]:+8.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,74 @@
+"""
+Benchmark: compiled mode policy with and without dominance pruning.
+
+Plans a synthetic instance with a larger transport menu, where the
+long-distance band allows five modes and two of them are beaten on
+both minutes and cost (a taxi by the train, a slow bus by the bus).
+Reports the modes left per band, table build time, per-restart time,
+mode evaluations per restart and the best score for both settings.
+
+Usage:
+    python benchmarks/bench_mode_policy.py [n_relatives] [restarts]
+"""
+
+import sys
+import time
+
+from minseo_planner.instrumentation import Instrumentation
+from minseo_planner.mode_policy import ModePolicy
+from minseo_planner.scheduler import Scheduler
+from minseo_planner.synthetic import DEFAULT_MODES, generate_relatives, generate_transport
+
+MODES = DEFAULT_MODES + [
+    ("Taxi", 30, 10, 3),
+    ("Slow bus", 20, 2, 8),
+    ("Express", 100, 6, 1),
+]
+
+BANDS = [
+    (0, True, ("Walking", "Bicycle")),
+    (1, True, ("Bicycle", "Bus")),
+    (3, False, ("Bus", "Train", "Taxi", "Slow bus", "Express")),
+]
+
+
+def run(label, relatives, modes, restarts, prune):
+    scheduler = Scheduler(day_cache_size=0, mode_policy=ModePolicy(BANDS, prune_dominated=prune))
+    start = time.perf_counter()
+    table = scheduler.build_travel_table(relatives, modes)
+    build = time.perf_counter() - start
+    per_band = " / ".join(str(len(ids)) for ids in table.band_modes)
+
+    start = time.perf_counter()
+    winner, _ = scheduler.best_of_restarts(relatives, modes, 0, 0, restarts)
+    per_restart = (time.perf_counter() - start) / restarts
+
+    # Mode evaluations from one more pass, instrumented
+    scheduler.instrument = Instrumentation()
+    scheduler.best_of_restarts(relatives, modes, 0, 0, restarts)
+    counters = scheduler.instrument.counters
+    evaluated = sum(counters.get(name, 0) for name in (
+        "reject_allowed_hours", "reject_preferred_window", "reject_departure_overflow",
+    ))
+    print(f"  {label:10s}: modes per band {per_band}, build {build:6.3f} s, "
+          f"{per_restart * 1e3:7.2f} ms/restart, {evaluated / restarts:8.0f} mode rejections/restart, "
+          f"best {winner[1]:8.2f}")
+    return scheduler
+
+
+def main(argv):
+    n = int(argv[0]) if argv else 1000
+    restarts = int(argv[1]) if len(argv) > 1 else 20
+    relatives = generate_relatives(n)
+    modes = generate_transport(MODES)
+
+    print(f"relatives: {n}, modes: {', '.join(m.name for m in modes)}")
+    run("all modes", relatives, modes, restarts, prune=False)
+    pruned = run("pruned", relatives, modes, restarts, prune=True)
+    print("  dropped: " + "; ".join(
+        f"band {b}: {', '.join(names) or '-'}" for b, names in enumerate(pruned.policy.pruned)
+    ))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
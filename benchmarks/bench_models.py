@@ -0,0 +1,104 @@
+"""
+Benchmark: memory and greedy throughput of the relative models.
+
+Compares the previous dict-based Relative (re-declared below), the
+__slots__ Relative and the column-backed RelativeTable.
+
+Usage:
+    python benchmarks/bench_models.py [n_relatives]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from minseo_planner.data_loader import DataLoader
+from minseo_planner.models import Relative, RelativeTable
+from minseo_planner.scheduler import Scheduler
+from minseo_planner.synthetic import generate_relatives
+from minseo_planner.utils import parse_hhmm
+
+RESTARTS = 20
+
+
+class DictRelative:
+    """The Relative class as it was before __slots__."""
+
+    def __init__(self, name, latitude, longitude, preferred_days, preferred_window,
+                 happiness_bonus, district=None, duration=0):
+        self.name = name
+        self.latitude = latitude
+        self.longitude = longitude
+        self.preferred_days = preferred_days
+        self.preferred_window = preferred_window
+        self.window_start = parse_hhmm(preferred_window[0])
+        self.window_end = parse_hhmm(preferred_window[1])
+        self.happiness_bonus = happiness_bonus
+        self.district = district
+        self.duration = duration
+        self.arrival_time_str = None
+        self.departure_time_str = None
+        self.chosen_mode = None
+        self.travel_minutes = 0
+        self.travel_cost = 0
+        self.travel_distance = 0
+
+
+def as_dict_relatives(relatives):
+    return [
+        DictRelative(r.name, r.latitude, r.longitude, list(r.preferred_days),
+                     r.preferred_window, r.happiness_bonus, r.district, r.duration)
+        for r in relatives
+    ]
+
+
+def as_slot_relatives(relatives):
+    return [
+        Relative(r.name, r.latitude, r.longitude, list(r.preferred_days),
+                 r.preferred_window, r.happiness_bonus, r.district, r.duration)
+        for r in relatives
+    ]
+
+
+def traced_bytes(build):
+    """
+    Bytes still allocated after build() returns (the result is kept
+    alive). Names and window strings are shared with the source list,
+    so this is the per-object overhead of each model.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def restarts_per_second(relatives, modes):
+    scheduler = Scheduler(day_cache_size=0)
+    scheduler.build_travel_table(relatives, modes)
+    start = time.perf_counter()
+    scheduler.best_of_restarts(relatives, modes, 0, 0, RESTARTS)
+    return RESTARTS / (time.perf_counter() - start)
+
+
+def main(argv):
+    n = int(argv[0]) if argv else 10000
+    modes = DataLoader().load_transport("transport.csv")
+    relatives = generate_relatives(n)
+
+    dict_bytes, dict_relatives = traced_bytes(lambda: as_dict_relatives(relatives))
+    slot_bytes, slot_relatives = traced_bytes(lambda: as_slot_relatives(relatives))
+    table_bytes, _ = traced_bytes(lambda: RelativeTable.from_relatives(relatives))
+
+    print(f"relatives: {n}")
+    print(f"  bytes/relative  dict {dict_bytes / n:7.0f}  slots {slot_bytes / n:7.0f}  "
+          f"table {table_bytes / n:7.0f}")
+
+    small = min(n, 2000)
+    print(f"  restarts/s (n={small})  dict {restarts_per_second(dict_relatives[:small], modes):7.1f}  "
+          f"slots {restarts_per_second(slot_relatives[:small], modes):7.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
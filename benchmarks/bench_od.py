@@ -0,0 +1,69 @@
+"""
+Benchmark: haversine travel model vs. a memory-mapped OD matrix.
+
+Writes a synthetic OD matrix (haversine minutes/cost scaled by 1.3, as
+a stand-in for road detours) for n relatives, with a share of pairs
+left unknown so the fallback path runs too. Reports table build time
+and per-restart time.
+
+Usage:
+    python benchmarks/bench_od.py [n_relatives] [missing_share]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from minseo_planner.od_matrix import write_od_matrix
+from minseo_planner.scheduler import Scheduler
+from minseo_planner.synthetic import generate_relatives, generate_transport
+from minseo_planner.utils import distance_matrix
+
+RESTARTS = 20
+DETOUR = 1.3
+
+
+def write_matrix(path, relatives, modes, missing_share):
+    dist = distance_matrix([r.latitude for r in relatives], [r.longitude for r in relatives])
+    speed = np.array([m.speed for m in modes])
+    minutes = DETOUR * dist[..., None] / speed * 60 + np.array([m.transfer_time for m in modes])
+    cost = DETOUR * dist[..., None] * np.array([m.cost_per_km for m in modes])
+    rng = np.random.default_rng(0)
+    minutes[rng.random(minutes.shape) < missing_share] = np.nan
+    return write_od_matrix(path, [r.name for r in relatives], [m.name for m in modes],
+                           minutes, cost)
+
+
+def run(label, relatives, modes, **options):
+    scheduler = Scheduler(day_cache_size=0, **options)
+    start = time.perf_counter()
+    scheduler.build_travel_table(relatives, modes)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    winner, _ = scheduler.best_of_restarts(relatives, modes, 0, 0, RESTARTS)
+    per_restart = (time.perf_counter() - start) / RESTARTS
+    print(f"  {label:10s}: build {build:7.3f} s  {per_restart * 1e3:8.2f} ms/restart  "
+          f"best {winner[1]:9.2f}")
+
+
+def main(argv):
+    n = int(argv[0]) if argv else 3000
+    missing_share = float(argv[1]) if len(argv) > 1 else 0.1
+    relatives = generate_relatives(n)
+    modes = generate_transport()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        od = write_matrix(os.path.join(tmp, "od.npy"), relatives, modes, missing_share)
+        print(f"relatives: {n}, OD file {os.path.getsize(od.path) / 2**20:.0f} MiB, "
+              f"{missing_share:.0%} of entries unknown")
+        run("haversine", relatives, modes)
+        run("od matrix", relatives, modes, od_matrix=od)
+        del od
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
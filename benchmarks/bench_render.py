@@ -0,0 +1,90 @@
+"""
+Benchmark: route map rendering.
+
+"pyplot" re-creates the previous implementation (a new pyplot figure
+per map, dpi 300). The RouteRenderer rows reuse figures and artists,
+and show the effect of DPI, vector output, parallel workers and
+skipping unchanged maps.
+
+Usage:
+    python benchmarks/bench_render.py [workers]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from minseo_planner.data_loader import DataLoader
+from minseo_planner.rendering import RouteRenderer, DAY_COLORS
+from minseo_planner.scheduler import Scheduler
+from minseo_planner.utils import format_hhmm
+
+
+def pyplot_render(schedule_by_day, save_path):
+    import matplotlib.pyplot as plt
+
+    maps = [("Multi-Day Optimized Route Map", schedule_by_day, (12, 10), save_path)]
+    maps += [
+        (f"Route Map — {day}", {day: visits}, (10, 8), save_path.replace(".png", f"_{day}.png"))
+        for day, visits in schedule_by_day.items() if visits
+    ]
+    for title, days, size, path in maps:
+        plt.figure(figsize=size)
+        for day, visits in days.items():
+            for r in visits:
+                plt.scatter(r["lon"], r["lat"], color="black", s=50)
+                plt.text(r["lon"] + 0.001, r["lat"] + 0.001,
+                         f"{r['name']}\nArr: {format_hhmm(r['arrival'])}", fontsize=8)
+            for prev, curr in zip(visits, visits[1:]):
+                plt.plot([prev["lon"], curr["lon"]], [prev["lat"], curr["lat"]],
+                         color=DAY_COLORS[day], linewidth=2)
+        plt.title(title)
+        plt.grid(True)
+        plt.tight_layout()
+        plt.savefig(path, dpi=300)
+        plt.close()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(argv):
+    workers = int(argv[0]) if argv else 2
+
+    # Import matplotlib up front so no variant pays for it
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot  # noqa: F401
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+    schedule, _ = Scheduler(seed=1).plan(relatives, modes)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def path(name):
+            return os.path.join(tmp, name)
+
+        print(f"pyplot, dpi 300          : {timed(lambda: pyplot_render(schedule, path('a.png'))):6.2f} s")
+
+        variants = [
+            ("renderer, dpi 300", dict(dpi=300), "b.png"),
+            ("renderer, dpi 100", dict(dpi=100), "c.png"),
+            ("renderer, svg", dict(fmt="svg"), "d.svg"),
+            (f"renderer, {workers} workers", dict(dpi=300, workers=workers), "e.png"),
+        ]
+        for label, options, name in variants:
+            renderer = RouteRenderer(**options)
+            seconds = timed(lambda: renderer.render(schedule, path(name)))
+            print(f"{label:25s}: {seconds:6.2f} s")
+
+        renderer = RouteRenderer(dpi=300)
+        seconds = timed(lambda: renderer.render(schedule, path("b.png")))
+        print(f"{'unchanged (all skipped)':25s}: {seconds:6.2f} s  ({len(renderer.skipped)} kept)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
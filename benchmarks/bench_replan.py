@@ -0,0 +1,65 @@
+"""
+Benchmark: incremental re-planning vs. planning the week again.
+
+Plans a synthetic instance, then applies single-relative changes
+(cancel a visited relative, move their window, add a newcomer) with
+Scheduler.replan and compares time, score and changed visits against a
+full plan() on the changed data.
+
+Usage:
+    python benchmarks/bench_replan.py [n_relatives] [restarts]
+"""
+
+import copy
+import sys
+import time
+
+from minseo_planner.models import Relative
+from minseo_planner.scheduler import Scheduler, apply_changes, count_changed_visits
+from minseo_planner.synthetic import generate_relatives, generate_transport
+
+
+def changes_for(relatives, schedule):
+    first = next(v["name"] for visits in schedule.values() for v in visits)
+    r = next(r for r in relatives if r.name == first)
+    moved = Relative(r.name, r.latitude, r.longitude, r.preferred_days, ("10:00", "21:00"),
+                     r.happiness_bonus, r.district, r.duration)
+    newcomer = Relative("Newcomer", r.latitude + 0.002, r.longitude, ["Sat", "Sun"],
+                        ("10:00", "20:00"), 10, r.district, 60)
+    return [("cancel", {"cancel": [first]}), ("move window", {"update": [moved]}),
+            ("add", {"add": [newcomer]})]
+
+
+def main(argv):
+    n = int(argv[0]) if argv else 1000
+    restarts = int(argv[1]) if len(argv) > 1 else 50
+    relatives = generate_relatives(n)
+    modes = generate_transport()
+
+    scheduler = Scheduler(seed=0, restarts=restarts)
+    start = time.perf_counter()
+    schedule, totals = scheduler.plan(relatives, modes)
+    print(f"relatives: {n}, full plan {time.perf_counter() - start:.3f} s, "
+          f"score {totals['final_score']:.2f}")
+
+    for label, changes in changes_for(relatives, schedule):
+        changed = apply_changes(relatives, changes)
+        by_name = {r.name: r for r in changed}
+
+        start = time.perf_counter()
+        fresh, fresh_totals = Scheduler(seed=0, restarts=restarts).plan(changed, modes)
+        full = time.perf_counter() - start
+
+        warm = copy.deepcopy(scheduler)
+        start = time.perf_counter()
+        repaired, repaired_totals = warm.replan(schedule, changes)
+        incremental = time.perf_counter() - start
+
+        print(f"  {label:12s}: replan {incremental:7.3f} s ({incremental / full:6.1%} of full), "
+              f"score {repaired_totals['final_score']:8.2f} vs {fresh_totals['final_score']:8.2f}, "
+              f"changed visits {count_changed_visits(schedule, repaired, by_name)} "
+              f"vs {count_changed_visits(schedule, fresh, by_name)}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
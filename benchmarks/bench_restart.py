@@ -0,0 +1,37 @@
+"""
+Benchmark: cost of one greedy restart on the bundled dataset.
+
+Usage:
+    python benchmarks/bench_restart.py [restarts]
+"""
+
+import random
+import sys
+import time
+
+from minseo_planner.data_loader import DataLoader
+from minseo_planner.scheduler import Scheduler
+
+
+def main(argv):
+    restarts = int(argv[0]) if argv else 2000
+
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+
+    scheduler = Scheduler()
+    scheduler.build_travel_table(relatives, modes)
+    random.seed(0)
+
+    start = time.perf_counter()
+    for _ in range(restarts):
+        scheduler.greedy_schedule(relatives, modes)
+    elapsed = time.perf_counter() - start
+
+    print(f"restarts: {restarts}")
+    print(f"greedy per restart: {elapsed / restarts * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
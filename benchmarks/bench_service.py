@@ -0,0 +1,89 @@
+"""
+Benchmark: one-shot CLI runs vs. requests to a warm planning service.
+
+Times `minseo-planner plan` as a fresh process (startup, CSV parsing,
+travel table, planning) against the same plan sent to a running
+`minseo-planner serve`, then fires bursts of identical concurrent
+requests to show coalescing. Latency percentiles come from the
+service's own stats command.
+
+Usage:
+    python benchmarks/bench_service.py [n_requests] [workers]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from minseo_planner.service import request
+
+RESTARTS = 50
+CLI_RUNS = 5
+BURST = 8
+
+
+def wait_for(socket_path, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            return request(socket_path, {"command": "ping"})
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("service did not start")
+
+
+def main(argv):
+    n = int(argv[0]) if argv else 200
+    workers = int(argv[1]) if len(argv) > 1 else 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "schedule.json")
+        start = time.perf_counter()
+        for seed in range(CLI_RUNS):
+            subprocess.run(
+                [sys.executable, "-m", "minseo_planner", "plan", "--seed", str(seed),
+                 "--restarts", str(RESTARTS), "--out", out, "--no-render", "--no-cache"],
+                check=True, capture_output=True,
+            )
+        cli = (time.perf_counter() - start) / CLI_RUNS
+        print(f"cli plan (fresh process) : {cli * 1e3:8.1f} ms/plan")
+
+        socket_path = os.path.join(tmp, "planner.sock")
+        service = subprocess.Popen(
+            [sys.executable, "-m", "minseo_planner", "serve", "--socket", socket_path,
+             "--workers", str(workers)],
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            wait_for(socket_path)
+            start = time.perf_counter()
+            for i in range(n):
+                request(socket_path, {"command": "plan", "seed": i, "restarts": RESTARTS})
+            served = (time.perf_counter() - start) / n
+            print(f"service plan (warm)      : {served * 1e3:8.1f} ms/plan  "
+                  f"({cli / served:.0f}x)")
+
+            message = {"command": "plan", "seed": 0, "restarts": RESTARTS * 20}
+            with ThreadPoolExecutor(BURST) as pool:
+                start = time.perf_counter()
+                list(pool.map(lambda _: request(socket_path, message), range(BURST)))
+                burst = time.perf_counter() - start
+            stats = request(socket_path, {"command": "stats"})["result"]
+            print(f"burst of {BURST} identical     : {burst * 1e3:8.1f} ms  "
+                  f"(computed {stats['computed'] - n}, coalesced {stats['coalesced']})")
+            latency = stats["latency_ms"]["plan"]
+            print("plan latency (ms)        : " + "  ".join(
+                f"{k} {v:.1f}" for k, v in latency.items() if k != "count"
+            ))
+            request(socket_path, {"command": "shutdown"})
+            service.wait(timeout=30)
+        finally:
+            if service.poll() is None:
+                service.terminate()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,47 @@
+"""
+Benchmark: greedy candidate generation by full scan vs. grid index.
+
+"scan" checks every remaining relative at each step; "grid" only those
+within reach (identical schedules); "grid k=K" evaluates the K nearest
+first and widens only when none fits (a heuristic, scores may differ).
+
+Usage:
+    python benchmarks/bench_spatial.py [n_relatives ...]
+"""
+
+import sys
+import time
+
+from minseo_planner.data_loader import DataLoader
+from minseo_planner.scheduler import Scheduler
+from minseo_planner.synthetic import generate_relatives
+
+RESTARTS = 20
+VARIANTS = [
+    ("scan", {"candidate_search": "scan"}),
+    ("grid", {"candidate_search": "grid"}),
+    ("grid k=8", {"candidate_search": "grid", "candidate_k": 8}),
+    ("grid k=32", {"candidate_search": "grid", "candidate_k": 32}),
+]
+
+
+def main(argv):
+    sizes = [int(a) for a in argv] or [1000, 5000]
+    modes = DataLoader().load_transport("transport.csv")
+
+    for n in sizes:
+        relatives = generate_relatives(n)
+        print(f"relatives: {n}")
+
+        for label, options in VARIANTS:
+            # Day-plan cache off so every restart pays for its candidates
+            scheduler = Scheduler(day_cache_size=0, **options)
+            scheduler.build_travel_table(relatives, modes)
+            start = time.perf_counter()
+            winner, _ = scheduler.best_of_restarts(relatives, modes, 0, 0, RESTARTS)
+            per_restart = (time.perf_counter() - start) / RESTARTS
+            print(f"  {label:10s}: {per_restart * 1e3:8.2f} ms/restart  best {winner[1]:9.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
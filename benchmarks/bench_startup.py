@@ -0,0 +1,55 @@
+"""
+Benchmark: cold-start time of the command-line tool.
+
+Runs `python -m minseo_planner.cli plan --no-render` in fresh
+interpreters (the relatives cache cold, then warm) and reports which
+heavy libraries `import minseo_planner` pulls in.
+
+Usage:
+    python benchmarks/bench_startup.py [runs]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def timed_run(args, cwd):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "minseo_planner.cli", *args],
+                   cwd=cwd, check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def main(argv):
+    runs = int(argv[0]) if argv else 5
+
+    probe = subprocess.run(
+        [sys.executable, "-c",
+         "import sys, minseo_planner; "
+         "print(sorted(m for m in ('numpy', 'pandas', 'matplotlib') if m in sys.modules))"],
+        check=True, capture_output=True, text=True,
+    )
+    print(f"import minseo_planner loads: {probe.stdout.strip()}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = os.path.join(tmp, "cache")
+        base = ["plan", "--seed", "1", "--restarts", "50", "--no-render", "--no-cache"]
+
+        cold = [timed_run(base, tmp) for _ in range(runs)]
+        print(f"plan --no-render            : {min(cold):.3f} s (best of {runs})")
+
+        timed_run(base + ["--cache-dir", cache], tmp)
+        warm = [timed_run(base + ["--cache-dir", cache], tmp) for _ in range(runs)]
+        print(f"plan --no-render, warm cache: {min(warm):.3f} s (best of {runs})")
+
+        cached = base[:-1] + ["--cache-dir", cache, "--result-cache", os.path.join(tmp, "results")]
+        timed_run(cached, tmp)
+        hits = [timed_run(cached, tmp) for _ in range(runs)]
+        print(f"plan --no-render, cached result: {min(hits):.3f} s (best of {runs})")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,253 @@
+"""
+Benchmark suite: every planner component on synthetic instances of
+10, 100, 1k and 10k relatives.
+
+For each size and component the suite records
+- seconds: best wall time over a few runs (setup excluded),
+- peak_bytes: peak memory allocated during one traced run,
+- score: final score of the component's output, where it has one.
+Instances come from minseo_planner.synthetic with fixed seeds, so the
+scores are deterministic; a drop means the planner got worse.
+
+Results are written as JSON (--save) and can be compared against a
+saved baseline (--check), which exits non-zero on a regression.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes N ...] [--components NAME ...]
+                                     [--save benchmarks/baseline.json]
+                                     [--check benchmarks/baseline.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from minseo_planner.data_loader import DataLoader
+from minseo_planner.scheduler import Scheduler
+from minseo_planner.scoring import ScoringEngine
+from minseo_planner.synthetic import (
+    generate_relatives, generate_transport, write_relatives_csv, write_transport_csv,
+)
+
+SIZES = [10, 100, 1000, 10000]
+SEED = 0
+PLAN_RESTARTS = 10
+IMPROVE_ITERATIONS = 2000
+
+# Regressions reported by --check
+TIME_TOLERANCE = 0.5      # slower than baseline by more than 50%
+MEMORY_TOLERANCE = 0.25   # peak memory up by more than 25%
+SCORE_TOLERANCE = 1e-6    # any drop in final score
+# Absolute slack, so sub-millisecond timings and tiny peaks are not noise
+TIME_SLACK = 0.005
+MEMORY_SLACK = 256 * 1024
+
+BASELINE_VERSION = 1
+
+
+# COMPONENTS
+# setup(n) builds everything a component needs outside the timed part;
+# run(state) is what gets timed and returns the score (or None).
+
+def instance(n):
+    return generate_relatives(n, seed=SEED), generate_transport()
+
+
+def setup_load(n):
+    relatives, modes = instance(n)
+    tmp = tempfile.mkdtemp(prefix="bench_suite_")
+    paths = (os.path.join(tmp, "relatives.csv"), os.path.join(tmp, "transport.csv"))
+    write_relatives_csv(paths[0], relatives)
+    write_transport_csv(paths[1], modes)
+    return paths
+
+
+def run_load(paths):
+    loader = DataLoader()
+    loader.load_relative_table(paths[0])
+    loader.load_transport(paths[1])
+
+
+def teardown_load(paths):
+    for path in paths:
+        os.remove(path)
+    os.rmdir(os.path.dirname(paths[0]))
+
+
+def run_travel_table(state):
+    relatives, modes = state
+    Scheduler().build_travel_table(relatives, modes)
+
+
+def setup_restart(n):
+    relatives, modes = instance(n)
+    # Day plan cache off: every timed run constructs its days from scratch
+    scheduler = Scheduler(day_cache_size=0)
+    scheduler.build_travel_table(relatives, modes)
+    return scheduler, relatives, modes
+
+
+def run_restart(state):
+    scheduler, relatives, modes = state
+    schedule = scheduler.run_restart(relatives, modes, SEED, 0)
+    return ScoringEngine().compute_total_score(schedule, relatives)["final_score"]
+
+
+def setup_score(n):
+    scheduler, relatives, modes = setup_restart(n)
+    return scheduler.run_restart(relatives, modes, SEED, 0), relatives
+
+
+def run_score(state):
+    schedule, relatives = state
+    return ScoringEngine().compute_total_score(schedule, relatives)["final_score"]
+
+
+def setup_local_search(n):
+    scheduler, relatives, modes = setup_restart(n)
+    scheduler.improve_iterations = IMPROVE_ITERATIONS
+    scheduler.improve_time = None
+    return scheduler, scheduler.run_restart(relatives, modes, SEED, 0), relatives
+
+
+def run_local_search(state):
+    scheduler, schedule, relatives = state
+    _, totals, _ = scheduler.improve_schedule(schedule, relatives)
+    return totals["final_score"]
+
+
+def run_plan(state):
+    relatives, modes = state
+    scheduler = Scheduler(restarts=PLAN_RESTARTS, seed=SEED)
+    _, totals = scheduler.plan(relatives, modes)
+    return totals["final_score"]
+
+
+# name -> (setup, run, teardown)
+COMPONENTS = {
+    "load": (setup_load, run_load, teardown_load),
+    "travel_table": (instance, run_travel_table, None),
+    "restart": (setup_restart, run_restart, None),
+    "score": (setup_score, run_score, None),
+    "local_search": (setup_local_search, run_local_search, None),
+    "plan": (instance, run_plan, None),
+}
+
+
+# MEASUREMENT
+
+def repeats_for(n):
+    return 5 if n <= 100 else 3 if n <= 1000 else 1
+
+
+def measure(name, n):
+    setup, run, teardown = COMPONENTS[name]
+    state = setup(n)
+    try:
+        best = float("inf")
+        score = None
+        for _ in range(repeats_for(n)):
+            start = time.perf_counter()
+            score = run(state)
+            best = min(best, time.perf_counter() - start)
+
+        # Separate traced run: tracemalloc slows allocation-heavy code,
+        # so it must not be part of the timing
+        tracemalloc.start()
+        try:
+            run(state)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    finally:
+        if teardown is not None:
+            teardown(state)
+
+    return {"seconds": best, "peak_bytes": peak, "score": score}
+
+
+def run_suite(sizes, components):
+    results = {name: {} for name in components}
+    for n in sizes:
+        for name in components:
+            result = measure(name, n)
+            results[name][str(n)] = result
+            score = "" if result["score"] is None else f"  score {result['score']:10.2f}"
+            print(f"n={n:<6} {name:<13} {result['seconds']:9.4f} s  "
+                  f"{result['peak_bytes'] / 2**20:9.1f} MiB{score}", flush=True)
+    return {
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "seed": SEED,
+        "plan_restarts": PLAN_RESTARTS,
+        "improve_iterations": IMPROVE_ITERATIONS,
+        "results": results,
+    }
+
+
+# BASELINE COMPARISON
+
+def compare(current, baseline, time_tolerance=TIME_TOLERANCE,
+            memory_tolerance=MEMORY_TOLERANCE, score_tolerance=SCORE_TOLERANCE):
+    """Regressions of `current` against `baseline`, as readable lines."""
+    problems = []
+    for name, by_size in current["results"].items():
+        for n, result in by_size.items():
+            base = baseline["results"].get(name, {}).get(n)
+            if base is None:
+                continue
+            label = f"{name} n={n}"
+            if result["seconds"] > base["seconds"] * (1 + time_tolerance) + TIME_SLACK:
+                problems.append(f"{label}: {result['seconds']:.4f} s "
+                                f"(baseline {base['seconds']:.4f} s)")
+            if result["peak_bytes"] > base["peak_bytes"] * (1 + memory_tolerance) + MEMORY_SLACK:
+                problems.append(f"{label}: peak {result['peak_bytes']} bytes "
+                                f"(baseline {base['peak_bytes']})")
+            if base["score"] is not None and (
+                result["score"] is None or result["score"] < base["score"] - score_tolerance
+            ):
+                problems.append(f"{label}: score {result['score']} (baseline {base['score']})")
+    return problems
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--components", nargs="+", choices=list(COMPONENTS),
+                        default=list(COMPONENTS))
+    parser.add_argument("--save", help="write the results (JSON) here")
+    parser.add_argument("--check", help="baseline JSON to compare against")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    current = run_suite(args.sizes, args.components)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"results written to {args.save}")
+
+    if args.check:
+        with open(args.check, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        problems = compare(current, baseline, time_tolerance=args.time_tolerance)
+        for line in problems:
+            print(f"REGRESSION {line}")
+        if problems:
+            return 1
+        print(f"no regressions against {args.check}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -8,17 +8,39 @@ A modular scheduling and scoring system for generating optimized weekly visit pl
 
 __all__ = [
     "Scheduler",
-    "Scoring",
+    "ScoringEngine",
     "DataLoader",
+    "plan_many",
     "utils",
 ]
 
 __version__ = "1.0.0"
 
-from .scheduler import Scheduler
-from .scoring import Scoring
-from .data_loader import DataLoader
-from . import utils
+# Submodules are imported on first attribute access, so that
+# `import minseo_planner` (and the CLI) start without loading NumPy,
+# pandas or matplotlib until a command needs them.
+_LAZY = {
+    "Scheduler": ("minseo_planner.scheduler", "Scheduler"),
+    "ScoringEngine": ("minseo_planner.scoring", "ScoringEngine"),
+    "DataLoader": ("minseo_planner.data_loader", "DataLoader"),
+    "plan_many": ("minseo_planner.batch", "plan_many"),
+    "utils": ("minseo_planner.utils", None),
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    module_name, attr = _LAZY[name]
+    module = import_module(module_name)
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
 
 
 
@@ -0,0 +1,7 @@
+"""Allows `python -m minseo_planner` (same as the console script)."""
+
+import sys
+
+from minseo_planner.cli import run
+
+sys.exit(run())
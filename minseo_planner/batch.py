@@ -0,0 +1,159 @@
+"""
+Batch planning: many independent visit plans in one process.
+
+plan_many() takes scenarios (one relatives file or list each) that
+share one set of transport modes, and yields a result per scenario as
+soon as it is done. With workers > 1 scenarios run in a process pool
+whose workers receive the parsed transport modes once and stay alive
+for the whole batch. A failing scenario only produces a failed result;
+the rest of the batch carries on.
+"""
+
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from minseo_planner.data_loader import DataLoader
+from minseo_planner.scheduler import Scheduler
+
+
+def plan_many(scenarios, modes=None, workers=1, transport="transport.csv", **options):
+    """
+    Plan every scenario; yields result dicts in completion order.
+
+    A scenario is a relatives CSV path, or a dict with
+        "relatives": CSV path or list of Relative objects
+        "id":        label reported back (default: path or position)
+        "options":   Scheduler keyword arguments for this scenario only
+    `options` are Scheduler keyword arguments shared by all scenarios.
+    `modes` defaults to the transport file, parsed once for the batch.
+
+    Each result holds index, id, ok, schedule, totals, search_stats,
+    relatives (count), row_errors, seconds and, for failures, error.
+    """
+    if modes is None:
+        modes = DataLoader().load_transport(transport)
+
+    jobs = [_job(i, scenario) for i, scenario in enumerate(scenarios)]
+
+    if workers <= 1:
+        for job in jobs:
+            yield _run_scenario(job, modes, options)
+        return
+
+    yield from _plan_parallel(jobs, modes, options, workers)
+
+
+def _job(index, scenario):
+    if isinstance(scenario, dict):
+        relatives = scenario["relatives"]
+        label = scenario.get("id", relatives if isinstance(relatives, (str, os.PathLike)) else index)
+        return index, label, relatives, scenario.get("options", {})
+    return index, str(scenario), scenario, {}
+
+
+def _plan_parallel(jobs, modes, options, workers):
+    # A bounded window of in-flight scenarios keeps thousands of jobs
+    # from being queued (and pickled) up front.
+    pending = {}
+    queue = iter(jobs)
+
+    def new_pool():
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=(modes, options),
+        )
+
+    pool = new_pool()
+    try:
+        def submit_next():
+            job = next(queue, None)
+            if job is not None:
+                pending[pool.submit(_run_batch_job, job)] = job
+
+        for _ in range(workers * 2):
+            submit_next()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                job = pending.pop(future)
+                try:
+                    yield future.result()
+                except BrokenProcessPool as e:
+                    # A worker died (crash, out of memory); only the jobs
+                    # that were in flight are lost, the batch goes on.
+                    broken = True
+                    yield _failure(job, f"worker process died: {e}", 0.0)
+
+            if broken:
+                for future, job in list(pending.items()):
+                    yield _failure(job, "worker process died", 0.0)
+                pending.clear()
+                pool.shutdown(wait=True, cancel_futures=True)
+                pool = new_pool()
+
+            while len(pending) < workers * 2:
+                before = len(pending)
+                submit_next()
+                if len(pending) == before:
+                    break
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _run_scenario(job, modes, options):
+    index, label, relatives, overrides = job
+    start = time.perf_counter()
+    row_errors = 0
+
+    try:
+        if isinstance(relatives, (str, os.PathLike)):
+            loader = DataLoader()
+            relatives = loader.load_relative_table(relatives).relatives()
+            row_errors = loader.error_count
+
+        scheduler = Scheduler(**{**options, **overrides, "workers": 1})
+        schedule, totals = scheduler.plan(relatives, modes)
+    except Exception:
+        return _failure(job, traceback.format_exc(), time.perf_counter() - start)
+
+    return {
+        "index": index,
+        "id": label,
+        "ok": True,
+        "schedule": schedule,
+        "totals": totals,
+        "search_stats": scheduler.search_stats,
+        "relatives": len(relatives),
+        "row_errors": row_errors,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def _failure(job, error, seconds):
+    index, label, _, _ = job
+    return {
+        "index": index,
+        "id": label,
+        "ok": False,
+        "error": error,
+        "seconds": seconds,
+    }
+
+
+_batch_state = None
+
+
+def _init_batch_worker(modes, options):
+    global _batch_state
+    _batch_state = (modes, options)
+
+
+def _run_batch_job(job):
+    modes, options = _batch_state
+    return _run_scenario(job, modes, options)
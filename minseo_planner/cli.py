@@ -1,16 +1,348 @@
-
 """
 Console entry point for Minseo's festival-week visit planner.
 
 This module allows the package to expose a command-line tool
 called `minseo-planner` via setup.py.
+
+Without arguments the interactive menu (Main) starts. Subcommands run
+non-interactively:
+
+    minseo-planner plan   [--relatives CSV] [--out schedule.json] [--seed N] ...
+    minseo-planner score  --schedule schedule.json [--alpha A] [--beta B]
+    minseo-planner export --schedule schedule.json --out schedule.txt [--format text|csv]
+    minseo-planner render --schedule schedule.json [--out route_map.png]
+    minseo-planner serve  --socket PATH [--workers N]
+    minseo-planner request --socket PATH {plan,stats,ping,shutdown} [--params JSON]
+
+Only argparse and json are imported up front; NumPy, pandas and
+matplotlib are loaded by the commands that use them.
 """
 
-from minseo_planner.main import Main
+import argparse
+import json
+import os
+import sys
 
 
-def run():
+def run(argv=None):
     """Entry point for the console script."""
-    app = Main()
-    app.run()
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        from minseo_planner.main import Main
+        app = Main()
+        app.run()
+        return 0
+
+    args = build_parser().parse_args(argv)
+    try:
+        return args.command(args)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="minseo-planner",
+        description="Plan, score, export and render festival-week visit schedules.",
+    )
+    commands = parser.add_subparsers(title="commands", required=True)
+
+    plan = commands.add_parser("plan", help="generate the best weekly schedule")
+    add_data_arguments(plan)
+    plan.add_argument("--out", default="schedule.json", help="schedule JSON to write")
+    plan.add_argument("--text", help="also write the formatted schedule here")
+    plan.add_argument("--seed", type=int, help="base seed (random if omitted)")
+    plan.add_argument("--restarts", type=int, default=50)
+    plan.add_argument("--time-budget", type=float, help="seconds of search at most")
+    plan.add_argument("--patience", type=int, help="stop after N restarts without improvement")
+    plan.add_argument("--workers", type=int, default=1)
+    plan.add_argument("--improve", choices=["best", "each"], help="local search after greedy")
+    plan.add_argument("--solver", choices=["restarts", "exact"], default="restarts",
+                      help="exact: best visit orders, modes chosen by preference")
+    plan.add_argument("--cache-dir", help="cache parsed relatives files here")
+    plan.add_argument("--result-cache", help="directory of cached results "
+                      "(default: $XDG_CACHE_HOME/minseo-planner/results)")
+    plan.add_argument("--no-cache", action="store_true", help="neither read nor store cached results")
+    plan.add_argument("--od-matrix", help="routing-engine travel matrix (.npy with .json index)")
+    plan.add_argument("--mode-policy", help="distance bands per transport mode "
+                      "(default: mode_policy.csv next to the transport file)")
+    plan.add_argument("--keep-dominated-modes", action="store_true",
+                      help="also try modes beaten on both minutes and cost")
+    plan.add_argument("--metrics", help="append timings and counters (JSON lines) here")
+    add_weight_arguments(plan)
+    plan.add_argument("--map", default="route_map.png", help="route map to draw")
+    plan.add_argument("--no-render", action="store_true", help="skip drawing route maps")
+    add_render_arguments(plan)
+    plan.set_defaults(command=cmd_plan)
+
+    score = commands.add_parser("score", help="score a saved schedule")
+    score.add_argument("--schedule", required=True, help="schedule JSON from `plan`")
+    add_data_arguments(score, transport=False)
+    add_weight_arguments(score)
+    score.set_defaults(command=cmd_score)
+
+    export = commands.add_parser("export", help="write a saved schedule as text or CSV")
+    export.add_argument("--schedule", required=True, help="schedule JSON from `plan`")
+    export.add_argument("--out", required=True)
+    export.add_argument("--format", choices=["text", "csv"], default="text")
+    export.set_defaults(command=cmd_export)
+
+    render = commands.add_parser("render", help="draw route maps for a saved schedule")
+    render.add_argument("--schedule", required=True, help="schedule JSON from `plan`")
+    render.add_argument("--out", default="route_map.png")
+    add_render_arguments(render)
+    render.set_defaults(command=cmd_render)
+
+    serve = commands.add_parser("serve", help="run the planning service on a Unix socket")
+    serve.add_argument("--socket", required=True, help="socket path to listen on")
+    add_data_arguments(serve)
+    serve.add_argument("--workers", type=int, default=1,
+                       help="planning processes (0: plan inside the service process)")
+    serve.set_defaults(command=cmd_serve)
+
+    client = commands.add_parser("request", help="send one request to a running service")
+    client.add_argument("--socket", required=True, help="socket path of the service")
+    client.add_argument("service_command", choices=["plan", "stats", "ping", "shutdown"])
+    client.add_argument("--params", default="{}", help="request fields as a JSON object")
+    client.set_defaults(command=cmd_request)
+
+    return parser
+
+
+def add_data_arguments(parser, transport=True):
+    parser.add_argument("--relatives", help="relatives CSV (default: bundled data)")
+    if transport:
+        parser.add_argument("--transport", help="transport CSV (default: bundled data)")
+
+
+def add_render_arguments(parser):
+    parser.add_argument("--dpi", type=int, default=300, help="resolution of raster maps")
+    parser.add_argument("--map-format", choices=["png", "svg", "pdf"],
+                        help="map file format (default: from the file name)")
+    parser.add_argument("--render-workers", type=int, default=1,
+                        help="processes drawing maps in parallel")
+
+
+def render_options(args):
+    return {"dpi": args.dpi, "fmt": args.map_format, "workers": args.render_workers}
+
+
+def add_weight_arguments(parser):
+    parser.add_argument("--alpha", type=float, default=0.05, help="penalty per travel minute")
+    parser.add_argument("--beta", type=float, default=0.02, help="penalty per cost unit")
+
+
+# COMMANDS
+
+def cmd_plan(args):
+    from minseo_planner.data_loader import DataLoader
+    from minseo_planner.scheduler import Scheduler
+
+    instrument = None
+    if args.metrics:
+        from minseo_planner.instrumentation import Instrumentation
+        instrument = Instrumentation(sink=args.metrics)
+
+    loader = DataLoader(cache_dir=args.cache_dir, instrument=instrument)
+    relatives = load_relatives(loader, args.relatives)
+    transport = data_path(args.transport, "transport.csv")
+    modes = loader.load_transport(transport)
+    if not relatives or not modes:
+        raise ValueError("no relatives or transport modes to plan with")
+    mode_policy = load_mode_policy(loader, args.mode_policy, transport,
+                                   prune_dominated=not args.keep_dominated_modes)
+    od_matrix = None
+    if args.od_matrix:
+        od_matrix = loader.load_od_matrix(os.path.abspath(args.od_matrix))
+
+    result_cache = None
+    if not args.no_cache:
+        from minseo_planner.result_cache import ResultCache
+        result_cache = ResultCache(args.result_cache)
+
+    scheduler = Scheduler(
+        alpha=args.alpha, beta=args.beta, restarts=args.restarts, seed=args.seed,
+        workers=args.workers, improve=args.improve, solver=args.solver,
+        time_budget=args.time_budget, patience=args.patience, instrument=instrument,
+        od_matrix=od_matrix, result_cache=result_cache, mode_policy=mode_policy,
+    )
+    warn_infeasible(relatives, scheduler)
+    schedule, totals = scheduler.plan(relatives, modes)
+    if schedule is None:
+        raise ValueError("no schedule found (no restart ran; check --restarts)")
+
+    stats = dict(scheduler.search_stats or {})
+    stats.pop("scores", None)  # one number per restart; the distribution is kept
+    write_json(args.out, {
+        "relatives": data_path(args.relatives, "relatives.csv"),
+        "seed": scheduler.last_seed,
+        "alpha": args.alpha,
+        "beta": args.beta,
+        "schedule": schedule,
+        "totals": totals,
+        "search_stats": stats,
+    })
+    cached = " (cached result)" if result_cache is not None and result_cache.hits else ""
+    print(f"Final score {totals['final_score']:.2f}{cached}; schedule written to {args.out}")
+
+    if args.text:
+        write_text(args.text, scheduler.format_schedule(schedule, totals))
+    if not args.no_render:
+        scheduler.plot_route_multi_day(schedule, save_path=args.map, **render_options(args))
+
+    if instrument is not None:
+        instrument.flush(command="plan", seed=scheduler.last_seed)
+        instrument.close()
+    return 0
+
+
+def cmd_score(args):
+    from minseo_planner.data_loader import DataLoader
+    from minseo_planner.scoring import ScoringEngine
+
+    saved = read_json(args.schedule)
+    relatives = load_relatives(DataLoader(), args.relatives or saved.get("relatives"))
+    totals = ScoringEngine(alpha=args.alpha, beta=args.beta).compute_total_score(
+        saved["schedule"], relatives
+    )
+    for key, value in totals.items():
+        print(f"{key}: {value:.2f}")
+    return 0
+
+
+def cmd_export(args):
+    saved = read_json(args.schedule)
+    if args.format == "csv":
+        write_csv(args.out, saved["schedule"])
+    else:
+        from minseo_planner.scheduler import Scheduler
+        write_text(args.out, Scheduler().format_schedule(saved["schedule"], saved["totals"]))
+    print(f"Schedule exported to {args.out}")
+    return 0
+
+
+def cmd_render(args):
+    from minseo_planner.scheduler import Scheduler
+
+    saved = read_json(args.schedule)
+    Scheduler().plot_route_multi_day(saved["schedule"], save_path=args.out, **render_options(args))
+    return 0
+
+
+def cmd_serve(args):
+    from minseo_planner.service import PlanningService
+
+    service = PlanningService(
+        args.socket, relatives=data_path(args.relatives, "relatives.csv"),
+        transport=data_path(args.transport, "transport.csv"), workers=args.workers,
+    )
+    print(f"Serving on {args.socket} (stop with Ctrl+C or a shutdown request)")
+    service.run()
+    return 0
+
+
+def cmd_request(args):
+    from minseo_planner.service import request
+
+    params = json.loads(args.params)
+    if not isinstance(params, dict):
+        raise ValueError("--params must be a JSON object")
+    reply = request(args.socket, {**params, "command": args.service_command})
+    json.dump(reply, sys.stdout, indent=2)
+    print()
+    return 0 if reply.get("ok") else 1
+
+
+# FILE HELPERS
+
+def data_path(path, default_name):
+    """User paths are taken relative to the working directory; None means bundled data."""
+    if path is None:
+        from minseo_planner.data_loader import DataLoader
+        return os.path.join(DataLoader().data_dir, default_name)
+    return os.path.abspath(path)
+
+
+def load_relatives(loader, path):
+    path = data_path(path, "relatives.csv")
+    relatives = loader.load_relative_table(path).relatives()
+    if loader.error_count:
+        first = loader.errors[0]
+        print(
+            f"[WARN] Skipped {loader.error_count} bad row(s) in {path}; first at line "
+            f"{first['line']} ({first['column']}: {first['error']})",
+            file=sys.stderr,
+        )
+    return relatives
+
+
+def load_mode_policy(loader, path, transport, prune_dominated=True):
+    """Given policy file, else the one next to `transport`, else the defaults."""
+    from minseo_planner.mode_policy import ModePolicy, policy_path
+
+    path = os.path.abspath(path) if path else policy_path(transport)
+    if path is None:
+        return ModePolicy(prune_dominated=prune_dominated)
+    return loader.load_mode_policy(path, prune_dominated=prune_dominated)
+
+
+def warn_infeasible(relatives, scheduler):
+    """Report preferred days on which a relative can never follow a first visit."""
+    from minseo_planner.feasibility import FeasibilityTable
+
+    feasibility = FeasibilityTable(relatives, scheduler.day_limits)
+    if not feasibility.rejected():
+        return
+    reasons = ", ".join(f"{reason} {count}" for reason, count in feasibility.rejections.items()
+                        if count)
+    print(
+        f"[WARN] {feasibility.rejected()} preferred day(s) cannot fit a visit after the "
+        f"day's first one ({reasons})",
+        file=sys.stderr,
+    )
+    if feasibility.first_only:
+        names = feasibility.first_only
+        more = f" and {len(names) - 3} more" if len(names) > 3 else ""
+        print(
+            f"[WARN] {len(names)} relative(s) can only be a day's first visit: "
+            f"{', '.join(names[:3])}{more}",
+            file=sys.stderr,
+        )
+
+
+def read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def write_text(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def write_csv(path, schedule_by_day):
+    import csv
+    from minseo_planner.utils import format_hhmm
+
+    fields = ["day", "name", "district", "arrival", "departure", "mode",
+              "distance", "travel_time", "cost"]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        for day, visits in schedule_by_day.items():
+            for v in visits:
+                writer.writerow([
+                    day, v["name"], v["district"], format_hhmm(v["arrival"]),
+                    format_hhmm(v["departure"]), v["mode"], f"{v['distance']:.3f}",
+                    f"{v['travel_time']:.1f}", f"{v['cost']:.2f}",
+                ])
+
 
+if __name__ == "__main__":
+    sys.exit(run())
@@ -1,79 +1,393 @@
-
 """
 Data loading utilities for Minseo's visit planner.
 
 This version uses package-relative paths so that CSV files
 load correctly regardless of the working directory.
+
+Relatives are parsed column by column (pandas, in chunks) into a
+RelativeTable. Bad rows are skipped and reported in `errors` instead
+of failing the whole load. With a cache_dir, parsed tables are saved
+as .npz files and reused while the source file is unchanged.
+
+OD matrices (routing-engine travel minutes and cost, see od_matrix.py)
+are memory-mapped rather than read. The transport-mode policy (distance
+bands, see mode_policy.py) lives in mode_policy.csv next to transport.csv.
 """
 
 import csv
+import hashlib
+import json
 import os
-from minseo_planner.models import Relative, TransportMode
+import tempfile
+import zipfile
+
+import numpy as np
+
+from minseo_planner.models import RelativeTable, TransportMode, day_mask
+from minseo_planner.instrumentation import NULL_INSTRUMENT
+from minseo_planner.od_matrix import ODMatrix
+from minseo_planner.mode_policy import ModePolicy
+from minseo_planner.utils import parse_hhmm
+
+RELATIVE_COLUMNS = ["Relative", "District", "Lat", "Lon", "PreferredDays",
+                    "PreferredTime", "Bonus", "Duration"]
+
+# Rows parsed per pandas chunk
+CHUNK_ROWS = 100_000
+
+# Row errors kept in detail; further ones are only counted
+MAX_ROW_ERRORS = 1000
+
+# Bump when the cache layout or parsing rules change
+CACHE_VERSION = 1
 
 
 class DataLoader:
-    def __init__(self):
+    def __init__(self, cache_dir=None, chunk_rows=CHUNK_ROWS, instrument=None):
         # Path to the directory containing this file
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
         # Path to the data folder inside the package
         self.data_dir = os.path.join(self.base_dir, "data")
 
-    
+        # Where parsed tables are cached (None: no caching)
+        self.cache_dir = cache_dir
+        self.chunk_rows = chunk_rows
+
+        # Per-row problems from the last load: dicts with line, column,
+        # value and error. error_count also counts rows past MAX_ROW_ERRORS.
+        self.errors = []
+        self.error_count = 0
+        self.cache_hit = False
+
+        # Load timings (see instrumentation.py)
+        self.instrument = instrument or NULL_INSTRUMENT
+
+
     # Helper: Build full path to a data file
-    
+
     def _full_path(self, filename):
         return os.path.join(self.data_dir, filename)
 
-    
+    def _row_error(self, line, column, value, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_ROW_ERRORS:
+            self.errors.append({"line": line, "column": column, "value": value, "error": message})
+
+    def _report_errors(self, filepath):
+        if self.error_count:
+            first = self.errors[0]
+            print(
+                f"Skipped {self.error_count} bad row(s) in {filepath}; first at line "
+                f"{first['line']} ({first['column']}: {first['error']})"
+            )
+
+
     # Load relatives
 
     def load_relatives(self, filename):
+        """List of Relative objects (bad rows skipped, see errors)."""
         filepath = self._full_path(filename)
-        relatives = []
 
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    relatives.append(
-                        Relative(
-                            name=row["Relative"],
-                            district=row["District"],
-                            latitude=float(row["Lat"]),
-                            longitude=float(row["Lon"]),
-                            preferred_days=[d.strip() for d in row["PreferredDays"].split(",")],
-                            preferred_window=tuple(row["PreferredTime"].split("-")),
-                            happiness_bonus=float(row["Bonus"]),
-                            duration=int(row["Duration"])
-                        )
-                    )
+            table = self.load_relative_table(filename)
         except Exception as e:
             print(f"Error loading relatives from {filepath}: {e}")
             return []
 
-        return relatives
+        self._report_errors(filepath)
+        return table.relatives()
+
+    def load_relative_table(self, filename):
+        """
+        RelativeTable of all valid rows. Raises OSError for a missing
+        file and ValueError when required columns are absent.
+        """
+        filepath = self._full_path(filename)
+        with self.instrument.phase("load", file=os.path.basename(filepath)):
+            table = self._load_relative_table(filepath)
+        self.instrument.count("rows_rejected", self.error_count)
+        return table
+
+    def _load_relative_table(self, filepath):
+        self.errors = []
+        self.error_count = 0
+        self.cache_hit = False
+
+        stat = os.stat(filepath)
+        digest = None
+        cache_path = self._cache_path(filepath)
+
+        if cache_path is not None and os.path.exists(cache_path):
+            cached, digest = self._read_cache(cache_path, filepath, stat)
+            if cached is not None:
+                self.cache_hit = True
+                if digest is not None:
+                    # Same content, new mtime: refresh so the next load skips hashing
+                    self._write_cache(cache_path, filepath, cached, stat, digest)
+                return cached
+
+        table = self._parse_relatives(filepath)
+
+        if cache_path is not None:
+            self._write_cache(cache_path, filepath, table, stat, digest or file_digest(filepath))
+        return table
+
+
+    # Columnar parsing
+
+    def _parse_relatives(self, filepath):
+        import pandas as pd  # heavy; warm cache loads never need it
+
+        columns = {name: [] for name in (
+            "names", "districts", "latitude", "longitude", "day_mask",
+            "window_start", "window_end", "happiness_bonus", "duration",
+        )}
+        seen = set()
+        day_cache = {}
+        window_cache = {}
+
+        reader = pd.read_csv(
+            filepath, dtype=str, keep_default_na=False, chunksize=self.chunk_rows,
+            skipinitialspace=True,
+        )
+        first_line = 2  # line 1 is the header
+
+        for chunk in reader:
+            missing = [c for c in RELATIVE_COLUMNS if c not in chunk.columns]
+            if missing:
+                raise ValueError(f"missing columns: {', '.join(missing)}")
+
+            lines = np.arange(first_line, first_line + len(chunk))
+            first_line += len(chunk)
+            valid = np.ones(len(chunk), dtype=bool)
+
+            def invalid(mask, column, message):
+                for i in np.flatnonzero(mask & valid):
+                    self._row_error(int(lines[i]), column, chunk[column].iat[i], message)
+                valid[mask] = False
+
+            names = chunk["Relative"].str.strip()
+            invalid((names == "").to_numpy(), "Relative", "empty name")
+
+            lat = pd.to_numeric(chunk["Lat"], errors="coerce").to_numpy(np.float64)
+            lon = pd.to_numeric(chunk["Lon"], errors="coerce").to_numpy(np.float64)
+            invalid(~(np.abs(lat) <= 90), "Lat", "not a latitude")
+            invalid(~(np.abs(lon) <= 180), "Lon", "not a longitude")
+
+            bonus = pd.to_numeric(chunk["Bonus"], errors="coerce").to_numpy(np.float64)
+            invalid(~np.isfinite(bonus), "Bonus", "not a number")
+
+            duration = pd.to_numeric(chunk["Duration"], errors="coerce").to_numpy(np.float64)
+            invalid(
+                ~((duration >= 0) & (duration < 24 * 60) & (duration == np.floor(duration))),
+                "Duration", "not a whole number of minutes",
+            )
+
+            # Few distinct day lists and windows: parse each value once
+            days = chunk["PreferredDays"].map(
+                lambda v: day_cache[v] if v in day_cache else day_cache.setdefault(v, _parse_days(v))
+            ).to_numpy(np.int64)
+            invalid(days < 0, "PreferredDays", "unknown or empty day list")
+
+            windows = chunk["PreferredTime"].map(
+                lambda v: window_cache[v] if v in window_cache
+                else window_cache.setdefault(v, _parse_window(v))
+            )
+            start = np.fromiter((w[0] for w in windows), dtype=np.int64, count=len(chunk))
+            end = np.fromiter((w[1] for w in windows), dtype=np.int64, count=len(chunk))
+            invalid(start < 0, "PreferredTime", "expected HH:MM-HH:MM with start <= end")
+
+            # Names key the schedule, so only the first of a duplicate is kept
+            name_list = names.tolist()
+            duplicate = np.zeros(len(chunk), dtype=bool)
+            for i in np.flatnonzero(valid):
+                if name_list[i] in seen:
+                    duplicate[i] = True
+                else:
+                    seen.add(name_list[i])
+            invalid(duplicate, "Relative", "duplicate name")
+
+            keep = np.flatnonzero(valid)
+            columns["names"].extend(name_list[i] for i in keep)
+            columns["districts"].extend(chunk["District"].iloc[keep].str.strip().tolist())
+            columns["latitude"].append(lat[keep])
+            columns["longitude"].append(lon[keep])
+            columns["day_mask"].append(days[keep])
+            columns["window_start"].append(start[keep])
+            columns["window_end"].append(end[keep])
+            columns["happiness_bonus"].append(bonus[keep])
+            columns["duration"].append(duration[keep])
+
+        self.errors.sort(key=lambda e: e["line"])
+        return RelativeTable(**{
+            name: (values if name in ("names", "districts") else _concat(values))
+            for name, values in columns.items()
+        })
+
+
+    # On-disk cache
+
+    def _cache_path(self, filepath):
+        if self.cache_dir is None:
+            return None
+        key = hashlib.sha1(os.path.abspath(filepath).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"relatives-{key}.npz")
+
+    def _read_cache(self, cache_path, filepath, stat):
+        """
+        (table, digest) from the cache, or (None, digest) when stale.
+        Size and mtime are checked first; the content hash only when
+        they differ (e.g. a file touched or copied without changes).
+        """
+        digest = None
+        try:
+            with np.load(cache_path, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                if meta["version"] != CACHE_VERSION or meta["source"] != os.path.abspath(filepath):
+                    return None, None
+                if meta["size"] != stat.st_size or meta["mtime_ns"] != stat.st_mtime_ns:
+                    digest = file_digest(filepath)
+                    if digest != meta["digest"]:
+                        return None, digest
+                table = RelativeTable(
+                    names=data["names"].tolist(),
+                    districts=data["districts"].tolist(),
+                    latitude=data["latitude"],
+                    longitude=data["longitude"],
+                    day_mask=data["day_mask"],
+                    window_start=data["window_start"],
+                    window_end=data["window_end"],
+                    happiness_bonus=data["happiness_bonus"],
+                    duration=data["duration"],
+                )
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile) as e:
+            print(f"Ignoring unreadable cache {cache_path}: {e}")
+            return None, digest
+
+        self.errors = meta["errors"]
+        self.error_count = meta["error_count"]
+        return table, digest
+
+    def _write_cache(self, cache_path, filepath, table, stat, digest):
+        meta = {
+            "version": CACHE_VERSION,
+            "source": os.path.abspath(filepath),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "digest": digest,
+            "errors": self.errors,
+            "error_count": self.error_count,
+        }
+        tmp_path = None
+        try:
+            # A private temporary file: several processes may write the same cache
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    meta=np.array(json.dumps(meta)),
+                    names=np.array(table.names, dtype=str),
+                    districts=np.array(table.districts, dtype=str),
+                    latitude=table.latitude,
+                    longitude=table.longitude,
+                    day_mask=table.day_mask,
+                    window_start=table.window_start,
+                    window_end=table.window_end,
+                    happiness_bonus=table.happiness_bonus,
+                    duration=table.duration,
+                )
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"Could not write cache {cache_path}: {e}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
 
-    
     # Load transport modes
 
     def load_transport(self, filename):
         filepath = self._full_path(filename)
         modes = []
+        self.errors = []
+        self.error_count = 0
 
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
+            with self.instrument.phase("load", file=os.path.basename(filepath)), \
+                    open(filepath, "r", encoding="utf-8") as f:
                 reader = csv.DictReader(f)
-                for row in reader:
-                    modes.append(
-                        TransportMode(
-                            name=row["Mode"],
-                            speed=float(row["Speed"]),
-                            cost_per_km=float(row["CostPerKm"]),
-                            transfer_time=float(row["TransferTime"])
+                for line, row in enumerate(reader, start=2):
+                    try:
+                        modes.append(
+                            TransportMode(
+                                name=row["Mode"],
+                                speed=float(row["Speed"]),
+                                cost_per_km=float(row["CostPerKm"]),
+                                transfer_time=float(row["TransferTime"])
+                            )
                         )
-                    )
+                    except (KeyError, TypeError, ValueError) as e:
+                        self._row_error(line, None, row, str(e))
         except Exception as e:
             print(f"Error loading transport modes from {filepath}: {e}")
             return []
 
+        self._report_errors(filepath)
         return modes
+
+
+    # Load the transport-mode policy
+
+    def load_mode_policy(self, filename, prune_dominated=True):
+        """
+        ModePolicy from a FromKm,Modes file. Raises OSError for a missing
+        file and ValueError for a malformed policy.
+        """
+        filepath = self._full_path(filename)
+        with self.instrument.phase("load", file=os.path.basename(filepath)):
+            return ModePolicy.from_csv(filepath, prune_dominated=prune_dominated)
+
+
+    # Load an OD matrix
+
+    def load_od_matrix(self, filename):
+        """
+        Memory-mapped ODMatrix from <root>.npy and <root>.json. Raises
+        OSError for missing files and ValueError for a malformed matrix.
+        """
+        filepath = self._full_path(filename)
+        with self.instrument.phase("load", file=os.path.basename(filepath)):
+            return ODMatrix.load(filepath)
+
+
+def file_digest(filepath):
+    """BLAKE2b hex digest of a file's contents."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _parse_days(value):
+    """Day bitmask for "Mon, Thu", or -1 if empty or unknown."""
+    days = [d.strip() for d in value.split(",") if d.strip()]
+    try:
+        return day_mask(days) or -1
+    except KeyError:
+        return -1
+
+
+def _parse_window(value):
+    """(start, end) minutes for "18:00-20:00", or (-1, -1) if invalid."""
+    try:
+        start, end = (parse_hhmm(part) for part in value.split("-"))
+    except ValueError:
+        return -1, -1
+    if start > end:
+        return -1, -1
+    return start, end
+
+
+def _concat(parts):
+    return np.concatenate(parts) if parts else np.empty(0)
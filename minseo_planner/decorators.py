@@ -12,36 +12,28 @@ import functools
 
 
 def measure_runtime(func):
+    """
+    Print the run time of each call. When the first argument has an
+    `instrument` (see instrumentation.py), the call is also recorded
+    there as a phase named after the function.
+    """
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        start = time.time()
+        start = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        end = time.time()
-        elapsed = end - start
+        elapsed = time.perf_counter_ns() - start
 
         # Print to console
-        print(f"[LOG] {func.__name__} completed in {elapsed:.4f} seconds")
+        print(f"[LOG] {func.__name__} completed in {elapsed / 1e9:.4f} seconds")
 
-        # Write runtime log file
-        try:
-            restarts = getattr(args[0], "restarts", "N/A")
-            write_runtime_log(func.__name__, elapsed, restarts)
-        except Exception:
-            pass
+        instrument = getattr(args[0], "instrument", None) if args else None
+        if instrument is not None:
+            instrument.record(func.__name__, elapsed)
 
         return result
     return wrapper
 
 
-
-def write_runtime_log(func_name, elapsed, restarts):
-    with open("runtime_log.txt", "w", encoding="utf-8") as f:
-        f.write("=== Runtime Log ===\n\n")
-        f.write(f"Function: {func_name}\n")
-        f.write(f"Total candidate schedules evaluated: {restarts}\n")
-        f.write(f"Execution time: {elapsed:.4f} seconds\n")
-
-
 def log_call(func):
     """
     Decorator that logs when a function is called.
@@ -0,0 +1,190 @@
+
+"""
+Exact solver for small instances of Minseo's visit planner.
+
+The weekly score is a sum of independent per-day contributions
+(bonus - alpha*minutes - beta*cost + fatigue), so the problem is to pick
+one visit plan per day, using each relative at most once. The solver:
+
+1. enumerates every feasible ordered plan for each day (relatives who
+   prefer that day, up to the daily limit, re-timed with
+   Scheduler.simulate_day so all hour/window rules hold);
+2. runs a depth-first branch-and-bound over the days with a bitmask of
+   visited relatives, pruning with
+   - an upper bound: each still-reachable relative adds at most
+     happiness_bonus - alpha * duration (no travel, full bonus), and at
+     most as many relatives as the remaining daily slots can hold;
+   - a DP dominance check: the same (day, visited set) reached with a
+     lower partial score cannot lead to a better week.
+
+Stops at a hard time limit and then reports the best schedule found
+together with the remaining gap to the best open bound.
+
+Only visit orders are enumerated: each leg takes the transport mode
+simulate_day picks by the scheduler's preference, as the greedy loop
+does. "Optimal" therefore means optimal under that fixed mode choice; a
+slower or dearer mode on some leg could still give a better week.
+"""
+
+import time
+
+from minseo_planner.scoring import ScoringEngine
+
+
+class ExactSolver:
+    def __init__(self, scheduler, relatives, time_limit=10.0):
+        """
+        scheduler: Scheduler with its travel table built for `relatives`
+        time_limit: seconds before the search stops (None = no limit)
+        """
+        self.scheduler = scheduler
+        self.relatives = list(relatives)
+        self.time_limit = time_limit
+        self.scorer = ScoringEngine(alpha=scheduler.alpha, beta=scheduler.beta)
+        self.rel_map = {r.name: r for r in self.relatives}
+        self.bit = {r.name: 1 << i for i, r in enumerate(self.relatives)}
+        self.stats = None
+
+    
+    # DAY PLANS
+
+    def _day_plans(self, day):
+        """
+        All feasible (mask, value, visits) plans for one day, best first.
+        One plan per visit order, with the preference-chosen mode per leg.
+        """
+        _, _, max_visits = self.scheduler.day_limits(day)
+        eligible = [r for r in self.relatives if day in r.preferred_days]
+        plans = [(0, 0.0, [])]
+
+        def extend(sequence, mask):
+            for r in eligible:
+                bit = self.bit[r.name]
+                if mask & bit:
+                    continue
+                candidate = sequence + [r]
+                visits = self.scheduler.simulate_day(day, candidate)
+                if visits is None:
+                    continue
+                plans.append((mask | bit, self._value(day, visits), visits))
+                if len(candidate) < max_visits:
+                    extend(candidate, mask | bit)
+
+        extend([], 0)
+        plans.sort(key=lambda p: -p[1])
+        return plans
+
+    def _value(self, day, visits):
+        bonus, minutes, cost, fatigue = self.scorer.day_terms(day, visits, self.rel_map)
+        return bonus - self.scorer.alpha * minutes - self.scorer.beta * cost + fatigue
+
+    
+    # BOUNDS
+
+    def _prepare_bounds(self, days):
+        # Best conceivable contribution of each relative
+        potential = {
+            r.name: max(0.0, r.happiness_bonus - self.scorer.alpha * r.duration)
+            for r in self.relatives
+        }
+        # Relatives that can still be placed from day index d onwards,
+        # and the daily slots left from d onwards
+        self._reachable = []
+        self._slots = []
+        for d in range(len(days) + 1):
+            later = days[d:]
+            rels = [r for r in self.relatives if any(x in r.preferred_days for x in later)]
+            rels.sort(key=lambda r: -potential[r.name])
+            self._reachable.append([(self.bit[r.name], potential[r.name]) for r in rels])
+            self._slots.append(sum(self.scheduler.day_limits(x)[2] for x in later))
+        self._reachable_masks = [
+            sum(bit for bit, _ in entries) for entries in self._reachable
+        ]
+
+    def _upper_bound(self, d, mask, partial):
+        bound = partial
+        room = self._slots[d]
+        for bit, value in self._reachable[d]:
+            if room == 0 or value <= 0:
+                break
+            if not mask & bit:
+                bound += value
+                room -= 1
+        return bound
+
+    
+    # BRANCH AND BOUND
+
+    def solve(self, days, initial=None):
+        """
+        Best schedule over `days` (under the preference-based mode
+        choice, see the module docstring). `initial` (a feasible schedule, e.g.
+        the greedy winner) seeds the incumbent so pruning starts early
+        and a timed-out search never returns worse than it.
+        """
+        started = time.perf_counter()
+        deadline = None if self.time_limit is None else started + self.time_limit
+
+        plans = [self._day_plans(day) for day in days]
+        self._prepare_bounds(days)
+
+        best = {"value": 0.0, "choice": [[] for _ in days]}  # empty week
+        if initial is not None:
+            seeded = [list(initial.get(day, [])) for day in days]
+            value = sum(self._value(day, visits) for day, visits in zip(days, seeded))
+            if value > best["value"]:
+                best = {"value": value, "choice": seeded}
+        seen = {}
+        nodes = 0
+        open_bound = float("-inf")
+        timed_out = False
+        choice = [None] * len(days)
+
+        def search(d, mask, partial):
+            nonlocal nodes, open_bound, timed_out
+
+            if d == len(days):
+                if partial > best["value"]:
+                    best["value"] = partial
+                    best["choice"] = list(choice)
+                return
+
+            bound = self._upper_bound(d, mask, partial)
+            if timed_out or (deadline is not None and time.perf_counter() >= deadline):
+                timed_out = True
+                open_bound = max(open_bound, bound)
+                return
+            if bound <= best["value"]:
+                return
+
+            key = (d, mask & self._reachable_masks[d])
+            if seen.get(key, float("-inf")) >= partial:
+                return
+            seen[key] = partial
+            nodes += 1
+
+            for plan_mask, value, visits in plans[d]:
+                if plan_mask & mask:
+                    continue
+                choice[d] = visits
+                search(d + 1, mask | plan_mask, partial + value)
+
+        root_bound = self._upper_bound(0, 0, 0.0)
+        search(0, 0, 0.0)
+
+        schedule = {day: visits for day, visits in zip(days, best["choice"])}
+        totals = self.scorer.compute_total_score(schedule, self.relatives)
+
+        upper = max(best["value"], open_bound) if timed_out else best["value"]
+        self.stats = {
+            "optimal": not timed_out,
+            "mode_choice": "preference",
+            "best_value": best["value"],
+            "upper_bound": upper,
+            "gap": upper - best["value"],
+            "root_bound": root_bound,
+            "nodes": nodes,
+            "plans": sum(len(p) for p in plans),
+            "seconds": time.perf_counter() - started,
+        }
+        return schedule, totals
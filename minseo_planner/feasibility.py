@@ -0,0 +1,80 @@
+"""
+Per-relative, per-day feasibility for Minseo's visit planner.
+
+A relative visited after the day's first visit must arrive within both
+Minseo's allowed hours and their preferred window, and leave before the
+day ends. Those rules alone bound each (relative, day) pair to an
+interval of arrival minutes:
+
+    earliest = max(window_start, day_start, day_start + shortest first visit)
+    latest   = min(window_end, day_end - duration)
+
+Pairs whose interval is empty are dropped before any restart runs, like
+days the relative does not prefer. The greedy loop only sees the rest,
+and skips a candidate without looking at its modes once the clock has
+passed its latest arrival. (The first visit of a day starts when the
+day opens, whatever the window, so a preferred day always stays open
+for it.)
+
+Dropped pairs are counted by reason in `rejections`:
+- window_outside_hours: the preferred window misses the allowed hours
+- visit_too_long: no arrival in the window leaves time for the visit
+- after_first_visit: the window closes before any first visit can end
+"""
+
+import numpy as np
+
+from minseo_planner.models import DAY_BITS, DAY_NAMES
+
+REJECTION_REASONS = ("window_outside_hours", "visit_too_long", "after_first_visit")
+
+
+class FeasibilityTable:
+    def __init__(self, relatives, day_limits, days=DAY_NAMES):
+        """
+        relatives: in distance-matrix id order
+        day_limits: function day -> (start_minute, end_minute, max_visits)
+        """
+        n = len(relatives)
+        mask = np.fromiter((r.day_mask for r in relatives), dtype=np.uint8, count=n)
+        window_start = np.fromiter((r.window_start for r in relatives), dtype=np.int64, count=n)
+        window_end = np.fromiter((r.window_end for r in relatives), dtype=np.int64, count=n)
+        duration = np.fromiter((r.duration for r in relatives), dtype=np.float64, count=n)
+
+        # Windows and durations as columns, for vectorized candidate checks
+        self.window_start = window_start
+        self.window_end = window_end
+        self.duration = duration
+
+        self.days = tuple(days)
+        self.prefers = {}    # day -> bool[n]: day is a preferred day
+        self.followers = {}  # day -> bool[n]: may come after the first visit
+        self.latest = {}     # day -> latest arrival minute per relative (list)
+        self.rejections = dict.fromkeys(REJECTION_REASONS, 0)
+
+        follows_somewhere = np.zeros(n, dtype=bool)
+        for day in self.days:
+            day_start, day_end, _ = day_limits(day)
+            prefers = (mask & DAY_BITS[day]) != 0
+            first = duration[prefers].min() if prefers.any() else 0
+
+            latest = np.minimum(window_end, day_end - duration)
+            in_hours = (window_end >= day_start) & (window_start <= day_end)
+            fits = np.maximum(window_start, day_start) <= latest
+            follows = np.maximum(window_start, day_start + first) <= latest
+
+            self.rejections["window_outside_hours"] += int(np.count_nonzero(prefers & ~in_hours))
+            self.rejections["visit_too_long"] += int(np.count_nonzero(prefers & in_hours & ~fits))
+            self.rejections["after_first_visit"] += int(np.count_nonzero(prefers & fits & ~follows))
+
+            self.prefers[day] = prefers
+            self.followers[day] = prefers & follows
+            self.latest[day] = latest.tolist()
+            follows_somewhere |= self.followers[day]
+
+        # Visited only as the first visit of a day, if at all
+        self.first_only = [relatives[i].name for i in np.flatnonzero(~follows_somewhere & (mask != 0))]
+
+    def rejected(self):
+        """Number of (relative, preferred day) pairs dropped."""
+        return sum(self.rejections.values())
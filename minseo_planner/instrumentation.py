@@ -0,0 +1,168 @@
+"""
+Instrumentation for Minseo's visit planner.
+
+An Instrumentation collects
+- phase timings (perf_counter_ns): load, travel table build, each
+  restart, scoring, formatting, rendering, ...
+- counters: candidates examined, feasibility rejections by reason, ...
+and appends one JSON object per line to a sink (a path or a file
+object). Objects that accept `instrument=None` use NULL_INSTRUMENT,
+whose methods do nothing, so disabled instrumentation costs one
+attribute check in the hot loops.
+
+Restart workers (workers > 1) write their own phase events, tagged
+with their pid, and send their phase totals and counters back to the
+parent, so the parent's summary covers the whole run.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+
+
+class Instrumentation:
+    enabled = True
+
+    def __init__(self, sink=None, events=True):
+        """
+        sink: path (appended to) or writable file object; None keeps
+              everything in memory only
+        events: write one line per phase run; False writes only the
+              summaries passed to flush()
+        """
+        self.sink = sink
+        self.events = events
+        self.phases = {}    # name -> [calls, total_ns, max_ns]
+        self.counters = {}
+        self._file = None
+
+    # Open files do not cross process boundaries; a worker reopens a
+    # path sink and drops a file-object sink.
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["_file"] = None
+        if not isinstance(self.sink, (str, os.PathLike)):
+            state["sink"] = None
+        return state
+
+
+    # RECORDING
+
+    @contextmanager
+    def phase(self, name, **fields):
+        """Time the enclosed block as one run of phase `name`."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter_ns() - start, **fields)
+
+    def record(self, name, elapsed_ns, **fields):
+        """Add an externally timed run of phase `name`."""
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = [0, 0, 0]
+        stats[0] += 1
+        stats[1] += elapsed_ns
+        if elapsed_ns > stats[2]:
+            stats[2] = elapsed_ns
+        if self.events:
+            self.emit({"event": "phase", "phase": name, "ns": elapsed_ns, **fields})
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_counts(self, counts):
+        for name, n in counts.items():
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_phases(self, phases):
+        """Merge a worker's phase totals (name -> [calls, total_ns, max_ns])."""
+        for name, (calls, total, longest) in phases.items():
+            stats = self.phases.get(name)
+            if stats is None:
+                stats = self.phases[name] = [0, 0, 0]
+            stats[0] += calls
+            stats[1] += total
+            if longest > stats[2]:
+                stats[2] = longest
+
+
+    # OUTPUT
+
+    def summary(self):
+        return {
+            "phases": {
+                name: {"calls": calls, "total_ns": total, "max_ns": longest}
+                for name, (calls, total, longest) in self.phases.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    def flush(self, **fields):
+        """Write the summary so far as one line."""
+        self.emit({"event": "summary", **fields, **self.summary()})
+
+    def emit(self, record):
+        if self.sink is None:
+            return
+        record = {"t_ns": time.time_ns(), "pid": os.getpid(), **record}
+        line = json.dumps(record) + "\n"
+        if isinstance(self.sink, (str, os.PathLike)):
+            if self._file is None:
+                self._file = open(self.sink, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+        else:
+            self.sink.write(line)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NullInstrumentation:
+    """Disabled instrumentation: every call is a no-op."""
+
+    enabled = False
+    _phase = _NullPhase()
+
+    def phase(self, name, **fields):
+        return self._phase
+
+    def record(self, name, elapsed_ns, **fields):
+        pass
+
+    def count(self, name, n=1):
+        pass
+
+    def add_counts(self, counts):
+        pass
+
+    def add_phases(self, phases):
+        pass
+
+    def summary(self):
+        return {"phases": {}, "counters": {}}
+
+    def flush(self, **fields):
+        pass
+
+    def emit(self, record):
+        pass
+
+    def close(self):
+        pass
+
+
+NULL_INSTRUMENT = NullInstrumentation()
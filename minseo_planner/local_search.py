@@ -0,0 +1,171 @@
+
+"""
+Local-search improvement phase for Minseo's visit planner.
+
+Starts from a constructed schedule (normally a greedy restart) and
+applies first-improvement moves until none helps or the budget runs out:
+- relocate:  move a relative to another slot of the same day, or insert
+             a relative who is not visited yet into a preferred day
+- swap:      exchange two relatives (two visits, or a visit and an
+             unvisited relative)
+- two_opt:   reverse a run of visits within one day
+- cross_day: move a relative to another of its preferred days
+
+Every candidate day is re-timed with Scheduler.simulate_day, so allowed
+hours, preferred windows and the daily visit limits hold after each
+accepted move. Scores are tracked incrementally with ScoreState.
+"""
+
+import time
+
+from minseo_planner.scoring import ScoreState
+
+# Minimum score gain for a move to count as an improvement
+IMPROVEMENT_EPS = 1e-9
+
+MOVE_KINDS = ("relocate", "swap", "two_opt", "cross_day")
+
+
+class LocalSearch:
+    def __init__(self, scheduler, relatives, scorer, max_iterations=None, time_limit=None):
+        """
+        scheduler: Scheduler with its travel table built for `relatives`
+        scorer: ScoringEngine used to accept or reject moves
+        max_iterations: cap on evaluated moves (None = no cap)
+        time_limit: cap in seconds (None = no cap)
+        """
+        self.scheduler = scheduler
+        self.relatives = relatives
+        self.rel_map = {r.name: r for r in relatives}
+        self.scorer = scorer
+        self.max_iterations = max_iterations
+        self.time_limit = time_limit
+        self.stats = None
+
+    
+    # MAIN LOOP
+
+    def improve(self, schedule_by_day):
+        """
+        Returns (schedule_by_day, totals) of the improved schedule and
+        fills self.stats. The input schedule is not modified.
+        """
+        started = time.perf_counter()
+        deadline = None if self.time_limit is None else started + self.time_limit
+
+        state = ScoreState(self.scorer, schedule_by_day, self.relatives)
+        start_score = state.score
+        evaluations = 0
+        moves = {kind: 0 for kind in MOVE_KINDS}
+        stopped_by = "local_optimum"
+
+        improved = True
+        while improved and stopped_by == "local_optimum":
+            improved = False
+
+            for kind, sequences in self._neighbourhood(state.schedule):
+                if self.max_iterations is not None and evaluations >= self.max_iterations:
+                    stopped_by = "iterations"
+                    break
+                if deadline is not None and time.perf_counter() >= deadline:
+                    stopped_by = "time"
+                    break
+                evaluations += 1
+
+                changes = self._retime(sequences)
+                if changes is None:
+                    continue
+
+                if state.delta_days(changes) > IMPROVEMENT_EPS:
+                    state.apply_days(changes)
+                    moves[kind] += 1
+                    improved = True
+                    break
+
+        self.stats = {
+            "start_score": start_score,
+            "final_score": state.score,
+            "gain": state.score - start_score,
+            "evaluations": evaluations,
+            "moves": moves,
+            "seconds": time.perf_counter() - started,
+            "stopped_by": stopped_by,
+        }
+        return state.schedule, state.totals
+
+    def _retime(self, sequences):
+        changes = {}
+        for day, sequence in sequences.items():
+            visits = self.scheduler.simulate_day(day, sequence)
+            if visits is None:
+                return None
+            changes[day] = visits
+        return changes
+
+    
+    # NEIGHBOURHOOD
+    # Yields (kind, {day: ordered relatives}) for the days a move touches.
+
+    def _neighbourhood(self, schedule_by_day):
+        seqs = {
+            day: [self.rel_map[v["name"]] for v in visits]
+            for day, visits in schedule_by_day.items()
+        }
+        placed = {r.name: day for day, seq in seqs.items() for r in seq}
+        unvisited = [r for r in self.relatives if r.name not in placed]
+
+        # Relocate within a day
+        for day, seq in seqs.items():
+            for i in range(len(seq)):
+                rest = seq[:i] + seq[i + 1:]
+                for p in range(len(seq)):
+                    if p != i:
+                        yield "relocate", {day: rest[:p] + [seq[i]] + rest[p:]}
+
+        # Insert an unvisited relative
+        for r in unvisited:
+            for day in r.preferred_days:
+                seq = seqs.get(day, [])
+                for p in range(len(seq) + 1):
+                    yield "relocate", {day: seq[:p] + [r] + seq[p:]}
+
+        # Move to another preferred day
+        for day, seq in seqs.items():
+            for i, r in enumerate(seq):
+                rest = seq[:i] + seq[i + 1:]
+                for other in r.preferred_days:
+                    if other == day or other not in seqs:
+                        continue
+                    target = seqs[other]
+                    for p in range(len(target) + 1):
+                        yield "cross_day", {day: rest, other: target[:p] + [r] + target[p:]}
+
+        # Swap two visits (same or different days)
+        slots = [(day, i) for day, seq in seqs.items() for i in range(len(seq))]
+        for a in range(len(slots)):
+            day_a, i = slots[a]
+            for b in range(a + 1, len(slots)):
+                day_b, j = slots[b]
+                if day_a == day_b:
+                    seq = list(seqs[day_a])
+                    seq[i], seq[j] = seq[j], seq[i]
+                    yield "swap", {day_a: seq}
+                else:
+                    seq_a = list(seqs[day_a])
+                    seq_b = list(seqs[day_b])
+                    seq_a[i], seq_b[j] = seq_b[j], seq_a[i]
+                    yield "swap", {day_a: seq_a, day_b: seq_b}
+
+        # Swap a visit with an unvisited relative
+        for day, i in slots:
+            for r in unvisited:
+                if day in r.preferred_days:
+                    seq = list(seqs[day])
+                    seq[i] = r
+                    yield "swap", {day: seq}
+
+        # Reverse a run of visits within a day
+        for day, seq in seqs.items():
+            for i in range(len(seq) - 1):
+                for j in range(i + 2, len(seq) + 1):
+                    yield "two_opt", {day: seq[:i] + seq[i:j][::-1] + seq[j:]}
@@ -4,10 +4,12 @@ Interactive CLI for Minseo's festival-week visit planner.
 
 Features:
 - Load data from CSV
-- Generate best weekly schedule (50 random restarts)
-- Change scoring weights (alpha, beta)
+- Generate best weekly schedule (random restarts, optionally capped by
+  a time budget or a no-improvement patience)
+- Change scoring weights (alpha, beta), re-ranking the last run's restarts
 - Show last schedule and score
 - Export schedule to file
+- Route maps drawn in place, in a background process, or not at all
 - Basic error handling for menu + files
 """
 
@@ -17,9 +19,24 @@ from minseo_planner.scheduler import Scheduler
 
 
 class Main:
-    def __init__(self):
-        self.data_loader = DataLoader()
-        self.scheduler = Scheduler(preference="time", alpha=0.05, beta=0.02, restarts=50)
+    def __init__(self, restarts=50, time_budget=None, patience=None,
+                 render="background", render_dpi=300, render_format=None, render_workers=1,
+                 metrics=None):
+        """
+        render: "foreground" (maps drawn before the menu returns),
+        "background" (drawn by a separate process) or "off".
+        metrics: path that timings and counters are appended to (JSON lines)
+        """
+        self.instrument = None
+        if metrics:
+            from minseo_planner.instrumentation import Instrumentation
+            self.instrument = Instrumentation(sink=metrics)
+
+        self.data_loader = DataLoader(instrument=self.instrument)
+        self.scheduler = Scheduler(
+            preference="time", alpha=0.05, beta=0.02, restarts=restarts,
+            time_budget=time_budget, patience=patience, instrument=self.instrument
+        )
 
         self.relatives = []
         self.transport_modes = []
@@ -27,6 +44,12 @@ class Main:
         self.last_schedule = None
         self.last_totals = None
 
+        self.render = render
+        self.render_options = {
+            "dpi": render_dpi, "fmt": render_format, "workers": render_workers,
+        }
+        self.render_process = None
+
     
     # DATA LOADING
    
@@ -57,11 +80,18 @@ class Main:
             print("[ERROR] Cannot generate schedule without data.")
             return
 
-        print("\nGenerating best weekly schedule (50 restarts)...")
+        print(f"\nGenerating best weekly schedule (up to {self.scheduler.restarts} restarts)...")
         schedule_by_day, totals = self.scheduler.generate_best_schedule(
             self.relatives, self.transport_modes
         )
 
+        stats = self.scheduler.search_stats
+        print(
+            f"[INFO] Ran {stats['restarts_run']} restarts (stopped by {stats['stopped_by']}); "
+            f"best found at restart {stats['best_restart']}"
+        )
+        print(f"[INFO] Day-plan cache hit rate: {stats['day_cache']['hit_rate']:.0%}")
+
         self.last_schedule = schedule_by_day
         self.last_totals = totals
 
@@ -77,11 +107,29 @@ class Main:
             print(f"[ERROR] Could not save schedule.txt: {e}")
 
         # Generate maps
+        if self.render == "off":
+            return
         try:
-            self.scheduler.plot_route_multi_day(schedule_by_day, save_path="route_map.png")
+            if self.render == "background":
+                from minseo_planner.rendering import render_in_background
+                self.wait_for_render()
+                self.render_process = render_in_background(
+                    schedule_by_day, "route_map.png", **self.render_options
+                )
+                print("[INFO] Drawing route maps in the background.")
+            else:
+                self.scheduler.plot_route_multi_day(
+                    schedule_by_day, save_path="route_map.png", **self.render_options
+                )
         except Exception as e:
             print(f"[ERROR] Could not generate route maps: {e}")
 
+    def wait_for_render(self):
+        """Block until a background map rendering (if any) has finished."""
+        if self.render_process is not None:
+            self.render_process.join()
+            self.render_process = None
+
     def show_last_schedule(self):
         if not self.last_schedule or not self.last_totals:
             print("\n[INFO] No schedule generated yet.")
@@ -109,6 +157,21 @@ class Main:
 
         except ValueError:
             print("[ERROR] Invalid numeric input. Weights unchanged.")
+            return
+
+        # Re-pick the best of the last run's restarts under the new weights
+        if self.last_schedule and self.scheduler.restart_terms is not None:
+            try:
+                self.last_schedule, self.last_totals = self.scheduler.rescore(
+                    self.relatives, self.transport_modes, alpha, beta
+                )
+            except ValueError as e:
+                print(f"[INFO] Last schedule kept; generate again to apply the weights ({e}).")
+                return
+            print(
+                f"[INFO] Re-selected the best of {len(self.scheduler.restart_terms)} cached "
+                f"restarts: final score {self.last_totals['final_score']:.2f}"
+            )
 
     def export_schedule(self):
         if not self.last_schedule or not self.last_totals:
@@ -152,6 +215,10 @@ class Main:
             elif choice == "4":
                 self.export_schedule()
             elif choice == "5":
+                self.wait_for_render()
+                if self.instrument is not None:
+                    self.instrument.flush(command="menu")
+                    self.instrument.close()
                 print("Goodbye.")
                 break
             else:
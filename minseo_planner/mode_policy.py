@@ -0,0 +1,167 @@
+"""
+Transport-mode policy for Minseo's visit planner.
+
+The policy decides which transport modes a trip may use from its
+length: a list of distance bands, each with its allowed modes. It is
+read from mode_policy.csv next to transport.csv:
+
+    FromKm,Modes
+    0,Walking
+    1,Bicycle
+    >3,Bus;Train
+
+A band starts at FromKm (">3" starts just above 3 km) and ends where the
+next one starts; the first band must start at 0. Mode names match
+transport.csv case-insensitively. A band none of whose modes are in the
+transport data allows every mode. DEFAULT_BANDS (the rules above) apply
+when there is no policy file.
+
+ModePolicy.compile(modes) turns the policy into a CompiledPolicy once
+per transport data: band lower edges sorted for np.searchsorted and
+bisect, and per band the indices of its modes. Within a band, a mode
+that another one beats on both minutes and cost over the band's whole
+distance range is dropped (prune_dominated), so the greedy loop never
+evaluates it. Note that the dominated mode could still be the only one
+arriving inside a window (visits cannot wait), so prune_dominated=False
+keeps every mode.
+"""
+
+import bisect
+import csv
+import math
+import os
+
+import numpy as np
+
+# FromKm, inclusive start, mode names
+DEFAULT_BANDS = (
+    (0.0, True, ("Walking",)),
+    (1.0, True, ("Bicycle",)),
+    (3.0, False, ("Bus", "Train")),
+)
+
+POLICY_FILE = "mode_policy.csv"
+
+
+class ModePolicy:
+    def __init__(self, bands=DEFAULT_BANDS, prune_dominated=True):
+        """
+        bands: (from_km, inclusive, mode names) per band, in any order
+        prune_dominated: drop modes beaten on minutes and cost in a band
+        """
+        self.bands = sorted(
+            ((float(start), bool(inclusive), tuple(names)) for start, inclusive, names in bands),
+            key=lambda band: (band[0], not band[1]),
+        )
+        self.prune_dominated = prune_dominated
+
+        if not self.bands or self.bands[0][:2] != (0.0, True):
+            raise ValueError("the first distance band must start at 0 km")
+        starts = [band[:2] for band in self.bands]
+        if len(set(starts)) != len(starts):
+            raise ValueError("two distance bands start at the same distance")
+
+    @classmethod
+    def from_csv(cls, path, prune_dominated=True):
+        """Policy from a FromKm,Modes file; ValueError if it is malformed."""
+        bands = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line, row in enumerate(csv.DictReader(f), start=2):
+                try:
+                    start = row["FromKm"].strip()
+                    inclusive = not start.startswith(">")
+                    names = tuple(n.strip() for n in row["Modes"].split(";") if n.strip())
+                    bands.append((float(start.lstrip(">")), inclusive, names))
+                except (AttributeError, KeyError, ValueError) as e:
+                    raise ValueError(f"{path}, line {line}: bad band ({e})") from None
+                if not names:
+                    raise ValueError(f"{path}, line {line}: band without modes")
+        return cls(bands, prune_dominated=prune_dominated)
+
+    def key(self):
+        return tuple(self.bands), self.prune_dominated
+
+    def compile(self, modes, prune=None):
+        """
+        CompiledPolicy for `modes` (a list of TransportMode). prune=None
+        follows prune_dominated; the scheduler turns it off when an OD
+        matrix replaces the speed/cost model.
+        """
+        prune = self.prune_dominated if prune is None else prune
+        by_name = {}
+        for k, m in enumerate(modes):
+            by_name.setdefault(m.name.lower(), k)
+
+        # Lower edges as inclusive bounds: "> x" is ">= the next float after x"
+        edges = [start if inclusive else math.nextafter(start, math.inf)
+                 for start, inclusive, _ in self.bands]
+        uppers = edges[1:] + [math.inf]
+
+        band_modes = []
+        pruned = []
+        for (_, _, names), low, high in zip(self.bands, edges, uppers):
+            ids = sorted({by_name[n.lower()] for n in names if n.lower() in by_name})
+            if not ids:
+                ids = list(range(len(modes)))
+            kept = ids
+            if prune:
+                kept = [b for b in ids if not any(
+                    a != b and _dominates(modes[a], modes[b], low, high)
+                    and (a < b or not _dominates(modes[b], modes[a], low, high))
+                    for a in ids
+                )]
+            band_modes.append(tuple(kept))
+            pruned.append(tuple(modes[k].name for k in ids if k not in kept))
+
+        return CompiledPolicy(edges, band_modes, pruned)
+
+
+class CompiledPolicy:
+    def __init__(self, edges, band_modes, pruned):
+        """
+        edges: inclusive lower edge (km) of each band, ascending
+        band_modes: per band, tuple of indices into the transport modes
+        pruned: per band, names of the modes dropped as dominated
+        """
+        self.edges = list(edges)
+        self._edges = np.array(self.edges, dtype=np.float64)
+        self.band_modes = list(band_modes)
+        self.pruned = list(pruned)
+
+    def band(self, dist):
+        """Band number of one distance."""
+        return bisect.bisect_right(self.edges, dist) - 1
+
+    def band_of(self, dist):
+        """Band numbers of a distance array."""
+        return (np.searchsorted(self._edges, dist, side="right") - 1).astype(np.uint8)
+
+
+def policy_path(transport_path):
+    """mode_policy.csv next to a transport file, or None if there is none."""
+    path = os.path.join(os.path.dirname(os.path.abspath(transport_path)), POLICY_FILE)
+    return path if os.path.exists(path) else None
+
+
+def _travel(mode, dist):
+    # Same arithmetic as TravelTable._compute
+    hours = dist / mode.speed if mode.speed > 0 else 0
+    return hours * 60 + mode.transfer_time, dist * mode.cost_per_km
+
+
+def _dominates(a, b, low, high):
+    """Mode a takes no more minutes and costs no more than b on [low, high] km."""
+    # Minutes and cost are linear in distance: compare at the ends, and
+    # compare slopes for an open-ended band
+    points = (low,) if math.isinf(high) else (low, high)
+    for dist in points:
+        minutes_a, cost_a = _travel(a, dist)
+        minutes_b, cost_b = _travel(b, dist)
+        if minutes_a > minutes_b or cost_a > cost_b:
+            return False
+    if math.isinf(high):
+        slope_a = 60 / a.speed if a.speed > 0 else 0
+        slope_b = 60 / b.speed if b.speed > 0 else 0
+        if slope_a > slope_b or a.cost_per_km > b.cost_per_km:
+            return False
+    return True
@@ -4,10 +4,42 @@ Data models for Minseo FestivalWeek Visit Planner.
 
 Includes:
 - Relative: stores location, district, preferred days, time windows, duration, bonus
+- RelativeTable: the same fields for many relatives as NumPy columns
 - TransportMode: stores speed, cost, and transfer time
 """
 
+import numpy as np
+
+from minseo_planner.utils import parse_hhmm, format_hhmm
+
+DAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+# Bit per day for preferred-day masks: Mon = 1, Tue = 2, ... Sun = 64
+DAY_BITS = {day: 1 << i for i, day in enumerate(DAY_NAMES)}
+
+
+def day_mask(days):
+    """Bitmask of the given day names."""
+    mask = 0
+    for day in days:
+        mask |= DAY_BITS[day]
+    return mask
+
+
+def mask_days(mask):
+    """Day names set in a bitmask, in week order."""
+    return tuple(day for day in DAY_NAMES if mask & DAY_BITS[day])
+
+
 class Relative:
+    # Read-only by convention: schedules are kept in visit records,
+    # never written back onto the relative.
+    __slots__ = (
+        "name", "latitude", "longitude", "preferred_days", "day_mask",
+        "preferred_window", "window_start", "window_end",
+        "happiness_bonus", "district", "duration",
+    )
+
     def __init__(
         self,
         name,
@@ -23,12 +55,17 @@ class Relative:
         self.latitude = latitude
         self.longitude = longitude
 
-        # Example: ["Mon", "Thu"]
-        self.preferred_days = preferred_days
+        # Example: ("Mon", "Thu"), plus the same days as a bitmask
+        self.preferred_days = tuple(preferred_days)
+        self.day_mask = day_mask(self.preferred_days)
 
         # Example: ("18:00", "20:00")
         self.preferred_window = preferred_window
 
+        # Same window as minutes since midnight, parsed once: (1080, 1200)
+        self.window_start = parse_hhmm(preferred_window[0])
+        self.window_end = parse_hhmm(preferred_window[1])
+
         # Happiness bonus for visiting
         self.happiness_bonus = happiness_bonus
 
@@ -38,19 +75,83 @@ class Relative:
         # Visit duration in minutes (45–90)
         self.duration = duration
 
-        # These fields are filled by the scheduler
-        self.arrival_time_str = None
-        self.departure_time_str = None
-        self.chosen_mode = None
-        self.travel_minutes = 0
-        self.travel_cost = 0
-        self.travel_distance = 0
-
     def __repr__(self):
         return f"Relative({self.name}, {self.district})"
 
 
+class RelativeTable:
+    """
+    Struct-of-arrays store for large relative sets.
+
+    One NumPy column per numeric field (row i is relative i), preferred
+    days as a uint8 bitmask and windows as integer minutes. Names and
+    districts stay Python lists. Relative objects are only built on
+    demand, as views for code that works relative by relative.
+    """
+
+    def __init__(self, names, latitude, longitude, day_mask, window_start,
+                 window_end, happiness_bonus, duration, districts=None):
+        self.names = list(names)
+        self.latitude = np.asarray(latitude, dtype=np.float64)
+        self.longitude = np.asarray(longitude, dtype=np.float64)
+        self.day_mask = np.asarray(day_mask, dtype=np.uint8)
+        self.window_start = np.asarray(window_start, dtype=np.int16)
+        self.window_end = np.asarray(window_end, dtype=np.int16)
+        self.happiness_bonus = np.asarray(happiness_bonus, dtype=np.float64)
+        self.duration = np.asarray(duration, dtype=np.int16)
+        self.districts = list(districts) if districts is not None else [None] * len(self.names)
+
+    @classmethod
+    def from_relatives(cls, relatives):
+        return cls(
+            names=[r.name for r in relatives],
+            latitude=[r.latitude for r in relatives],
+            longitude=[r.longitude for r in relatives],
+            day_mask=[r.day_mask for r in relatives],
+            window_start=[r.window_start for r in relatives],
+            window_end=[r.window_end for r in relatives],
+            happiness_bonus=[r.happiness_bonus for r in relatives],
+            duration=[r.duration for r in relatives],
+            districts=[r.district for r in relatives],
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def prefers(self, day):
+        """Boolean column: which relatives prefer `day`."""
+        return (self.day_mask & DAY_BITS[day]) != 0
+
+    def relative(self, i):
+        """Relative view of row i."""
+        return Relative(
+            name=self.names[i],
+            latitude=float(self.latitude[i]),
+            longitude=float(self.longitude[i]),
+            preferred_days=mask_days(int(self.day_mask[i])),
+            preferred_window=(format_hhmm(self.window_start[i]), format_hhmm(self.window_end[i])),
+            happiness_bonus=float(self.happiness_bonus[i]),
+            district=self.districts[i],
+            duration=int(self.duration[i]),
+        )
+
+    def relatives(self):
+        """Relative views of all rows, in table order."""
+        return [self.relative(i) for i in range(len(self))]
+
+    def nbytes(self):
+        """Bytes held by the NumPy columns."""
+        return sum(
+            a.nbytes for a in (
+                self.latitude, self.longitude, self.day_mask, self.window_start,
+                self.window_end, self.happiness_bonus, self.duration,
+            )
+        )
+
+
 class TransportMode:
+    __slots__ = ("name", "speed", "cost_per_km", "transfer_time")
+
     def __init__(self, name, speed, cost_per_km, transfer_time):
         self.name = name
         self.speed = speed              # km/h
@@ -0,0 +1,112 @@
+"""
+Precomputed origin-destination (OD) travel for Minseo's visit planner.
+
+The planner's own travel model is straight-line haversine distance over
+a mode's speed. A routing engine knows the real minutes and fares; an
+ODMatrix supplies them for every pair and mode it covers, and the
+haversine model is kept for everything it does not.
+
+On disk an OD matrix is two files sharing a root:
+- <root>.npy   array (n, n, modes, 2) holding [minutes, cost], float32
+               or float64, NaN where a pair/mode is unknown
+- <root>.json  {"version": 1, "relatives": [names], "modes": [names]}
+               giving the row/column order and the mode order
+The .npy file is memory-mapped, so only the rows the planner actually
+reads come off disk.
+"""
+
+import json
+import os
+
+import numpy as np
+
+# Bump when the file layout changes
+OD_VERSION = 1
+
+
+class ODMatrix:
+    def __init__(self, names, mode_names, data, path=None):
+        """
+        names: relative names, in row/column order
+        mode_names: transport mode names, in the order of data's 3rd axis
+        data: (n, n, modes, 2) array or memmap of [minutes, cost]
+        path: the .npy file data was mapped from (None: in memory)
+        """
+        self.names = list(names)
+        self.mode_names = list(mode_names)
+        self.data = data
+        self.path = path
+        self.index = {name: i for i, name in enumerate(self.names)}
+
+        expected = (len(self.names), len(self.names), len(self.mode_names), 2)
+        if data.shape != expected:
+            raise ValueError(f"OD matrix has shape {data.shape}, index describes {expected}")
+
+    @classmethod
+    def load(cls, path):
+        """Map <root>.npy and read <root>.json (path may name either)."""
+        root, _ = os.path.splitext(path)
+        with open(root + ".json", "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != OD_VERSION:
+            raise ValueError(f"Unsupported OD matrix version {index.get('version')} in {root}.json")
+        data = np.load(root + ".npy", mmap_mode="r")
+        return cls(index["relatives"], index["modes"], data, path=os.path.abspath(root + ".npy"))
+
+    # A mapped matrix travels to worker processes as its path, not its contents
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        if self.path is not None:
+            state["data"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.data is None:
+            self.data = np.load(self.path, mmap_mode="r")
+
+    def key(self):
+        """Identity for reuse checks: the file and its version on disk."""
+        if self.path is None:
+            return ("memory", id(self))
+        stat = os.stat(self.path)
+        return (self.path, stat.st_size, stat.st_mtime_ns)
+
+
+    # LOOKUPS
+
+    def ids_for(self, names):
+        """OD row per name, -1 for names the matrix does not cover."""
+        return np.array([self.index.get(name, -1) for name in names], dtype=np.int64)
+
+    def columns_for(self, modes):
+        """OD mode column per TransportMode (matched by name), -1 if absent."""
+        columns = {name.lower(): c for c, name in enumerate(self.mode_names)}
+        return np.array([columns.get(m.name.lower(), -1) for m in modes], dtype=np.int64)
+
+    def rows(self, src, dst):
+        """(len(src), len(dst), modes, 2) block; reads only rows src."""
+        order = np.argsort(src, kind="stable")
+        block = np.empty((len(src), len(dst)) + self.data.shape[2:], dtype=np.float64)
+        # Sorted row reads keep access to the mapped file sequential
+        block[order] = self.data[src[order]][:, dst]
+        return block
+
+
+def write_od_matrix(path, names, mode_names, minutes, cost, dtype=np.float32):
+    """
+    Save (n, n, modes) minutes and cost arrays as an OD matrix at
+    <root>.npy / <root>.json. Returns the mapped ODMatrix.
+    """
+    root, _ = os.path.splitext(path)
+    shape = (len(names), len(names), len(mode_names), 2)
+    data = np.lib.format.open_memmap(root + ".npy", mode="w+", dtype=dtype, shape=shape)
+    data[..., 0] = minutes
+    data[..., 1] = cost
+    data.flush()
+    del data
+
+    with open(root + ".json", "w", encoding="utf-8") as f:
+        json.dump({"version": OD_VERSION, "relatives": list(names),
+                   "modes": list(mode_names)}, f)
+    return ODMatrix.load(root + ".npy")
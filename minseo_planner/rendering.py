@@ -0,0 +1,244 @@
+"""
+Route map rendering for Minseo's visit planner.
+
+Draws the combined multi-day map and one map per day, all with the
+same (global) axis limits. Compared to drawing with pyplot figure by
+figure:
+
+- one figure and one set of artists per map size is kept per process
+  and updated in place for each map;
+- maps can be drawn by a pool of worker processes, or entirely in a
+  background process (render_in_background) while the caller goes on;
+- DPI and output format (png, or vector svg/pdf) are configurable;
+- a manifest next to the maps records a digest of what each file
+  shows, so maps whose content did not change are not drawn again.
+
+matplotlib is imported only when a map is actually drawn.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from minseo_planner.utils import format_hhmm
+
+DAY_COLORS = {
+    "Mon": "red",
+    "Tue": "blue",
+    "Wed": "green",
+    "Thu": "purple",
+    "Fri": "orange",
+    "Sat": "brown",
+    "Sun": "pink"
+}
+
+COMBINED_SIZE = (12, 10)
+DAY_SIZE = (10, 8)
+
+# Margin (degrees) around the visited points
+BOUNDS_MARGIN = 0.01
+
+# Bump when the drawing itself changes, so old manifests are ignored
+RENDER_VERSION = 1
+
+
+class RouteRenderer:
+    def __init__(self, dpi=300, fmt=None, workers=1, skip_unchanged=True):
+        """
+        dpi: resolution of raster output
+        fmt: "png", "svg", "pdf", ... (None: taken from the file name)
+        workers: processes drawing maps in parallel (1: in this process)
+        skip_unchanged: keep existing files whose content is the same
+        """
+        self.dpi = dpi
+        self.fmt = fmt
+        self.workers = workers
+        self.skip_unchanged = skip_unchanged
+        self.skipped = []
+
+    def render(self, schedule_by_day, save_path="route_map.png"):
+        """Draw the combined and per-day maps; returns the paths written."""
+        jobs = self.jobs(schedule_by_day, save_path)
+        manifest_path = self._manifest_path(save_path)
+        manifest = self._read_manifest(manifest_path) if self.skip_unchanged else {}
+
+        todo = []
+        self.skipped = []
+        for job in jobs:
+            path, digest = job["path"], job["digest"]
+            if self.skip_unchanged and manifest.get(path) == digest and os.path.exists(path):
+                self.skipped.append(path)
+            else:
+                todo.append(job)
+
+        if self.workers > 1 and len(todo) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(todo))) as pool:
+                written = list(pool.map(draw_map, todo))
+        else:
+            written = [draw_map(job) for job in todo]
+
+        if self.skip_unchanged and todo:
+            manifest.update({job["path"]: job["digest"] for job in todo})
+            self._write_manifest(manifest_path, manifest)
+        return written
+
+
+    # JOBS
+
+    def jobs(self, schedule_by_day, save_path):
+        """One drawing job per map: combined first, then each non-empty day."""
+        days = {day: visits for day, visits in schedule_by_day.items() if visits}
+        if not days:
+            return []
+
+        root, ext = os.path.splitext(save_path)
+        fmt = self.fmt or ext.lstrip(".") or "png"
+        ext = "." + fmt
+
+        lats = [v["lat"] for visits in days.values() for v in visits]
+        lons = [v["lon"] for visits in days.values() for v in visits]
+        bounds = (
+            min(lons) - BOUNDS_MARGIN, max(lons) + BOUNDS_MARGIN,
+            min(lats) - BOUNDS_MARGIN, max(lats) + BOUNDS_MARGIN,
+        )
+
+        jobs = [self._job("Multi-Day Optimized Route Map", days, bounds,
+                          COMBINED_SIZE, root + ext, fmt)]
+        for day, visits in days.items():
+            jobs.append(self._job(f"Route Map — {day}", {day: visits}, bounds,
+                                  DAY_SIZE, f"{root}_{day}{ext}", fmt))
+        return jobs
+
+    def _job(self, title, days, bounds, size, path, fmt):
+        # Only what is drawn goes into the job (and its digest)
+        routes = {
+            day: [
+                (v["name"], v["lon"], v["lat"], format_hhmm(v["arrival"]),
+                 format_hhmm(v["departure"]))
+                for v in visits
+            ]
+            for day, visits in days.items()
+        }
+        job = {
+            "title": title,
+            "routes": routes,
+            "bounds": bounds,
+            "size": size,
+            "dpi": self.dpi,
+            "fmt": fmt,
+        }
+        payload = json.dumps([RENDER_VERSION, job], sort_keys=True).encode("utf-8")
+        job["digest"] = hashlib.sha1(payload).hexdigest()
+        job["path"] = os.path.abspath(path)
+        return job
+
+
+    # MANIFEST (content digests of existing maps)
+
+    def _manifest_path(self, save_path):
+        root, _ = os.path.splitext(save_path)
+        return root + ".render.json"
+
+    def _read_manifest(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, path, manifest):
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+        except OSError as e:
+            print(f"Could not write render manifest {path}: {e}")
+
+
+# DRAWING (one reusable figure per map size and process)
+
+_canvases = {}
+
+
+class _MapCanvas:
+    def __init__(self, size):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.collections import LineCollection
+
+        self.figure = Figure(figsize=size)
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+        self.points = self.ax.scatter([], [], color="black", s=50, zorder=1)
+        self.routes = LineCollection([], linewidths=2, zorder=2)
+        self.ax.add_collection(self.routes)
+        self.labels = []
+
+        self.ax.set_xlabel("Longitude")
+        self.ax.set_ylabel("Latitude")
+        self.ax.grid(True)
+
+    def draw(self, job):
+        routes = job["routes"]
+        stops = [stop for day_stops in routes.values() for stop in day_stops]
+
+        self.points.set_offsets([(lon, lat) for _, lon, lat, _, _ in stops] or [(0, 0)])
+        self.points.set_visible(bool(stops))
+
+        segments = []
+        colors = []
+        for day, day_stops in routes.items():
+            for prev, curr in zip(day_stops, day_stops[1:]):
+                segments.append([(prev[1], prev[2]), (curr[1], curr[2])])
+                colors.append(DAY_COLORS[day])
+        self.routes.set_segments(segments)
+        self.routes.set_color(colors)
+
+        # Reuse label artists; create more only when a map has more stops
+        while len(self.labels) < len(stops):
+            self.labels.append(self.ax.text(0, 0, "", fontsize=8))
+        for label, (name, lon, lat, arrival, departure) in zip(self.labels, stops):
+            label.set_position((lon + 0.001, lat + 0.001))
+            label.set_text(f"{name}\nArr: {arrival}\nDep: {departure}")
+            label.set_visible(True)
+        for label in self.labels[len(stops):]:
+            label.set_visible(False)
+
+        min_lon, max_lon, min_lat, max_lat = job["bounds"]
+        self.ax.set_xlim(min_lon, max_lon)
+        self.ax.set_ylim(min_lat, max_lat)
+        self.ax.set_title(job["title"])
+        self.figure.tight_layout()
+        self.figure.savefig(job["path"], dpi=job["dpi"], format=job["fmt"])
+
+
+def draw_map(job):
+    """Draw one map job; returns its path."""
+    size = tuple(job["size"])
+    canvas = _canvases.get(size)
+    if canvas is None:
+        canvas = _canvases[size] = _MapCanvas(size)
+    canvas.draw(job)
+    return job["path"]
+
+
+# BACKGROUND RENDERING
+
+def render_in_background(schedule_by_day, save_path="route_map.png", **options):
+    """
+    Render in a separate process and return it (already started);
+    join() it to wait. options are RouteRenderer arguments.
+    """
+    process = multiprocessing.Process(
+        target=_render_quietly, args=(schedule_by_day, save_path, options),
+    )
+    process.start()
+    return process
+
+
+def _render_quietly(schedule_by_day, save_path, options):
+    try:
+        RouteRenderer(**options).render(schedule_by_day, save_path)
+    except Exception as e:
+        print(f"[ERROR] Background map rendering failed: {e}")
@@ -0,0 +1,189 @@
+"""
+Persistent cache of planning results for Minseo's visit planner.
+
+Planning the same relatives and transport data with the same Scheduler
+parameters and seed gives the same week, so pipelines that re-run
+identical plans can read the result back instead. Entries are keyed by
+a content hash (fingerprint) of the parsed inputs and the parameters
+and live in a directory per key:
+
+    <cache dir>/<key[:2]>/<key>/result.json     schedule, totals, stats
+    <cache dir>/<key[:2]>/<key>/maps/<variant>/ rendered route maps
+
+The default location is $XDG_CACHE_HOME/minseo-planner/results
+(~/.cache/... without XDG_CACHE_HOME). When the entries grow beyond
+max_bytes the least recently used ones are removed. Only deterministic
+runs are cached: a seed is required and wall-clock limits (time budget,
+local-search time) disable caching.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+# Bump when the stored layout or planning semantics change
+CACHE_VERSION = 1
+
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+RESULT_FILE = "result.json"
+
+
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "minseo-planner", "results")
+
+
+def fingerprint(*parts):
+    """Hex digest of JSON-serialisable parts (tuples hash like lists)."""
+    payload = json.dumps([CACHE_VERSION, parts], sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=20).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES, bypass=False):
+        """
+        directory: where entries live (default: default_cache_dir())
+        max_bytes: total size kept; least recently used entries go first
+        bypass: never read entries (results are still stored, refreshing
+                the cache)
+        """
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def _entry(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+
+    # RESULTS
+
+    def get(self, key):
+        """Stored result dict for `key`, or None."""
+        if self.bypass:
+            return None
+        path = os.path.join(self._entry(key), RESULT_FILE)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self._touch(path)
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        """Store a JSON-serialisable result dict, then evict if needed."""
+        entry = self._entry(key)
+        try:
+            os.makedirs(entry, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=entry, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(result, f)
+            os.replace(tmp_path, os.path.join(entry, RESULT_FILE))
+        except OSError as e:
+            print(f"Could not write result cache entry {entry}: {e}")
+            return
+        self.stores += 1
+        self.evict()
+
+
+    # RENDERED ARTIFACTS
+
+    def get_artifacts(self, key, variant, paths):
+        """
+        Copy the cached files of `variant` (e.g. a render-options digest)
+        to `paths`; False (nothing copied) unless all of them are cached.
+        """
+        if self.bypass:
+            return False
+        folder = os.path.join(self._entry(key), "maps", variant)
+        sources = [os.path.join(folder, os.path.basename(p)) for p in paths]
+        if not paths or not all(os.path.exists(src) for src in sources):
+            return False
+        for src, dst in zip(sources, paths):
+            shutil.copyfile(src, dst)
+        self._touch(os.path.join(self._entry(key), RESULT_FILE))
+        return True
+
+    def put_artifacts(self, key, variant, paths):
+        folder = os.path.join(self._entry(key), "maps", variant)
+        try:
+            os.makedirs(folder, exist_ok=True)
+            for path in paths:
+                shutil.copyfile(path, os.path.join(folder, os.path.basename(path)))
+        except OSError as e:
+            print(f"Could not cache rendered maps in {folder}: {e}")
+            return
+        self.evict()
+
+
+    # SIZE LIMIT
+
+    def entries(self):
+        """(last_used, size_bytes, path) of every entry."""
+        found = []
+        try:
+            shards = os.listdir(self.directory)
+        except OSError:
+            return found
+        for shard in shards:
+            shard_path = os.path.join(self.directory, shard)
+            if not os.path.isdir(shard_path):
+                continue
+            for key in os.listdir(shard_path):
+                entry = os.path.join(shard_path, key)
+                try:
+                    last_used = os.stat(os.path.join(entry, RESULT_FILE)).st_mtime_ns
+                except OSError:
+                    last_used = 0  # incomplete entry: first to go
+                found.append((last_used, _tree_size(entry), entry))
+        return found
+
+    def evict(self):
+        """Remove least recently used entries until within max_bytes."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+    def _touch(self, path):
+        # Last use is the result file's mtime
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+
+def _tree_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
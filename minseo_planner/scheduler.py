@@ -2,7 +2,9 @@
 """
 
 Implements:
-- Random restarts (50)
+- Random restarts (50), optionally across a process pool
+- Anytime stopping: wall-clock budget and no-improvement patience
+- Deterministic per-restart seeds
 - Random starting relative
 - Minseo’s allowed hours
 - Daily visit limits
@@ -14,33 +16,44 @@ Implements:
 - Best schedule selection
 - Runtime logging (decorator)
 - Regex validation
+- Optional local-search improvement of greedy schedules
+- Exact branch-and-bound mode for small instances
+- Grid-based candidate generation for large relative sets
+- Per-relative, per-day feasibility computed once before the restarts
+- Vectorized (NumPy) candidate evaluation in the greedy step
+- Day plans cached across restarts
+- Incremental re-planning after cancellations, changes and additions
+- Persistent cache of results (and maps) for repeated identical runs
+- Routing-engine travel times from a memory-mapped OD matrix
 - Error handling
-- Global axis limits for maps
+- Global axis limits for maps (optional, parallel or background rendering)
 """
 
+import itertools
+import os
 import random
-from datetime import datetime, timedelta
-import networkx as nx
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 
-from minseo_planner.utils import haversine
+import numpy as np
+
+from minseo_planner.utils import haversine, distance_matrix, parse_hhmm, format_hhmm
 from minseo_planner.models import Relative
+from minseo_planner.travel import TravelTable
+from minseo_planner.feasibility import FeasibilityTable
+from minseo_planner.od_matrix import ODMatrix
+from minseo_planner.mode_policy import ModePolicy
+from minseo_planner.result_cache import fingerprint
+from minseo_planner.spatial import GridIndex
 from minseo_planner.scoring import ScoringEngine
+from minseo_planner.local_search import LocalSearch
+from minseo_planner.exact import ExactSolver
 from minseo_planner.decorators import measure_runtime
+from minseo_planner.instrumentation import NULL_INSTRUMENT
 
 WEEK_DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 
-DAY_COLORS = {
-    "Mon": "red",
-    "Tue": "blue",
-    "Wed": "green",
-    "Thu": "purple",
-    "Fri": "orange",
-    "Sat": "brown",
-    "Sun": "pink"
-}
-
 # Minseo’s allowed hours
 ALLOWED_WEEKDAY_START = "18:00"
 ALLOWED_WEEKDAY_END   = "21:00"
@@ -51,44 +64,348 @@ ALLOWED_WEEKEND_END   = "21:00"
 MAX_WEEKDAY_VISITS = 2
 MAX_WEEKEND_VISITS = 3
 
+# Allowed hours as minutes since midnight, parsed once
+WEEKDAY_START_MIN = parse_hhmm(ALLOWED_WEEKDAY_START)
+WEEKDAY_END_MIN   = parse_hhmm(ALLOWED_WEEKDAY_END)
+WEEKEND_START_MIN = parse_hhmm(ALLOWED_WEEKEND_START)
+WEEKEND_END_MIN   = parse_hhmm(ALLOWED_WEEKEND_END)
+
+# Upper bound on restarts per pool task, so a patience or time-budget
+# stop does not leave large chunks running
+MAX_CHUNK_RESTARTS = 64
+
+# Greedy day plans kept for reuse across restarts
+DAY_CACHE_SIZE = 4096
+
+# Incremental re-planning: restarts over the re-solved days, and the
+# score a plan gives up per visit it changes (day, arrival or mode)
+REPLAN_RESTARTS = 20
+REPLAN_CHANGE_PENALTY = 1.0
+
+
+def apply_changes(relatives, changes):
+    """
+    Relatives after cancellations, updates (same name, new data) and
+    additions; see Scheduler.replan for the `changes` layout.
+    """
+    by_name = {r.name: r for r in relatives}
+    for name in changes.get("cancel", []):
+        if name not in by_name:
+            raise ValueError(f"cannot cancel unknown relative {name!r}")
+        del by_name[name]
+    for relative in changes.get("update", []):
+        if relative.name not in by_name:
+            raise ValueError(f"cannot update unknown relative {relative.name!r}")
+        by_name[relative.name] = relative
+    for relative in changes.get("add", []):
+        if relative.name in by_name:
+            raise ValueError(f"relative {relative.name!r} already exists")
+        by_name[relative.name] = relative
+    return list(by_name.values())
+
+
+def _placement(day, visit):
+    return day, round(visit["arrival"], 6), visit["mode"]
+
+
+def count_changed_visits(before, after, relatives_by_name):
+    """
+    Relatives (still in relatives_by_name) whose day, arrival or mode
+    differs between two schedules, counting added and dropped visits.
+    """
+    def placements(schedule):
+        return {
+            v["name"]: _placement(day, v)
+            for day, visits in schedule.items() for v in visits
+            if v["name"] in relatives_by_name
+        }
+
+    old, new = placements(before), placements(after)
+    return sum(old.get(name) != new.get(name) for name in set(old) | set(new))
+
+
+def restart_seed(base_seed, index):
+    """Seed of the RNG stream used by restart number `index`."""
+    return (base_seed << 32) + index
+
+
+def restart_terms(totals):
+    """The weight-free parts of a restart's totals."""
+    return totals["bonus"], totals["minutes"], totals["cost"], totals["fatigue"]
+
+
+def weighted_scores(terms, alpha, beta):
+    """
+    Scores of (bonus, minutes, cost, fatigue) rows under the given
+    weights, with the same arithmetic as ScoringEngine. alpha and beta
+    may be arrays of shape (w, 1) to score many settings at once.
+    """
+    bonus, minutes, cost, fatigue = terms.T
+    return bonus - alpha * minutes - beta * cost + fatigue
+
+
+def pareto_front(points):
+    """
+    Row indices of the non-dominated rows of `points`, where every
+    column is to be maximised. Duplicate rows keep the first.
+    """
+    _, first = np.unique(points, axis=0, return_index=True)
+    first = np.sort(first)
+    candidates = points[first]
+    keep = []
+    for start in range(0, len(candidates), 256):
+        block = candidates[start:start + 256, None, :]
+        dominated = (
+            (candidates[None, :, :] >= block).all(axis=2)
+            & (candidates[None, :, :] > block).any(axis=2)
+        ).any(axis=1)
+        keep.extend(first[start + np.flatnonzero(~dominated)])
+    return np.asarray(keep, dtype=np.int64)
+
+
+def score_distribution(scores):
+    """Summary statistics of restart scores."""
+    if not scores:
+        return {}
+    values = np.asarray(scores, dtype=np.float64)
+    p10, p25, p50, p75, p90 = np.percentile(values, [10, 25, 50, 75, 90])
+    return {
+        "count": int(values.size),
+        "min": float(values.min()),
+        "p10": float(p10),
+        "p25": float(p25),
+        "median": float(p50),
+        "p75": float(p75),
+        "p90": float(p90),
+        "max": float(values.max()),
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+    }
+
+
+class _RestartLedger:
+    """
+    Consumes restart scores in restart-index order, tracks the best one
+    and when it was found, and applies the no-improvement patience.
+    """
+
+    def __init__(self, patience, started):
+        self.patience = patience
+        self.started = started
+        self.scores = []
+        self.terms = []
+        self.improvements = []
+        self.best_index = None
+        self.best_score = None
+        self.since_improvement = 0
+        self.exhausted = False
+
+    def add(self, index, score, finished_at, terms):
+        """Record one restart; returns True if it is the new best."""
+        self.scores.append(score)
+        self.terms.append(terms)
+        if self.best_score is None or score > self.best_score:
+            self.best_index = index
+            self.best_score = score
+            self.since_improvement = 0
+            self.improvements.append({
+                "restart": index,
+                "elapsed": finished_at - self.started,
+                "score": score,
+            })
+            return True
+
+        self.since_improvement += 1
+        if self.patience is not None and self.since_improvement >= self.patience:
+            self.exhausted = True
+        return False
+
+
+class DayPlanCache:
+    """
+    Bounded LRU of greedy day plans, keyed by the day, the starting
+    relative and the set of still-eligible relatives (as a bitmask).
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.plans = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        plan = self.plans.get(key)
+        if plan is None:
+            self.misses += 1
+            return None
+        self.plans.move_to_end(key)
+        self.hits += 1
+        return plan
+
+    def put(self, key, plan):
+        self.plans[key] = plan
+        if len(self.plans) > self.size:
+            self.plans.popitem(last=False)
+
+    def clear(self):
+        self.plans.clear()
+
+    def counts(self):
+        return self.hits, self.misses
+
 
 class Scheduler:
-    def __init__(self, preference="time", alpha=0.05, beta=0.02, restarts=50):
+    def __init__(self, preference="time", alpha=0.05, beta=0.02, restarts=50,
+                 seed=None, workers=1, improve=None, improve_iterations=None,
+                 improve_time=None, solver="restarts", exact_time_limit=10.0,
+                 time_budget=None, patience=None, candidate_search="scan",
+                 candidate_k=None, candidate_eval="scalar", grid_cell_km=1.0,
+                 day_cache_size=DAY_CACHE_SIZE, instrument=None, od_matrix=None,
+                 result_cache=None, mode_policy=None):
         self.preference = preference
         self.alpha = alpha
         self.beta = beta
         self.restarts = restarts
 
-        self.graph = None
+        # seed=None draws a fresh base seed per run (kept in last_seed).
+        # workers > 1 spreads restarts over a process pool; for a given
+        # seed the best schedule does not depend on the worker count.
+        self.seed = seed
+        self.workers = workers
+        self.last_seed = None
+
+        # Anytime stopping: restarts end at `restarts`, after time_budget
+        # seconds, or after `patience` restarts without a new best,
+        # whichever comes first; the first restart runs even when the
+        # budget is used up by the table build, so a valid input always
+        # gets a schedule. search_stats records how the run went.
+        self.time_budget = time_budget
+        self.patience = patience
+        self.search_stats = None
+
+        # Local search after greedy construction: None (off), "best" (the
+        # winning restart only) or "each" (every restart). The budgets cap
+        # each improvement run (move evaluations / seconds).
+        self.improve = improve
+        self.improve_iterations = improve_iterations
+        self.improve_time = improve_time
+        self.improve_stats = None
+        self.restart_terms = None
+        self.replan_stats = None
+        self.planned_relatives = None
+        self.planned_modes = None
+
+        # solver="exact" replaces the restarts with branch-and-bound; it
+        # proves the optimum over visit orders, with modes chosen by the
+        # preference as in the greedy loop, unless exact_time_limit
+        # (seconds) runs out.
+        self.solver = solver
+        self.exact_time_limit = exact_time_limit
+        self.exact_stats = None
+
+        # Candidate generation in the greedy loop: "scan" checks every
+        # remaining relative; "grid" only those within reach of the current
+        # position (same schedules, fewer checks). candidate_k additionally
+        # caps each step to the k nearest eligible relatives, widening
+        # only when none of them fits (faster, but a heuristic).
+        self.candidate_search = candidate_search
+        self.candidate_k = candidate_k
+        self.grid_cell_km = grid_cell_km
+        self.spatial = None
+
+        # How each greedy step checks its candidates: "scalar" (one mode
+        # of one candidate at a time) or "vector" (every candidate and
+        # mode at once with NumPy). Both choose the same visits.
+        self.candidate_eval = candidate_eval
+
+        # Dense pairwise distances (km), indexed by integer relative id.
+        # index maps relative name -> row/column in the matrix.
+        self.distances = None
+        self.index = None
+        self.relatives_by_id = None
+
+        # Routing-engine minutes and cost (ODMatrix or path to one); pairs
+        # and modes it does not cover use the haversine model
+        if isinstance(od_matrix, str):
+            od_matrix = ODMatrix.load(od_matrix)
+        self.od_matrix = od_matrix
+
+        # Which modes each distance band allows (ModePolicy or path to a
+        # mode_policy.csv; default: mode_policy.DEFAULT_BANDS), compiled
+        # for the transport modes when the travel table is built
+        if isinstance(mode_policy, str):
+            mode_policy = ModePolicy.from_csv(mode_policy)
+        self.mode_policy = mode_policy or ModePolicy()
+        self.policy = None
+        self._policy_key = None
+
+        # Per-pair, per-mode travel options; reused while the inputs match
+        self.travel = None
+        self._travel_key = None
+
+        # Latest arrival per relative and day, and who may follow a day's
+        # first visit (see feasibility.py); rebuilt when days, windows or
+        # durations change
+        self.feasibility = None
+
+        # Greedy day plans shared by restarts (and runs) on the same inputs;
+        # day_cache_size=0 turns the cache off.
+        self.day_plans = DayPlanCache(day_cache_size)
+        self._plan_key = None
+
+        self._worker_cache_counts = (0, 0)
+
+        # Phase timings and hot-path counters (see instrumentation.py)
+        self.instrument = instrument or NULL_INSTRUMENT
+
+        # Results of seeded runs kept on disk (a ResultCache, see
+        # result_cache.py); _result_key identifies the last plan's entry
+        self.result_cache = result_cache
+        self._result_key = None
+
         self.best_schedule = None
         self.best_score = None
         self.best_totals = None
 
    
     # TIME HELPERS
+    # Times are minutes since midnight of the visit day; "HH:MM" strings
+    # are only produced when a schedule is formatted or plotted.
 
-    def parse_time(self, t):
-        return datetime.strptime(t, "%H:%M").time()
-
-    def combine(self, day, t):
-        idx = WEEK_DAYS.index(day)
-        base = datetime(2024, 1, 1) + timedelta(days=idx)
-        return datetime.combine(base.date(), t)
+    def day_limits(self, day):
+        """(start_minute, end_minute, max_visits) for the given day."""
+        if day in ("Sat", "Sun"):
+            return WEEKEND_START_MIN, WEEKEND_END_MIN, MAX_WEEKEND_VISITS
+        return WEEKDAY_START_MIN, WEEKDAY_END_MIN, MAX_WEEKDAY_VISITS
 
    
     # MODE SELECTION RULES
 
+    def compile_mode_policy(self, modes):
+        """
+        The mode policy compiled for `modes` (kept while they match).
+        Dominance pruning assumes the speed/cost model, so it is off
+        with an OD matrix.
+        """
+        key = (
+            self.mode_policy.key(),
+            tuple((m.name, m.speed, m.cost_per_km, m.transfer_time) for m in modes),
+            self.od_matrix is None,
+        )
+        if self.policy is None or key != self._policy_key:
+            self.policy = self.mode_policy.compile(
+                modes, prune=self.mode_policy.prune_dominated and self.od_matrix is None
+            )
+            self._policy_key = key
+        return self.policy
+
     def select_modes_for_distance(self, dist, modes):
-        out = []
-        for m in modes:
-            name = m.name.lower()
-            if dist > 3 and name in ("bus", "train"):
-                out.append(m)
-            elif 1 <= dist <= 3 and name == "bicycle":
-                out.append(m)
-            elif dist < 1 and name == "walking":
-                out.append(m)
-        return out or list(modes)
+        policy = self.compile_mode_policy(modes)
+        return [modes[k] for k in policy.band_modes[policy.band(dist)]]
+
+    def distance_band(self, dist):
+        """Policy band number for distance arrays (see mode_policy.py)."""
+        return self.policy.band_of(dist)
 
    
     # TRAVEL STATS
@@ -101,178 +418,1212 @@ class Scheduler:
         return dist, minutes, cost
 
    
-    # BUILD GRAPH
+    # BUILD DISTANCE MATRIX
    
 
-    def build_graph(self, relatives):
-        G = nx.Graph()
-        for r in relatives:
-            G.add_node(r.name, obj=r)
+    def build_distance_matrix(self, relatives):
+        self.index = {r.name: i for i, r in enumerate(relatives)}
+        self.relatives_by_id = list(relatives)
+        self.distances = distance_matrix(
+            [r.latitude for r in relatives],
+            [r.longitude for r in relatives],
+        )
+
+   
+    # BUILD TRAVEL TABLE
+
+    def build_travel_table(self, relatives, modes):
+        """
+        Precompute allowed modes, minutes and cost for every ordered pair.
+
+        The table only depends on locations and transport modes, so it is
+        reused across restarts and across alpha/beta changes as long as
+        the same inputs are planned again.
+        """
+        key, plan_key = self._input_keys(relatives, modes)
+        if plan_key != self._plan_key:
+            self.day_plans.clear()
+            self._plan_key = plan_key
+            self.feasibility = None
+            if self.travel is not None and key == self._travel_key:
+                # Same people and places; ids now refer to the new records
+                by_name = {r.name: r for r in relatives}
+                self.relatives_by_id = [by_name[old.name] for old in self.relatives_by_id]
+
+        if self.travel is not None and key == self._travel_key:
+            return self.travel
+
+        with self.instrument.phase("travel_table", relatives=len(relatives)):
+            return self._build_travel_table(relatives, modes, key)
+
+    def _input_keys(self, relatives, modes):
+        """(travel table key, day plan key) of a set of planning inputs."""
+        key = (
+            tuple(sorted((r.name, r.latitude, r.longitude) for r in relatives)),
+            tuple((m.name, m.speed, m.cost_per_km, m.transfer_time) for m in modes),
+            None if self.od_matrix is None else self.od_matrix.key(),
+            self.mode_policy.key(),
+        )
+        # Day plans also depend on days, windows and durations
+        plan_key = (key, tuple(sorted(
+            (r.name, tuple(r.preferred_days), r.window_start, r.window_end, r.duration)
+            for r in relatives
+        )))
+        return key, plan_key
+
+    def _drop_stale_tables(self, relatives, modes):
+        """
+        Forget travel table, feasibility and day plans unless they were
+        built for these inputs; the next use builds them afresh.
+        """
+        if self.travel is None or self._input_keys(relatives, modes)[1] == self._plan_key:
+            return
+        self.travel = None
+        self._travel_key = None
+        self.distances = None
+        self.index = None
+        self.relatives_by_id = None
+        self.spatial = None
+        self.feasibility = None
+        self.day_plans.clear()
+        self._plan_key = None
+
+    def _build_travel_table(self, relatives, modes, key):
+        self.build_distance_matrix(relatives)
+
+        policy = self.compile_mode_policy(modes)
+        self.travel = TravelTable(
+            self.distances, modes, policy.band_of, policy.band_modes,
+            od=self.od_matrix, names=[r.name for r in self.relatives_by_id],
+        )
+        self._travel_key = key
+        self.spatial = None
+        self.feasibility = None
+        return self.travel
+
+    def build_feasibility(self):
+        """
+        Feasibility table for the relatives of the travel table (built on
+        first use). Requires build_travel_table() to have run.
+        """
+        if self.feasibility is None:
+            with self.instrument.phase("feasibility", relatives=len(self.relatives_by_id)):
+                self.feasibility = FeasibilityTable(self.relatives_by_id, self.day_limits)
+            self.instrument.add_counts({
+                f"infeasible_{reason}": count
+                for reason, count in self.feasibility.rejections.items()
+            })
+        return self.feasibility
 
-        for i in range(len(relatives)):
-            for j in range(i + 1, len(relatives)):
-                a, b = relatives[i], relatives[j]
-                dist = haversine(a.latitude, a.longitude, b.latitude, b.longitude)
-                G.add_edge(a.name, b.name, distance_km=dist)
+    def build_spatial_index(self):
+        """Grid index in distance-matrix id order (built on first use)."""
+        if self.spatial is None:
+            self.spatial = GridIndex(
+                [r.latitude for r in self.relatives_by_id],
+                [r.longitude for r in self.relatives_by_id],
+                cell_km=self.grid_cell_km,
+            )
+        return self.spatial
 
-        self.graph = G
+    def reach_km(self, current_min, day_end, min_duration):
+        """
+        Farthest distance a next visit can be: arrival plus the shortest
+        visit must fit before day_end, travelling at the fastest speed
+        with the smallest transfer time.
+        """
+        if self.travel.od is not None:
+            return float("inf")  # OD travel times need not grow with distance
+        modes = self.travel.modes
+        if any(m.speed <= 0 for m in modes):
+            return float("inf")  # zero speed means zero travel time
+        spare = day_end - current_min - min_duration - min(m.transfer_time for m in modes)
+        return max(spare, 0) * max(m.speed for m in modes) / 60
 
    
     # CHECK MINSEO’S ALLOWED HOURS
 
-    def allowed_hours(self, day, arrival_time):
-        if day in ("Sat", "Sun"):
-            return ALLOWED_WEEKEND_START <= arrival_time <= ALLOWED_WEEKEND_END
-        else:
-            return ALLOWED_WEEKDAY_START <= arrival_time <= ALLOWED_WEEKDAY_END
+    def allowed_hours(self, day, arrival_minute):
+        day_start, day_end, _ = self.day_limits(day)
+        return day_start <= arrival_minute <= day_end
+
+    
+    # VISIT LEGS
+    # Shared by the greedy constructor and simulate_day so both apply
+    # exactly the same feasibility rules and mode choice.
+
+    def _visit_record(self, rel, arrival_min, depart_min, mode_name, dist_km, travel_min, cost):
+        return {
+            "name": rel.name,
+            "district": rel.district,
+            "lat": rel.latitude,
+            "lon": rel.longitude,
+            "arrival": arrival_min,
+            "departure": depart_min,
+            "mode": mode_name,
+            "distance": dist_km,
+            "travel_time": travel_min,
+            "cost": cost
+        }
+
+    def _best_leg(self, cand, j, current_min, day_start, day_end, band_row, minutes_row,
+                  cost_row, rejects=None):
+        """
+        Best feasible mode for travelling to `cand` (column j of the rows).
+        Returns (metric, mode_index, travel_min, cost, arrival_min, depart_min)
+        or None when no allowed mode gets there in time. `rejects`, if
+        given, counts infeasible modes by reason.
+        """
+        best = None
+
+        for slot, k in enumerate(self.travel.band_modes[band_row[j]]):
+            travel_min = float(minutes_row[j, slot])
+            cost = float(cost_row[j, slot])
+            arrival_min = current_min + travel_min
+
+            # Check allowed hours
+            if not (day_start <= arrival_min <= day_end):
+                if rejects is not None:
+                    rejects["reject_allowed_hours"] += 1
+                continue
+
+            # Check preferred window
+            if not (cand.window_start <= arrival_min <= cand.window_end):
+                if rejects is not None:
+                    rejects["reject_preferred_window"] += 1
+                continue
+
+            depart_min = arrival_min + cand.duration
+
+            # Check departure still within allowed hours
+            if depart_min > day_end:
+                if rejects is not None:
+                    rejects["reject_departure_overflow"] += 1
+                continue
+
+            # Preference metric
+            metric = travel_min if self.preference == "time" else cost
+
+            if best is None or metric < best[0]:
+                best = (metric, k, travel_min, cost, arrival_min, depart_min)
+
+        return best
+
+    def _best_candidate(self, batch, current_min, day_start, day_end, band_row, minutes_row,
+                        cost_row, feasibility, rejects=None):
+        """
+        _best_leg over a whole batch of candidate ids at once. Returns
+        (best, expired): best is (relative, j, leg) for the candidate the
+        scalar loop would pick (lowest metric, then lowest id; first mode
+        slot on equal metrics) or None; expired holds the ids past their
+        latest arrival.
+        """
+        ids = np.fromiter(batch, dtype=np.int64, count=len(batch))
+        window_start = feasibility.window_start[ids, None]
+        window_end = feasibility.window_end[ids, None]
+        duration = feasibility.duration[ids, None]
+
+        latest = np.minimum(window_end[:, 0], day_end - duration[:, 0])
+        live = current_min <= latest
+        expired = ids[~live].tolist()
+        ids = ids[live]
+        window_start, window_end, duration = window_start[live], window_end[live], duration[live]
+
+        # (candidates, slots): slots past a band's modes are not modes
+        slot_modes = self.travel.slot_mode
+        band = band_row[ids]
+        valid = slot_modes[band] >= 0
+        minutes = minutes_row[ids]
+        cost = cost_row[ids]
+
+        arrival = current_min + minutes
+        depart = arrival + duration
+        in_hours = (day_start <= arrival) & (arrival <= day_end)
+        in_window = (window_start <= arrival) & (arrival <= window_end)
+        in_time = depart <= day_end
+        feasible = valid & in_hours & in_window & in_time
+
+        if rejects is not None:
+            rejects["reject_allowed_hours"] += int(np.count_nonzero(valid & ~in_hours))
+            rejects["reject_preferred_window"] += int(np.count_nonzero(
+                valid & in_hours & ~in_window))
+            rejects["reject_departure_overflow"] += int(np.count_nonzero(
+                valid & in_hours & in_window & ~in_time))
+
+        metric = np.where(feasible, minutes if self.preference == "time" else cost, np.inf)
+        slot = metric.argmin(axis=1)              # first slot on equal metrics
+        best = metric[np.arange(len(ids)), slot]
+        if len(ids) == 0 or not np.isfinite(best.min()):
+            return None, expired
+
+        row = np.flatnonzero(best == best.min())
+        row = row[ids[row].argmin()]               # lowest id on equal metrics
+        j, s = int(ids[row]), int(slot[row])
+        leg = (float(best[row]), int(slot_modes[band[row], s]), float(minutes[row, s]),
+               float(cost[row, s]), float(arrival[row, s]), float(depart[row, s]))
+        return (self.relatives_by_id[j], j, leg), expired
+
+    
+    # CANDIDATE GENERATION
+
+    def _candidate_batches(self, day, ci, current, reach, eligible_ids):
+        """
+        Yield lists of candidate relative ids near relative id `ci`.
+        Without candidate_k a single batch holds everyone within `reach`
+        km; with it, batches of the k nearest follow in distance order.
+        """
+        dist_row = self.distances[ci]
+        k = self.candidate_k
+
+        if k is None:
+            ids = np.asarray(self.spatial.within(current.latitude, current.longitude, reach))
+            ids = ids[dist_row[ids] <= reach].tolist()
+            yield [j for j in ids if j in eligible_ids]
+            return
+
+        # Beyond the farthest relative a wider circle finds nobody new
+        # (and an OD matrix makes reach unbounded)
+        farthest = float(dist_row.max()) if len(dist_row) else 0.0
+
+        seen = set()
+        radius = min(self.grid_cell_km, reach)
+        while True:
+            ids = np.asarray(self.spatial.within(current.latitude, current.longitude, radius))
+            ids = ids[dist_row[ids] <= radius].tolist()
+            found = [j for j in ids if j not in seen and j in eligible_ids]
+            found.sort(key=dist_row.__getitem__)
+            seen.update(found)
+
+            for start in range(0, len(found), k):
+                yield found[start:start + k]
+
+            if radius >= reach or radius >= farthest:
+                return
+            radius = min(radius * 2, reach)
 
     
     # GREEDY SCHEDULE FOR ONE RESTART
 
-    def greedy_schedule(self, relatives, modes):
+    def greedy_schedule(self, relatives, modes, rng=random):
+        if self.travel is None:
+            self.build_travel_table(relatives, modes)
+
         schedule_by_day = {d: [] for d in WEEK_DAYS}
-        remaining = relatives[:]  # global pool of unvisited relatives
+        schedule_by_day.update(self._greedy_days(WEEK_DAYS, relatives, rng))
+        return schedule_by_day
+
+    def _greedy_days(self, days, relatives, rng):
+        """Greedy plans for `days` in order, each relative visited at most once."""
+        schedule_by_day = {d: [] for d in days}
+        feasible = self.build_feasibility()
+
+        # Day buckets are the feasibility columns restricted to `alive`
+        # (unvisited relatives of this call), in the caller's order;
+        # clearing one flag removes a relative from every bucket
+        order = np.fromiter((self.index[r.name] for r in relatives), dtype=np.int64,
+                            count=len(relatives))
+        alive = np.zeros(len(self.index), dtype=bool)
+        alive[order] = True
+
+        cache = self.day_plans if self.day_plans.size > 0 else None
+        settings = (self.preference, self.candidate_search, self.candidate_k)
     
-        for day in WEEK_DAYS:
+        for day in days:
     
-            # Filter relatives who prefer this day
-            todays_relatives = [r for r in remaining if day in r.preferred_days]
-            if not todays_relatives:
+            # Relatives who prefer this day, in the caller's order
+            todays = order[feasible.prefers[day][order] & alive[order]]
+            if len(todays) == 0:
                 continue
     
-            # Determine allowed hours for this day
-            if day in ("Sat", "Sun"):
-                day_start = self.parse_time(ALLOWED_WEEKEND_START)
-                day_end   = self.parse_time(ALLOWED_WEEKEND_END)
-                max_visits = MAX_WEEKEND_VISITS
-            else:
-                day_start = self.parse_time(ALLOWED_WEEKDAY_START)
-                day_end   = self.parse_time(ALLOWED_WEEKDAY_END)
-                max_visits = MAX_WEEKDAY_VISITS
-    
             # Pick a starting relative for this day
-            start = random.choice(todays_relatives)
-            current = start
-            current_dt = self.combine(day, day_start)
-    
-            # Add first visit
-            depart_dt = current_dt + timedelta(minutes=current.duration)
-            schedule_by_day[day].append({
-                "name": current.name,
-                "district": current.district,
-                "lat": current.latitude,
-                "lon": current.longitude,
-                "arrival": current_dt.time().strftime("%H:%M"),
-                "departure": depart_dt.time().strftime("%H:%M"),
-                "mode": "Start",
-                "distance": 0,
-                "travel_time": 0,
-                "cost": 0
-            })
-    
-            current_dt = depart_dt
-            remaining.remove(start)
-    
-            # Continue scheduling for THIS day only
-            while len(schedule_by_day[day]) < max_visits:
-    
-                best_choice = None
-                best_metric = None
+            start = rng.choice(todays.tolist())
+
+            # The rest of the day depends only on (day, start, followers)
+            followers = feasible.followers[day] & alive
+            followers[start] = False
+
+            plan = None
+            if cache is not None:
+                key = (day, start, np.packbits(followers).tobytes(), settings)
+                plan = cache.get(key)
+
+            if plan is None:
+                plan = self._plan_day(day, start, np.flatnonzero(followers).tolist())
+                if cache is not None:
+                    cache.put(key, plan)
+
+            schedule_by_day[day] = [dict(v) for v in plan]
+            alive[[self.index[v["name"]] for v in plan]] = False
     
-                for cand in remaining:
-                    if day not in cand.preferred_days:
+        return schedule_by_day
+
+    def _plan_day(self, day, start, follower_ids):
+        """
+        Greedy visits for one day from relative id `start`, choosing
+        among follower_ids (relatives who may come after a first visit on
+        this day, see feasibility.py). Equal metrics go to the lowest
+        relative id, so the plan does not depend on the order of
+        follower_ids. Returns a tuple of visit records.
+        """
+        travel = self.travel
+        modes = travel.modes
+        by_id = self.relatives_by_id
+        feasibility = self.build_feasibility()
+        latest = feasibility.latest[day]
+        vectorized = self.candidate_eval == "vector"
+
+        # Determine allowed hours for this day
+        day_start, day_end, max_visits = self.day_limits(day)
+
+        current = by_id[start]
+        current_min = day_start
+
+        # Add first visit
+        depart_min = current_min + current.duration
+        visits = [self._visit_record(current, current_min, depart_min, "Start", 0, 0, 0)]
+
+        current_min = depart_min
+
+        # Candidate bucket: insertion-ordered ids with O(1) removal
+        eligible = dict.fromkeys(follower_ids)
+
+        # Counted only when instrumentation is on
+        rejects = None
+        if self.instrument.enabled:
+            rejects = dict.fromkeys((
+                "candidates_examined", "reject_latest_arrival", "reject_allowed_hours",
+                "reject_preferred_window", "reject_departure_overflow",
+            ), 0)
+
+        use_grid = self.candidate_search == "grid"
+        if use_grid and eligible:
+            self.build_spatial_index()
+            min_duration = min(by_id[j].duration for j in eligible)
+
+        # Continue scheduling for THIS day only
+        while len(visits) < max_visits and eligible:
+
+            best_choice = None
+            ci = self.index[current.name]
+            rows = travel.row(ci)
+
+            if use_grid:
+                reach = self.reach_km(current_min, day_end, min_duration)
+                batches = self._candidate_batches(day, ci, current, reach, eligible)
+            else:
+                batches = (eligible,)
+
+            # Past their latest arrival now, and so for the rest of the day
+            expired = []
+            for batch in batches:
+                if rejects is not None:
+                    rejects["candidates_examined"] += len(batch)
+                if vectorized:
+                    best_choice, gone = self._best_candidate(
+                        batch, current_min, day_start, day_end, *rows, feasibility, rejects
+                    )
+                    expired.extend(gone)
+                    if best_choice is not None:
+                        break
+                    continue
+
+                for j in batch:
+                    if current_min > latest[j]:
+                        expired.append(j)
                         continue
-    
-                    # Travel stats
-                    dist = self.graph[current.name][cand.name]["distance_km"]
-                    allowed_modes = self.select_modes_for_distance(dist, modes)
-    
-                    for mode in allowed_modes:
-                        dist_km, travel_min, cost = self.travel_stats(current, cand, mode)
-                        arrival_dt = current_dt + timedelta(minutes=travel_min)
-                        arrival_t = arrival_dt.time()
-    
-                        # Check allowed hours
-                        if not (day_start <= arrival_t <= day_end):
-                            continue
-    
-                        # Check preferred window
-                        pref_start = self.parse_time(cand.preferred_window[0])
-                        pref_end   = self.parse_time(cand.preferred_window[1])
-                        if not (pref_start <= arrival_t <= pref_end):
-                            continue
-    
-                        depart_dt = arrival_dt + timedelta(minutes=cand.duration)
-                        depart_t = depart_dt.time()
-    
-                        # Check departure still within allowed hours
-                        if not (day_start <= depart_t <= day_end):
-                            continue
-    
-                        # Preference metric
-                        metric = travel_min if self.preference == "time" else cost
-    
-                        if best_metric is None or metric < best_metric:
-                            best_metric = metric
-                            best_choice = (cand, arrival_dt, depart_dt, mode, dist_km, travel_min, cost)
-    
-                if best_choice is None:
+
+                    # Travel options (precomputed per pair)
+                    leg = self._best_leg(by_id[j], j, current_min, day_start, day_end,
+                                         *rows, rejects)
+
+                    if leg is not None and (
+                        best_choice is None
+                        or leg[0] < best_choice[2][0]
+                        or (leg[0] == best_choice[2][0] and j < best_choice[1])
+                    ):
+                        best_choice = (by_id[j], j, leg)
+
+                if best_choice is not None:
                     break
+
+            for j in expired:
+                del eligible[j]
+            if rejects is not None:
+                rejects["reject_latest_arrival"] += len(expired)
+
+            if best_choice is None:
+                break
+
+            cand, j, (_, k, travel_min, cost, arrival_min, depart_min) = best_choice
+
+            visits.append(self._visit_record(
+                cand, arrival_min, depart_min, modes[k].name,
+                float(self.distances[ci, j]), travel_min, cost
+            ))
+
+            current = cand
+            current_min = depart_min
+            del eligible[j]
+
+        if rejects is not None:
+            self.instrument.add_counts(rejects)
+        return tuple(visits)
+
     
-                cand, arrival_dt, depart_dt, mode, dist_km, travel_min, cost = best_choice
-    
-                schedule_by_day[day].append({
-                    "name": cand.name,
-                    "district": cand.district,
-                    "lat": cand.latitude,
-                    "lon": cand.longitude,
-                    "arrival": arrival_dt.time().strftime("%H:%M"),
-                    "departure": depart_dt.time().strftime("%H:%M"),
-                    "mode": mode.name,
-                    "distance": dist_km,
-                    "travel_time": travel_min,
-                    "cost": cost
-                })
-    
-                current = cand
-                current_dt = depart_dt
-                remaining.remove(cand)
+    # RE-TIME A FIXED VISIT ORDER
+
+    def simulate_day(self, day, sequence):
+        """
+        Visit records for relatives visited in the given order on `day`,
+        using the greedy's rules: the first visit starts when the day
+        opens, every later leg takes the preferred feasible mode.
+        Returns None if the order breaks a preferred day, allowed hours,
+        a preferred window or the daily visit limit.
+        Requires build_travel_table() to have run.
+        """
+        day_start, day_end, max_visits = self.day_limits(day)
+        if len(sequence) > max_visits:
+            return None
+        if not sequence:
+            return []
+
+        current = sequence[0]
+        if day not in current.preferred_days:
+            return None
+
+        depart_min = day_start + current.duration
+        visits = [self._visit_record(current, day_start, depart_min, "Start", 0, 0, 0)]
+        current_min = depart_min
+
+        for cand in sequence[1:]:
+            if day not in cand.preferred_days:
+                return None
+
+            ci = self.index[current.name]
+            j = self.index[cand.name]
+            leg = self._best_leg(cand, j, current_min, day_start, day_end, *self.travel.row(ci))
+            if leg is None:
+                return None
+
+            _, k, travel_min, cost, arrival_min, depart_min = leg
+            visits.append(self._visit_record(
+                cand, arrival_min, depart_min, self.travel.modes[k].name,
+                float(self.distances[ci, j]), travel_min, cost
+            ))
+            current = cand
+            current_min = depart_min
+
+        return visits
+
+
+    # ONE SEEDED RESTART
+
+    def run_restart(self, relatives, modes, base_seed, index):
+        """
+        Greedy construction for restart `index`, driven only by its own
+        RNG stream. The caller's list is never reordered.
+        """
+        rng = random.Random(restart_seed(base_seed, index))
+        order = relatives[:]
+        rng.shuffle(order)
+        return self.greedy_schedule(order, modes, rng=rng)
+
+    def restart_result(self, relatives, modes, base_seed, index, scorer):
+        """
+        Build (and optionally improve) restart `index`.
+        Returns (score, schedule, totals, improve_stats).
+        """
+        instrument = self.instrument
+        with instrument.phase("restart", restart=index):
+            schedule = self.run_restart(relatives, modes, base_seed, index)
+        stats = None
+        if self.improve == "each":
+            with instrument.phase("improve", restart=index):
+                schedule, totals, stats = self.improve_schedule(schedule, relatives)
+        else:
+            with instrument.phase("score", restart=index):
+                totals = scorer.compute_total_score(schedule, relatives)
+        return totals["final_score"], schedule, totals, stats
+
+    def best_of_restarts(self, relatives, modes, base_seed, start, stop, deadline=None):
+        """
+        Run restarts [start, stop) and keep the best one.
+        Ties go to the lowest restart index. Stops early once
+        time.time() passes `deadline`, but restart 0 always runs.
+        Returns (best, records) where best is
+        (index, score, schedule, totals, improve_stats) and records holds
+        (index, score, finished_at, terms) for every restart that ran,
+        terms being its (bonus, minutes, cost, fatigue) totals.
+        """
+        scorer = ScoringEngine(alpha=self.alpha, beta=self.beta)
+        best = (None, None, None, None, None)
+        records = []
+
+        for index in range(start, stop):
+            if index > 0 and deadline is not None and time.time() >= deadline:
+                break
+
+            result = self.restart_result(relatives, modes, base_seed, index, scorer)
+            records.append((index, result[0], time.time(), restart_terms(result[2])))
+
+            if best[1] is None or result[0] > best[1]:
+                best = (index,) + result
+
+        return best, records
+
     
-        return schedule_by_day
+    # LOCAL SEARCH
+
+    def improve_schedule(self, schedule_by_day, relatives):
+        """
+        Run the local-search phase on one schedule.
+        Returns (schedule_by_day, totals, stats).
+        """
+        search = LocalSearch(
+            self, relatives, ScoringEngine(alpha=self.alpha, beta=self.beta),
+            max_iterations=self.improve_iterations, time_limit=self.improve_time,
+        )
+        schedule, totals = search.improve(schedule_by_day)
+        return schedule, totals, search.stats
+
+
+    # EXACT SOLVER
+
+    def solve_exact(self, relatives, modes):
+        """
+        Optimal schedule by branch-and-bound (see exact.py), over visit
+        orders with each leg's mode chosen by the preference. exact_stats
+        tells whether that optimality was proven and, if the time limit
+        hit first, the remaining gap to the best open bound.
+        """
+        self.build_travel_table(relatives, modes)
+
+        # A few seeded greedy restarts give the search a starting incumbent
+        seed = 0 if self.seed is None else self.seed
+        initial = self.best_of_restarts(relatives, modes, seed, 0, min(self.restarts, 10))[0][2]
+
+        solver = ExactSolver(self, relatives, time_limit=self.exact_time_limit)
+        schedule, totals = solver.solve(WEEK_DAYS, initial=initial)
+        self.exact_stats = solver.stats
+        return schedule, totals
 
 
     # MAIN ENTRY: RUN 50 RESTARTS AND PICK BEST
 
     @measure_runtime
-    def generate_best_schedule(self, relatives, modes):
-        self.build_graph(relatives)
-        scorer = ScoringEngine(alpha=self.alpha, beta=self.beta)
+    def generate_best_schedule(self, relatives, modes, time_budget=None, patience=None):
+        """plan() with its runtime printed and logged."""
+        return self.plan(relatives, modes, time_budget=time_budget, patience=patience)
+
+    def plan(self, relatives, modes, time_budget=None, patience=None):
+        """
+        Best schedule over the restarts. time_budget (seconds) and
+        patience (restarts without improvement) default to the values
+        given to the constructor; the first limit reached ends the run.
+        Details are left in search_stats.
+        """
+        self.planned_relatives = list(relatives)
+        self.planned_modes = list(modes)
+        with self.instrument.phase("plan", relatives=len(relatives), solver=self.solver):
+            key = self._result_key = self.result_key(relatives, modes, time_budget, patience)
+            if key is not None:
+                cached = self.result_cache.get(key)
+                self.instrument.count("result_cache_miss" if cached is None else "result_cache_hit")
+                if cached is not None:
+                    # Nothing is built on a hit; tables of earlier inputs must go
+                    self._drop_stale_tables(relatives, modes)
+                    return self._restore_result(cached)
+
+            schedule, totals = self._plan(relatives, modes, time_budget, patience)
+            if key is not None and self.solver != "exact":
+                self.search_stats["result_cache"] = "miss"
+
+            # Nothing found (e.g. restarts=0) is not worth keeping
+            cacheable = schedule is not None and (
+                self.solver != "exact" or self.exact_stats["optimal"])
+            if key is not None and cacheable:
+                self.result_cache.put(key, self._result_entry(schedule, totals))
+            return schedule, totals
+
+
+    # RESULT CACHE
+
+    def result_key(self, relatives, modes, time_budget=None, patience=None):
+        """
+        Fingerprint of everything a plan depends on, or None when the run
+        is not reproducible (no cache, no seed, wall-clock limits) or an
+        OD matrix lives only in memory (its id may be reused later).
+        """
+        time_budget = self.time_budget if time_budget is None else time_budget
+        patience = self.patience if patience is None else patience
+        if (self.result_cache is None or self.seed is None or time_budget is not None
+                or self.improve_time is not None):
+            return None
+        if self.od_matrix is not None and self.od_matrix.path is None:
+            return None
 
-        best_score = None
-        best_schedule = None
-        best_totals = None
+        from minseo_planner import __version__
+        return fingerprint(
+            __version__,
+            [(r.name, r.latitude, r.longitude, list(r.preferred_days), r.window_start,
+              r.window_end, r.happiness_bonus, r.district, r.duration) for r in relatives],
+            [(m.name, m.speed, m.cost_per_km, m.transfer_time) for m in modes],
+            None if self.od_matrix is None else list(self.od_matrix.key()),
+            [list(self.mode_policy.bands), self.mode_policy.prune_dominated],
+            {
+                "preference": self.preference, "alpha": self.alpha, "beta": self.beta,
+                "restarts": self.restarts, "seed": self.seed, "patience": patience,
+                "improve": self.improve, "improve_iterations": self.improve_iterations,
+                "solver": self.solver, "exact_time_limit": self.exact_time_limit,
+                "candidate_search": self.candidate_search, "candidate_k": self.candidate_k,
+                "grid_cell_km": self.grid_cell_km,
+            },
+        )
 
-        for _ in range(self.restarts):
-            random.shuffle(relatives)
-            schedule = self.greedy_schedule(relatives, modes)
-            totals = scorer.compute_total_score(schedule, relatives)
-            score = totals["final_score"]
+    def _result_entry(self, schedule, totals):
+        return {
+            "schedule": schedule,
+            "totals": totals,
+            "seed": self.last_seed,
+            "search_stats": self.search_stats,
+            "improve_stats": self.improve_stats,
+            "exact_stats": self.exact_stats,
+            "restart_terms": None if self.restart_terms is None else self.restart_terms.tolist(),
+        }
 
-            if best_score is None or score > best_score:
-                best_score = score
-                best_schedule = schedule
-                best_totals = totals
+    def _restore_result(self, entry):
+        schedule, totals = entry["schedule"], entry["totals"]
+        self.last_seed = entry["seed"]
+        self.search_stats = entry["search_stats"]
+        if self.search_stats is not None:
+            self.search_stats["result_cache"] = "hit"
+        self.improve_stats = entry["improve_stats"]
+        self.exact_stats = entry["exact_stats"]
+        self.restart_terms = None
+        if entry["restart_terms"] is not None:
+            self.restart_terms = np.array(entry["restart_terms"], dtype=np.float64).reshape(-1, 4)
+        self.best_schedule = schedule
+        self.best_score = totals["final_score"]
+        self.best_totals = totals
+        return schedule, totals
+
+    def _plan(self, relatives, modes, time_budget, patience):
+        # A reused scheduler must not report the previous run's details
+        self.search_stats = None
+        self.improve_stats = None
+        self.exact_stats = None
+        if self.solver == "exact":
+            self.restart_terms = None
+            schedule, totals = self.solve_exact(relatives, modes)
+            self.best_schedule = schedule
+            self.best_score = totals["final_score"]
+            self.best_totals = totals
+            return schedule, totals
+
+        started = time.time()
+        time_budget = self.time_budget if time_budget is None else time_budget
+        patience = self.patience if patience is None else patience
+        deadline = None if time_budget is None else started + time_budget
+
+        self.build_travel_table(relatives, modes)
+        self.build_feasibility()
+
+        base_seed = self.seed
+        if base_seed is None:
+            base_seed = random.SystemRandom().randrange(2 ** 32)
+        self.last_seed = base_seed
+
+        ledger = _RestartLedger(patience, started)
+        hits, misses = self.day_plans.counts()
+        self._worker_cache_counts = (0, 0)
+        if self.workers > 1 and self.restarts > 1:
+            best, timed_out = self._run_restarts_parallel(
+                relatives, modes, base_seed, deadline, ledger
+            )
+        else:
+            best, timed_out = self._run_restarts_serial(
+                relatives, modes, base_seed, deadline, ledger
+            )
+
+        _, best_score, best_schedule, best_totals, improve_stats = best
+
+        if self.improve == "best" and best_schedule is not None:
+            best_schedule, best_totals, improve_stats = self.improve_schedule(
+                best_schedule, relatives
+            )
+            best_score = best_totals["final_score"]
 
         self.best_schedule = best_schedule
         self.best_score = best_score
         self.best_totals = best_totals
+        self.improve_stats = improve_stats
+
+        worker_hits, worker_misses = self._worker_cache_counts
+        hits = self.day_plans.hits - hits + worker_hits
+        misses = self.day_plans.misses - misses + worker_misses
+
+        if ledger.exhausted:
+            stopped_by = "patience"
+        elif timed_out:
+            stopped_by = "time_budget"
+        else:
+            stopped_by = "restarts"
+
+        self.search_stats = {
+            "restarts_run": len(ledger.scores),
+            "stopped_by": stopped_by,
+            "elapsed": time.time() - started,
+            "best_restart": ledger.best_index,
+            "improvements": ledger.improvements,
+            "scores": ledger.scores,
+            "distribution": score_distribution(ledger.scores),
+            "day_cache": {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            },
+        }
+
+        # Weight-free totals per restart, for rescore() and weight_sweep()
+        self.restart_terms = np.array(ledger.terms, dtype=np.float64).reshape(-1, 4)
 
         return best_schedule, best_totals
 
     
+    # RE-SCORING CACHED RESTARTS
+    # Greedy construction does not depend on alpha/beta, so the restarts
+    # of the last run can be re-ranked for new weights from their
+    # (bonus, minutes, cost, fatigue) totals without running them again.
+
+    def _check_rescorable(self):
+        if self.restart_terms is None or not len(self.restart_terms):
+            raise ValueError("no restarts to re-score; run plan() first")
+        if self.improve == "each":
+            raise ValueError("improve='each' totals depend on the weights; re-run instead")
+
+    def rescore(self, relatives, modes, alpha, beta):
+        """
+        Best schedule of the last run's restarts under new weights.
+        Sets alpha/beta; only the winning restart is rebuilt (from its
+        seed) and, with improve="best", improved again.
+        """
+        self._check_rescorable()
+        self.build_travel_table(relatives, modes)
+        self.alpha = alpha
+        self.beta = beta
+
+        scores = weighted_scores(self.restart_terms, alpha, beta)
+        index = int(np.argmax(scores))  # ties go to the lowest restart index
+
+        scorer = ScoringEngine(alpha=alpha, beta=beta)
+        _, schedule, totals, improve_stats = self.restart_result(
+            relatives, modes, self.last_seed, index, scorer
+        )
+        if self.improve == "best":
+            schedule, totals, improve_stats = self.improve_schedule(schedule, relatives)
+
+        self.best_schedule = schedule
+        self.best_score = totals["final_score"]
+        self.best_totals = totals
+        self.improve_stats = improve_stats
+        return schedule, totals
+
+    def weight_sweep(self, alphas, betas, block=1024):
+        """
+        Winning restart for every (alpha, beta) in the grid alphas x betas.
+
+        Returns a dict with
+            "winners": (len(alphas), len(betas)) restart indices
+            "scores":  the matching best scores
+            "front":   Pareto front of the restarts over (bonus + fatigue,
+                       minutes, cost), each entry with the number of grid
+                       settings it wins. Winners for non-negative weights
+                       always lie on it.
+        Scores are before local search.
+        """
+        self._check_rescorable()
+
+        # Restarts often repeat the same totals; score each distinct row
+        # once, keeping rows in first-occurrence order so ties still go
+        # to the lowest restart index.
+        _, first = np.unique(self.restart_terms, axis=0, return_index=True)
+        first = np.sort(first)
+        terms = self.restart_terms[first]
+
+        alpha_grid, beta_grid = np.meshgrid(
+            np.asarray(alphas, dtype=np.float64), np.asarray(betas, dtype=np.float64),
+            indexing="ij",
+        )
+        flat_alpha = alpha_grid.ravel()
+        flat_beta = beta_grid.ravel()
+
+        winners = np.empty(flat_alpha.size, dtype=np.int64)
+        best = np.empty(flat_alpha.size, dtype=np.float64)
+        for start in range(0, flat_alpha.size, block):
+            stop = start + block
+            scores = weighted_scores(
+                terms, flat_alpha[start:stop, None], flat_beta[start:stop, None]
+            )
+            winners[start:stop] = scores.argmax(axis=1)
+            best[start:stop] = scores[np.arange(scores.shape[0]), winners[start:stop]]
+
+        winners = first[winners]
+        terms = self.restart_terms
+        wins = np.bincount(winners, minlength=len(terms))
+        objectives = np.column_stack((terms[:, 0] + terms[:, 3], -terms[:, 1], -terms[:, 2]))
+        front = [
+            {
+                "restart": int(i),
+                "bonus": float(terms[i, 0]),
+                "minutes": float(terms[i, 1]),
+                "cost": float(terms[i, 2]),
+                "fatigue": float(terms[i, 3]),
+                "wins": int(wins[i]),
+            }
+            for i in pareto_front(objectives)
+        ]
+
+        return {
+            "winners": winners.reshape(alpha_grid.shape),
+            "scores": best.reshape(alpha_grid.shape),
+            "front": front,
+        }
+
+
+    # INCREMENTAL RE-PLANNING
+    # After a relative cancels, changes or joins, only the days the change
+    # touches are solved again; every other day keeps its visits.
+
+    def replan(self, previous_schedule, changes, relatives=None, modes=None, ripple=1,
+               restarts=REPLAN_RESTARTS, change_penalty=REPLAN_CHANGE_PENALTY):
+        """
+        Repair previous_schedule after `changes`, a dict with any of
+            "cancel": names of relatives who are no longer visited
+            "update": Relative objects replacing those of the same name
+                      (new days, window, duration or location)
+            "add":    new Relative objects
+        relatives and modes default to those of the last plan.
+
+        The days visiting a cancelled or updated relative and the
+        preferred days of updated or added ones are solved again, from
+        their previous visits plus everyone unscheduled; other days stay
+        fixed. Relatives pushed out of a re-solved day open their
+        preferred days for up to `ripple` further rounds. Each day keeps
+        its (re-timed) visits, keeps them with an updated, added or
+        displaced relative inserted (or swapped for one visit), or takes
+        those of one of `restarts` greedy runs; plans are ranked by final
+        score minus change_penalty per changed visit. Returns
+        (schedule, totals); see replan_stats.
+        """
+        started = time.perf_counter()
+        if relatives is None:
+            relatives = self.planned_relatives
+        if relatives is None:
+            raise ValueError("no relatives to re-plan; pass them or run plan() first")
+        if modes is None:
+            modes = self.planned_modes
+        if modes is None:
+            raise ValueError("no transport modes to re-plan with; pass them or run plan() first")
+
+        relatives = apply_changes(relatives, changes)
+        self._travel_for_replan(relatives, modes)
+        by_name = {r.name: r for r in relatives}
+        scorer = ScoringEngine(alpha=self.alpha, beta=self.beta)
+        seed = self.seed if self.seed is not None else (self.last_seed or 0)
+
+        previous = {
+            day: [v for v in previous_schedule.get(day, []) if v["name"] in by_name]
+            for day in WEEK_DAYS
+        }
+        visited_on = {v["name"]: day for day, visits in previous_schedule.items()
+                      for v in visits}
+
+        changed = [r.name for r in list(changes.get("update", [])) + list(changes.get("add", []))]
+        frontier = {visited_on[name] for name in list(changes.get("cancel", [])) + changed
+                    if name in visited_on}
+        for name in changed:
+            frontier.update(by_name[name].preferred_days)
+
+        schedule = {day: [dict(v) for v in previous[day]] for day in WEEK_DAYS}
+        solved = []
+        candidates = 0
+        newcomers = [by_name[name] for name in changed]
+        for _ in range(ripple + 1):
+            days = [d for d in WEEK_DAYS if d in frontier and d not in solved]
+            if not days:
+                break
+            schedule, tried = self._resolve_days(
+                schedule, days, relatives, previous_schedule, scorer, seed,
+                restarts, change_penalty, newcomers,
+            )
+            solved.extend(days)
+            candidates += tried
+
+            # Previously visited relatives that lost their visit may fit elsewhere
+            now_visited = {v["name"] for visits in schedule.values() for v in visits}
+            displaced = [by_name[name] for name in visited_on
+                         if name in by_name and name not in now_visited]
+            frontier = {d for r in displaced for d in r.preferred_days}
+            newcomers = displaced
+
+        totals = scorer.compute_total_score(schedule, relatives)
+        self.planned_relatives = relatives
+        self.planned_modes = list(modes)
+        self.best_schedule = schedule
+        self.best_score = totals["final_score"]
+        self.best_totals = totals
+        self.restart_terms = None  # the last run's restarts no longer apply
+        self._result_key = None
+        self.replan_stats = {
+            "days_resolved": [d for d in WEEK_DAYS if d in solved],
+            "days_kept": [d for d in WEEK_DAYS if d not in solved],
+            "candidates": candidates,
+            "changed_visits": count_changed_visits(previous_schedule, schedule, by_name),
+            "elapsed": time.perf_counter() - started,
+        }
+        return schedule, totals
+
+    def _travel_for_replan(self, relatives, modes):
+        """
+        Keep the travel table when it already covers every relative at its
+        location (cancellations, new days or windows); otherwise rebuild.
+        """
+        covered = (
+            self.travel is not None
+            and self.travel.modes == list(modes)
+            and all(
+                r.name in self.index
+                and (self.relatives_by_id[self.index[r.name]].latitude,
+                     self.relatives_by_id[self.index[r.name]].longitude)
+                == (r.latitude, r.longitude)
+                for r in relatives
+            )
+        )
+        if not covered:
+            self.build_travel_table(relatives, modes)
+            return
+
+        # Day plans may hold relatives' old days, windows or durations;
+        # the next build_travel_table call compares its inputs afresh.
+        self.day_plans.clear()
+        self._plan_key = None
+        by_name = {r.name: r for r in relatives}
+        self.relatives_by_id = [by_name.get(old.name, old) for old in self.relatives_by_id]
+        self.feasibility = None
+
+    def _resolve_days(self, schedule, days, relatives, original, scorer, seed, restarts,
+                      change_penalty, newcomers=()):
+        """
+        Best plan for `days` where each day keeps its current visits
+        (re-timed; visits that no longer fit are dropped), keeps them with
+        one of `newcomers` inserted, or takes those of a greedy restart.
+        Returns (schedule, candidates tried).
+        """
+        by_name = {r.name: r for r in relatives}
+        fixed = {v["name"] for day, visits in schedule.items() if day not in days
+                 for v in visits}
+        pool = [r for r in relatives if r.name not in fixed]
+
+        kept = {day: self._repair_day(day, [by_name[v["name"]] for v in schedule[day]])
+                for day in days}
+
+        variants = []
+        for index in range(restarts):
+            rng = random.Random(restart_seed(seed, index))
+            order = pool[:]
+            rng.shuffle(order)
+            variants.append(self._greedy_days(days, order, rng))
+
+        # Score terms and placements of every distinct day plan, once
+        offers = {}
+
+        def offer(day, visits):
+            key = (day, tuple((v["name"], v["arrival"], v["mode"]) for v in visits))
+            if key not in offers:
+                offers[key] = (
+                    visits,
+                    scorer.day_terms(day, visits, by_name),
+                    {v["name"]: _placement(day, v) for v in visits},
+                )
+            return offers[key]
+
+        before = {v["name"]: _placement(day, v) for day, visits in original.items()
+                  for v in visits if v["name"] in by_name}
+        here = {name for name, placement in before.items() if placement[0] in days}
+        fixed_terms = [scorer.day_terms(day, schedule[day], by_name)
+                       for day in WEEK_DAYS if day not in days]
+
+        def day_rank(day, visits):
+            placed = {v["name"]: _placement(day, v) for v in visits}
+            names = {name for name, p in before.items() if p[0] == day} | set(placed)
+            changes = sum(before.get(name) != placed.get(name) for name in names)
+            terms = scorer.day_terms(day, visits, by_name)
+            return scorer.combine_day_terms([terms])["final_score"] - change_penalty * changes
+
+        # Minimal changes: kept visits plus one newcomer, placed where it
+        # ranks best on its own day (greedy restarts pick by travel time
+        # and may leave a newcomer out)
+        local = {}
+        for day in days:
+            sequence = [by_name[v["name"]] for v in kept[day]]
+            names = {r.name for r in sequence}
+            local[day] = [kept[day]]
+            for relative in newcomers:
+                if relative.name in fixed or relative.name in names:
+                    continue
+                trials = self._insertions(day, sequence, relative)
+                if trials:
+                    local[day].append(max(trials, key=lambda visits: day_rank(day, visits)))
+
+        best = None
+        tried = set()
+        for variant in [kept] + variants:
+            # Each day from the restart, as it was or with a newcomer
+            choices = [local[day] + [variant[day]] for day in days]
+            for plans in itertools.product(*choices):
+                combo = tuple(offer(day, visits) for day, visits in zip(days, plans))
+                key = tuple(id(o) for o in combo)
+                if key in tried:
+                    continue
+                tried.add(key)
+
+                after = {}
+                for o in combo:
+                    after.update(o[2])
+                if sum(len(o[2]) for o in combo) != len(after):
+                    continue  # a relative visited twice
+
+                score = scorer.combine_day_terms(
+                    fixed_terms + [o[1] for o in combo]
+                )["final_score"]
+                changes = sum(before.get(name) != after.get(name)
+                              for name in here | set(after))
+                rank = (score - change_penalty * changes, -changes)
+                if best is None or rank > best[0]:
+                    best = (rank, combo)
+
+        result = dict(schedule)
+        for day, o in zip(days, best[1]):
+            result[day] = [dict(v) for v in o[0]]
+        return result, len(tried)
+
+    def _insertions(self, day, sequence, relative):
+        """
+        Feasible visits of `sequence` on `day` with `relative` added at
+        some position or in place of one visit, in trial order.
+        """
+        trials = [sequence[:p] + [relative] + sequence[p:] for p in range(len(sequence) + 1)]
+        trials += [sequence[:p] + [relative] + sequence[p + 1:] for p in range(len(sequence))]
+        plans = (self.simulate_day(day, trial) for trial in trials)
+        return [visits for visits in plans if visits is not None]
+
+    def _repair_day(self, day, sequence):
+        """Visits of `sequence` re-timed on `day`, skipping those that no longer fit."""
+        kept = []
+        visits = []
+        for relative in sequence:
+            trial = self.simulate_day(day, kept + [relative])
+            if trial is not None:
+                kept.append(relative)
+                visits = trial
+        return visits
+
+    def _run_restarts_serial(self, relatives, modes, base_seed, deadline, ledger):
+        scorer = ScoringEngine(alpha=self.alpha, beta=self.beta)
+        best = (None, None, None, None, None)
+
+        for index in range(self.restarts):
+            if index > 0 and deadline is not None and time.time() >= deadline:
+                return best, True
+
+            result = self.restart_result(relatives, modes, base_seed, index, scorer)
+            if ledger.add(index, result[0], time.time(), restart_terms(result[2])):
+                best = (index,) + result
+            if ledger.exhausted:
+                break
+
+        return best, False
+
+    def _run_restarts_parallel(self, relatives, modes, base_seed, deadline, ledger):
+        # Several small chunks per worker keep cores busy when chunks run
+        # unevenly and let a patience/time stop cancel pending work. Each
+        # chunk sends back only its winner plus per-restart scores, which
+        # the ledger consumes in restart order exactly like the serial run.
+        chunk_size = -(-self.restarts // (self.workers * 4))
+        chunk_size = max(1, min(chunk_size, MAX_CHUNK_RESTARTS))
+
+        def bounds(c):
+            start = c * chunk_size
+            return start, min(start + chunk_size, self.restarts)
+
+        best = (None, None, None, None, None)
+        timed_out = False
+        cache_hits = cache_misses = 0
+
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_restart_worker,
+            initargs=(self, relatives, modes),
+        )
+        # Only a small window of chunks is in flight at any time, so huge
+        # restart counts do not queue thousands of tasks (or chunk
+        # bounds) up front.
+        chunks = iter(range(-(-self.restarts // chunk_size)))
+        pending = deque()
+
+        def submit_next():
+            c = next(chunks, None)
+            if c is not None:
+                pending.append((c, pool.submit(
+                    _run_restart_chunk, base_seed, *bounds(c), deadline
+                )))
+
+        try:
+            for _ in range(self.workers * 2):
+                submit_next()
+
+            while pending:
+                c, future = pending.popleft()
+                chunk_best, records, (hits, misses), counters, phases = future.result()
+                self.instrument.add_counts(counters)
+                self.instrument.add_phases(phases)
+                cache_hits += hits
+                cache_misses += misses
+                for index, score, finished_at, terms in records:
+                    ledger.add(index, score, finished_at, terms)
+                    if ledger.exhausted:
+                        break
+
+                if chunk_best[0] == ledger.best_index:
+                    best = chunk_best
+                if ledger.exhausted:
+                    break
+                start, stop = bounds(c)
+                if len(records) < stop - start:
+                    timed_out = True
+                    break
+                submit_next()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        self._worker_cache_counts = (cache_hits, cache_misses)
+
+        # A patience stop inside a chunk can leave the best at a restart
+        # that was not the chunk winner; rebuild it from its seed.
+        if ledger.best_index is not None and best[0] != ledger.best_index:
+            scorer = ScoringEngine(alpha=self.alpha, beta=self.beta)
+            best = (ledger.best_index,) + self.restart_result(
+                relatives, modes, base_seed, ledger.best_index, scorer
+            )
+
+        return best, timed_out
+
+    
     # FORMATTING SCHEDULE
 
     def format_schedule(self, schedule_by_day, totals):
+        with self.instrument.phase("format"):
+            return self._format_schedule(schedule_by_day, totals)
+
+    def _format_schedule(self, schedule_by_day, totals):
         lines = []
         lines.append("=== Best Weekly Schedule ===\n")
 
@@ -283,7 +1634,7 @@ class Scheduler:
             lines.append(f"Day {day}")
             for r in schedule_by_day[day]:
                 lines.append(
-                    f"  {r['name']} ({r['arrival']}–{r['departure']})\n"
+                    f"  {r['name']} ({format_hhmm(r['arrival'])}–{format_hhmm(r['departure'])})\n"
                     f"    District: {r['district']}\n"
                     f"    Mode: {r['mode']}\n"
                     f"    Distance: {r['distance']:.2f} km\n"
@@ -303,92 +1654,66 @@ class Scheduler:
 
     # MAP VISUALIZATION (GLOBAL AXIS LIMITS)
 
-    def plot_route_multi_day(self, schedule_by_day, save_path="route_map.png"):
-        # Collect global bounds
-        all_lats = []
-        all_lons = []
+    def plot_route_multi_day(self, schedule_by_day, save_path="route_map.png", dpi=300,
+                             fmt=None, workers=1, skip_unchanged=True):
+        """
+        Combined map plus one map per day (see rendering.RouteRenderer).
+        Returns the paths written; unchanged maps are left as they are.
+        """
+        from minseo_planner.rendering import RouteRenderer
 
-        for day, visits in schedule_by_day.items():
-            for r in visits:
-                all_lats.append(r["lat"])
-                all_lons.append(r["lon"])
+        renderer = RouteRenderer(dpi=dpi, fmt=fmt, workers=workers, skip_unchanged=skip_unchanged)
 
-        min_lat = min(all_lats) - 0.01
-        max_lat = max(all_lats) + 0.01
-        min_lon = min(all_lons) - 0.01
-        max_lon = max(all_lons) + 0.01
+        # Maps of a cached result are copied back instead of drawn again
+        cache = self.result_cache if self._result_key is not None else None
+        if cache is not None:
+            jobs = renderer.jobs(schedule_by_day, save_path)
+            paths = [job["path"] for job in jobs]
+            variant = fingerprint([(job["digest"], os.path.basename(job["path"])) for job in jobs])
+            if cache.get_artifacts(self._result_key, variant, paths):
+                self.instrument.count("result_cache_maps_restored", len(paths))
+                print(f"Maps restored from cache: {len(paths)}")
+                return paths
 
-        # Combined map
-        plt.figure(figsize=(12, 10))
+        with self.instrument.phase("render"):
+            written = renderer.render(schedule_by_day, save_path)
+        if cache is not None and paths:
+            cache.put_artifacts(self._result_key, variant, paths)
+        for path in written:
+            print(f"Map saved: {path}")
+        if renderer.skipped:
+            print(f"Unchanged maps kept: {len(renderer.skipped)}")
+        return written
 
-        for day, visits in schedule_by_day.items():
-            for r in visits:
-                plt.scatter(r["lon"], r["lat"], color="black", s=50)
-                label = f"{r['name']}\nArr: {r['arrival']}\nDep: {r['departure']}"
-                plt.text(r["lon"] + 0.001, r["lat"] + 0.001, label, fontsize=8)
 
-        for day, visits in schedule_by_day.items():
-            if len(visits) < 2:
-                continue
-
-            color = DAY_COLORS[day]
-
-            for i in range(1, len(visits)):
-                prev = visits[i - 1]
-                curr = visits[i]
-
-                plt.plot(
-                    [prev["lon"], curr["lon"]],
-                    [prev["lat"], curr["lat"]],
-                    color=color,
-                    linewidth=2
-                )
-
-        plt.xlim(min_lon, max_lon)
-        plt.ylim(min_lat, max_lat)
-        plt.title("Multi-Day Optimized Route Map")
-        plt.xlabel("Longitude")
-        plt.ylabel("Latitude")
-        plt.grid(True)
-        plt.tight_layout()
-        plt.savefig(save_path, dpi=300)
-        plt.close()
-
-        print(f"Combined map saved: {save_path}")
-
-        # Per-day maps
-        for day, visits in schedule_by_day.items():
-            if not visits:
-                continue
+# PROCESS POOL WORKERS
+# The scheduler (with its travel table) is sent once per worker process.
 
-            plt.figure(figsize=(10, 8))
+_worker_state = None
 
-            for r in visits:
-                plt.scatter(r["lon"], r["lat"], color="black", s=50)
-                label = f"{r['name']}\nArr: {r['arrival']}\nDep: {r['departure']}"
-                plt.text(r["lon"] + 0.001, r["lat"] + 0.001, label, fontsize=8)
 
-            for i in range(1, len(visits)):
-                prev = visits[i - 1]
-                curr = visits[i]
+def _init_restart_worker(scheduler, relatives, modes):
+    global _worker_state
+    _worker_state = (scheduler, relatives, modes)
 
-                plt.plot(
-                    [prev["lon"], curr["lon"]],
-                    [prev["lat"], curr["lat"]],
-                    color=DAY_COLORS[day],
-                    linewidth=2
-                )
 
-            plt.xlim(min_lon, max_lon)
-            plt.ylim(min_lat, max_lat)
-            plt.title(f"Route Map — {day}")
-            plt.xlabel("Longitude")
-            plt.ylabel("Latitude")
-            plt.grid(True)
-            plt.tight_layout()
+def _run_restart_chunk(base_seed, start, stop, deadline):
+    """
+    Chunk winner, per-restart records, this chunk's day-cache hits/misses
+    and the instrumentation counters and phase totals it added.
+    """
+    scheduler, relatives, modes = _worker_state
+    hits, misses = scheduler.day_plans.counts()
+    instrument = scheduler.instrument
+    if instrument.enabled:
+        # Start from zero so the chunk returns only what it recorded
+        instrument.counters = {}
+        instrument.phases = {}
 
-            day_path = save_path.replace(".png", f"_{day}.png")
-            plt.savefig(day_path, dpi=300)
-            plt.close()
+    best, records = scheduler.best_of_restarts(relatives, modes, base_seed, start, stop, deadline)
 
-            print(f"Day map saved: {day_path}")
+    counters = phases = {}
+    if instrument.enabled:
+        counters, phases = instrument.counters, instrument.phases
+    return (best, records, (scheduler.day_plans.hits - hits, scheduler.day_plans.misses - misses),
+            counters, phases)
@@ -7,10 +7,18 @@ Implements:
 - Travel cost penalty (beta)
 - Weekend fatigue penalty
 - Regex validation for HH:MM time format
+- ScoreState: running totals with O(k) delta scoring for local moves
+
+Arrival times are minutes since midnight (as produced by the scheduler);
+"HH:MM" strings are still accepted and validated.
 """
 
 import re
 
+from minseo_planner.utils import parse_hhmm
+
+MINUTES_PER_DAY = 24 * 60
+
 
 class ScoringEngine:
     def __init__(self, alpha=0.05, beta=0.02):
@@ -34,6 +42,19 @@ class ScoringEngine:
     # HAPPINESS BONUS
     
 
+    def arrival_minute(self, arrival):
+        """
+        Whole minutes since midnight for an arrival given as minutes
+        or as an "HH:MM" string. Seconds are ignored, like the HH:MM
+        display of the schedule.
+        """
+        if isinstance(arrival, str):
+            self.validate_time(arrival)
+            return parse_hhmm(arrival)
+        if not (0 <= arrival < MINUTES_PER_DAY):
+            raise ValueError(f"Invalid arrival minute: {arrival}")
+        return int(arrival)
+
     def compute_visit_score(self, visit, relative):
         """
         Full bonus if:
@@ -42,16 +63,15 @@ class ScoringEngine:
         Otherwise:
             - half bonus
         """
-        start = visit["arrival"]
-        self.validate_time(start)
+        return self.visit_bonus(visit, relative, visit["day"])
 
-        day = visit["day"]
-        start_time = start
+    def visit_bonus(self, visit, relative, day):
+        """Same as compute_visit_score, with the day passed explicitly."""
+        start_time = self.arrival_minute(visit["arrival"])
 
         preferred_days = relative.preferred_days
-        pref_start, pref_end = relative.preferred_window
 
-        if (day in preferred_days) and (pref_start <= start_time <= pref_end):
+        if (day in preferred_days) and (relative.window_start <= start_time <= relative.window_end):
             return relative.happiness_bonus
         else:
             return relative.happiness_bonus * 0.5
@@ -66,10 +86,15 @@ class ScoringEngine:
         """
         penalty = 0
         for day, visits in schedule_by_day.items():
-            if day in ("Sat", "Sun") and len(visits) == 3:
-                penalty -= 2
+            penalty += self.day_fatigue(day, len(visits))
         return penalty
 
+    def day_fatigue(self, day, visit_count):
+        """Fatigue contribution of a single day."""
+        if day in ("Sat", "Sun") and visit_count == 3:
+            return -2
+        return 0
+
     
     # TOTAL SCORE
     
@@ -83,29 +108,50 @@ class ScoringEngine:
         - Fatigue penalty
         - Final score
         """
-        total_bonus = 0
-        total_minutes = 0
-        total_cost = 0
-
         # Map name → relative object
         rel_map = {r.name: r for r in relatives}
 
-        for day, visits in schedule_by_day.items():
-            for v in visits:
-                r = rel_map[v["name"]]
-                v["day"] = day  # add day for scoring
+        day_terms = [
+            self.day_terms(day, visits, rel_map)
+            for day, visits in schedule_by_day.items()
+        ]
+        return self.combine_day_terms(day_terms)
 
-                # Happiness
-                total_bonus += self.compute_visit_score(v, r)
+    def day_terms(self, day, visits, rel_map):
+        """
+        (bonus, minutes, cost, fatigue) contributed by one day.
+        Summed visit by visit in schedule order.
+        """
+        bonus = 0
+        minutes = 0
+        cost = 0
+
+        for v in visits:
+            r = rel_map[v["name"]]
+
+            # Happiness
+            bonus += self.visit_bonus(v, r, day)
+
+            # Travel + meeting duration
+            minutes += v["travel_time"] + r.duration
+
+            # Cost
+            cost += v["cost"]
 
-                # Travel + meeting duration
-                total_minutes += v["travel_time"] + r.duration
+        return bonus, minutes, cost, self.day_fatigue(day, len(visits))
 
-                # Cost
-                total_cost += v["cost"]
+    def combine_day_terms(self, day_terms):
+        """Totals dict from per-day terms, summed in day order."""
+        total_bonus = 0
+        total_minutes = 0
+        total_cost = 0
+        fatigue = 0
 
-        # Fatigue
-        fatigue = self.compute_fatigue_penalty(schedule_by_day)
+        for bonus, minutes, cost, day_fatigue in day_terms:
+            total_bonus += bonus
+            total_minutes += minutes
+            total_cost += cost
+            fatigue += day_fatigue
 
         # Final score (matches exam description)
         score = (
@@ -122,3 +168,110 @@ class ScoringEngine:
             "fatigue": fatigue,
             "final_score": score
         }
+
+
+
+class ScoreState:
+    """
+    Running score of one schedule for search procedures.
+
+    Keeps per-day (bonus, minutes, cost, fatigue) terms so a move only
+    re-evaluates the days it touches (O(k) in the visits of those days)
+    and the week total is re-combined from seven cached day terms.
+    The totals always equal compute_total_score() on the current
+    schedule, bit for bit, because both share the same summation order.
+
+    delta_* methods return the score change of a move without changing
+    anything; the matching apply_* method commits it. Visit records are
+    moved as-is: when a move changes arrival times or travel legs, pass
+    the re-timed day lists to delta_days()/apply_days() instead.
+    """
+
+    def __init__(self, engine, schedule_by_day, relatives):
+        self.engine = engine
+        self.rel_map = {r.name: r for r in relatives}
+        self.schedule = {day: list(visits) for day, visits in schedule_by_day.items()}
+        self.terms = {
+            day: engine.day_terms(day, visits, self.rel_map)
+            for day, visits in self.schedule.items()
+        }
+        self.totals = engine.combine_day_terms(self.terms.values())
+
+    @property
+    def score(self):
+        return self.totals["final_score"]
+
+    
+    # GENERIC DAY REPLACEMENT
+
+    def _totals_with(self, changes):
+        terms = dict(self.terms)
+        for day, visits in changes.items():
+            terms[day] = self.engine.day_terms(day, visits, self.rel_map)
+        return terms, self.engine.combine_day_terms(terms.values())
+
+    def delta_days(self, changes):
+        """Score change if each day in `changes` ({day: visits}) were replaced."""
+        _, totals = self._totals_with(changes)
+        return totals["final_score"] - self.score
+
+    def apply_days(self, changes):
+        terms, totals = self._totals_with(changes)
+        for day, visits in changes.items():
+            self.schedule[day] = list(visits)
+        self.terms = terms
+        self.totals = totals
+        return totals
+
+    
+    # ELEMENTARY MOVES (expressed as day replacements)
+
+    def _insert(self, day, visit, index=None):
+        visits = list(self.schedule.get(day, []))
+        visits.insert(len(visits) if index is None else index, visit)
+        return {day: visits}
+
+    def _remove(self, day, index):
+        visits = list(self.schedule[day])
+        del visits[index]
+        return {day: visits}
+
+    def _swap(self, day_a, index_a, day_b, index_b):
+        changes = {day_a: list(self.schedule[day_a])}
+        changes.setdefault(day_b, list(self.schedule[day_b]))
+        a = changes[day_a][index_a]
+        b = changes[day_b][index_b]
+        changes[day_a][index_a] = b
+        changes[day_b][index_b] = a
+        return changes
+
+    def _move(self, src_day, src_index, dst_day, dst_index=None):
+        changes = {src_day: list(self.schedule[src_day])}
+        visit = changes[src_day].pop(src_index)
+        dst = changes.setdefault(dst_day, list(self.schedule.get(dst_day, [])))
+        dst.insert(len(dst) if dst_index is None else dst_index, visit)
+        return changes
+
+    def delta_insert(self, day, visit, index=None):
+        return self.delta_days(self._insert(day, visit, index))
+
+    def delta_remove(self, day, index):
+        return self.delta_days(self._remove(day, index))
+
+    def delta_swap(self, day_a, index_a, day_b, index_b):
+        return self.delta_days(self._swap(day_a, index_a, day_b, index_b))
+
+    def delta_move(self, src_day, src_index, dst_day, dst_index=None):
+        return self.delta_days(self._move(src_day, src_index, dst_day, dst_index))
+
+    def apply_insert(self, day, visit, index=None):
+        return self.apply_days(self._insert(day, visit, index))
+
+    def apply_remove(self, day, index):
+        return self.apply_days(self._remove(day, index))
+
+    def apply_swap(self, day_a, index_a, day_b, index_b):
+        return self.apply_days(self._swap(day_a, index_a, day_b, index_b))
+
+    def apply_move(self, src_day, src_index, dst_day, dst_index=None):
+        return self.apply_days(self._move(src_day, src_index, dst_day, dst_index))
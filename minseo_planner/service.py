@@ -0,0 +1,409 @@
+"""
+Long-running planning service for Minseo's visit planner.
+
+Other processes on the same host send plan requests over a Unix
+socket instead of starting the planner each time. The service
+
+- loads relatives and transport files once per worker and keeps their
+  distance/travel tables (and greedy day plans) warm between requests,
+  reloading a file only when it changes on disk;
+- plans in a worker pool, so the event loop keeps accepting requests;
+- coalesces identical concurrent requests into one computation;
+- keeps per-command latencies and reports percentiles via "stats".
+
+Protocol: one JSON object per line in each direction.
+
+    {"command": "plan", "seed": 1, "restarts": 100, ...}
+    {"command": "stats"}
+    {"command": "ping"}
+    {"command": "shutdown"}
+
+Plan requests may name "relatives" and "transport" files (default: the
+service's), "map" (route map path to draw) and any of PLAN_OPTIONS;
+omitted options take the Scheduler defaults. Replies are
+{"ok": true, "result": ...} or {"ok": false, "error": "..."}, echoing
+the request's "id" if it had one.
+
+Run with `minseo-planner serve --socket PATH`; `request()` is a small
+synchronous client.
+"""
+
+import asyncio
+import inspect
+import json
+import os
+import signal
+import socket
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+# Scheduler arguments a plan request may set
+PLAN_OPTIONS = (
+    "preference", "alpha", "beta", "restarts", "seed", "time_budget", "patience",
+    "improve", "improve_iterations", "improve_time", "solver", "exact_time_limit",
+    "candidate_search", "candidate_k", "candidate_eval",
+)
+
+# Datasets (relatives + transport file pairs) kept warm per worker
+MAX_DATASETS = 8
+
+# Latencies kept per command for the percentiles
+LATENCY_WINDOW = 10_000
+PERCENTILES = (50, 90, 99)
+
+# Longest request line accepted
+MAX_REQUEST_BYTES = 1 << 20
+
+
+class PlanningService:
+    def __init__(self, socket_path, relatives="relatives.csv", transport="transport.csv",
+                 workers=1, preload=True):
+        """
+        socket_path: Unix socket to listen on (replaced if stale)
+        relatives, transport: default data files, resolved like DataLoader
+        workers: planning processes; 0 plans in a thread of this process
+        preload: load the default data and build its tables at start-up
+        """
+        self.socket_path = socket_path
+        self.relatives = relatives
+        self.transport = transport
+        self.workers = workers
+        self.preload = preload
+
+        self.pool = None
+        self.server = None
+        self.started = None
+        self._stopped = None
+
+        # Request fingerprint -> future shared by identical requests
+        self.in_flight = {}
+        self._handlers = set()
+        self._idle = {}   # handler task -> writer, while waiting for a request
+
+        self.requests = 0
+        self.computed = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.latencies = {}   # command -> deque of seconds
+
+
+    # LIFECYCLE
+
+    def run(self):
+        """Serve until a shutdown request, SIGINT or SIGTERM."""
+        asyncio.run(self.serve())
+
+    async def serve(self, ready=None):
+        """
+        Serve on the current event loop; `ready` (asyncio.Event or
+        threading.Event) is set once the socket accepts connections.
+        """
+        loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self.started = time.monotonic()
+
+        if self.workers > 0:
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_service_worker,
+                initargs=(self._default_dataset() if self.preload else None,),
+            )
+        else:
+            self.pool = ThreadPoolExecutor(max_workers=1)
+            if self.preload:
+                await loop.run_in_executor(self.pool, _warm_dataset, self._default_dataset())
+
+        _remove_stale_socket(self.socket_path)
+        self.server = await asyncio.start_unix_server(
+            self.handle, path=self.socket_path, limit=MAX_REQUEST_BYTES,
+        )
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass  # not the main thread, or no signal support
+
+        if ready is not None:
+            ready.set()
+        try:
+            await self._stopped.wait()
+        finally:
+            self.server.close()
+            # Idle connections are closed; requests being planned finish first
+            for writer in self._idle.values():
+                writer.close()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await self.server.wait_closed()
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.remove_signal_handler(sig)
+                except (NotImplementedError, RuntimeError, ValueError):
+                    pass
+            _remove_stale_socket(self.socket_path)
+
+    def stop(self):
+        if self._stopped is not None:
+            self._stopped.set()
+
+
+    # CONNECTIONS
+
+    async def handle(self, reader, writer):
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            while not self._stopped.is_set():
+                self._idle[task] = writer
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    await self._reply(writer, None, error="request line too long")
+                    break
+                finally:
+                    self._idle.pop(task, None)
+                if not line:
+                    break
+                await self._answer(writer, line)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            self._handlers.discard(task)
+
+    async def _answer(self, writer, line):
+        start = time.perf_counter()
+        self.requests += 1
+        command = None
+        message = {}
+        try:
+            message = json.loads(line)
+            if not isinstance(message, dict):
+                raise ValueError("request must be a JSON object")
+            command = message.get("command")
+            result = await self.dispatch(command, message)
+        except Exception as e:
+            self.errors += 1
+            await self._reply(writer, message, error=f"{type(e).__name__}: {e}")
+        else:
+            await self._reply(writer, message, result=result)
+        self._record_latency(command or "invalid", time.perf_counter() - start)
+
+    async def _reply(self, writer, message, result=None, error=None):
+        reply = {"ok": error is None}
+        if isinstance(message, dict) and "id" in message:
+            reply["id"] = message["id"]
+        if error is None:
+            reply["result"] = result
+        else:
+            reply["error"] = error
+        writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+        await writer.drain()
+
+
+    # COMMANDS
+
+    async def dispatch(self, command, message):
+        if command == "plan":
+            return await self.plan(message)
+        if command == "stats":
+            return self.stats()
+        if command == "ping":
+            return "pong"
+        if command == "shutdown":
+            asyncio.get_running_loop().call_soon(self.stop)
+            return "shutting down"
+        raise ValueError(f"unknown command {command!r}")
+
+    async def plan(self, message):
+        options = {name: message[name] for name in PLAN_OPTIONS if name in message}
+        unknown = set(message) - set(PLAN_OPTIONS) - {"command", "id", "relatives",
+                                                      "transport", "map"}
+        if unknown:
+            raise ValueError(f"unknown plan options: {', '.join(sorted(unknown))}")
+
+        dataset = _dataset(message.get("relatives", self.relatives),
+                           message.get("transport", self.transport))
+        map_path = message.get("map")
+        if map_path is not None:
+            map_path = os.path.abspath(map_path)
+
+        # Identical requests (same files and versions, same options) share
+        # one computation while it runs
+        key = json.dumps([dataset, options, map_path], sort_keys=True)
+        future = self.in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.pool, _plan_request, dataset, options, map_path)
+        self.in_flight[key] = future
+        self.computed += 1
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self.in_flight.get(key) is future:
+                del self.in_flight[key]
+
+    def stats(self):
+        return {
+            "uptime_s": time.monotonic() - self.started,
+            "workers": self.workers,
+            "requests": self.requests,
+            "computed": self.computed,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "in_flight": len(self.in_flight),
+            "latency_ms": {
+                command: latency_summary(samples)
+                for command, samples in self.latencies.items()
+            },
+        }
+
+    def _record_latency(self, command, seconds):
+        samples = self.latencies.get(command)
+        if samples is None:
+            samples = self.latencies[command] = deque(maxlen=LATENCY_WINDOW)
+        samples.append(seconds)
+
+    def _default_dataset(self):
+        return _dataset(self.relatives, self.transport)
+
+
+def latency_summary(samples, percentiles=PERCENTILES):
+    """count, mean, pXX (nearest rank) and max of latencies, in ms."""
+    ordered = sorted(samples)
+    summary = {"count": len(ordered)}
+    if not ordered:
+        return summary
+    summary["mean"] = sum(ordered) / len(ordered) * 1e3
+    for p in percentiles:
+        rank = max(1, -(-p * len(ordered) // 100))  # ceil(p/100 * n)
+        summary[f"p{p}"] = ordered[rank - 1] * 1e3
+    summary["max"] = ordered[-1] * 1e3
+    return summary
+
+
+# DATASETS (files and their versions)
+
+def _dataset(relatives, transport):
+    """
+    Resolved paths plus size/mtime, so changed files are reloaded; the
+    transport file's mode policy (if any) comes last.
+    """
+    from minseo_planner.data_loader import DataLoader
+    from minseo_planner.mode_policy import policy_path
+
+    data_dir = DataLoader().data_dir
+    dataset = []
+    paths = [os.path.join(data_dir, name) for name in (relatives, transport)]
+    paths.append(policy_path(paths[1]))
+    for path in paths:
+        if path is None:
+            dataset.extend([None, 0, 0])
+            continue
+        stat = os.stat(path)
+        dataset.extend([path, stat.st_size, stat.st_mtime_ns])
+    return tuple(dataset)
+
+
+def _remove_stale_socket(path):
+    """Remove a socket file nobody listens on; refuse to steal a live one."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.remove(path)
+    else:
+        raise OSError(f"another service is listening on {path}")
+    finally:
+        probe.close()
+
+
+# WORKER SIDE (one set of warm datasets per planning process)
+
+_warm = OrderedDict()   # dataset -> (relatives, modes, Scheduler)
+
+
+def _init_service_worker(dataset):
+    if dataset is not None:
+        _warm_dataset(dataset)
+
+
+def _warm_dataset(dataset):
+    from minseo_planner.data_loader import DataLoader
+    from minseo_planner.scheduler import Scheduler
+
+    state = _warm.get(dataset)
+    if state is not None:
+        _warm.move_to_end(dataset)
+        return state
+
+    loader = DataLoader()
+    relatives = loader.load_relative_table(dataset[0]).relatives()
+    modes = loader.load_transport(dataset[3])
+    if not relatives or not modes:
+        raise ValueError("no relatives or transport modes to plan with")
+    policy = dataset[6] and loader.load_mode_policy(dataset[6])
+
+    scheduler = Scheduler(mode_policy=policy)
+    scheduler.build_travel_table(relatives, modes)
+    state = _warm[dataset] = (relatives, modes, scheduler)
+    if len(_warm) > MAX_DATASETS:
+        _warm.popitem(last=False)
+    return state
+
+
+def _plan_request(dataset, options, map_path):
+    relatives, modes, scheduler = _warm_dataset(dataset)
+
+    # The warm scheduler keeps its tables; every request starts from the
+    # Scheduler defaults plus its own options
+    defaults = _scheduler_defaults()
+    for name in PLAN_OPTIONS:
+        setattr(scheduler, name, options.get(name, defaults[name]))
+
+    start = time.perf_counter()
+    schedule, totals = scheduler.plan(relatives, modes)
+    seconds = time.perf_counter() - start
+
+    stats = dict(scheduler.search_stats or {})
+    stats.pop("scores", None)
+    result = {
+        "schedule": schedule,
+        "totals": totals,
+        "seed": scheduler.last_seed,
+        "search_stats": stats,
+        "plan_seconds": seconds,
+        "pid": os.getpid(),
+    }
+    if map_path is not None:
+        from minseo_planner.rendering import RouteRenderer
+        result["maps"] = RouteRenderer().render(schedule, map_path)
+    return result
+
+
+@lru_cache(maxsize=None)
+def _scheduler_defaults():
+    from minseo_planner.scheduler import Scheduler
+    parameters = inspect.signature(Scheduler.__init__).parameters
+    return {name: parameters[name].default for name in PLAN_OPTIONS}
+
+
+# CLIENT
+
+def request(socket_path, message, timeout=None):
+    """Send one request and return its reply (a dict)."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError(f"no reply from {socket_path}")
+    return json.loads(line)
@@ -0,0 +1,71 @@
+
+"""
+Spatial index over relatives' coordinates for candidate generation.
+
+A uniform grid on an equirectangular projection (km). Cells are looked
+up for the bounding square of a query circle; the returned ids are a
+superset of the points within the radius, so callers filter them with
+exact haversine distances (the scheduler uses its distance matrix).
+"""
+
+from math import cos, radians, pi, floor, isfinite
+
+import numpy as np
+
+from minseo_planner.utils import EARTH_RADIUS_KM
+
+KM_PER_DEGREE = EARTH_RADIUS_KM * pi / 180
+
+# Slack on query radii so projection error never drops a true neighbour
+RADIUS_MARGIN = 1.02
+
+
+class GridIndex:
+    def __init__(self, lats, lons, cell_km=1.0):
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        self.cell_km = cell_km
+        self.size = lats.shape[0]
+
+        # Scale longitude by the smallest cos(lat) in the data, so that
+        # projected east-west distances never exceed the true ones
+        max_abs_lat = float(np.abs(lats).max()) if self.size else 0.0
+        self.kx = KM_PER_DEGREE * cos(radians(max_abs_lat))
+        self.ky = KM_PER_DEGREE
+
+        cx = np.floor(lons * self.kx / cell_km).astype(np.int64)
+        cy = np.floor(lats * self.ky / cell_km).astype(np.int64)
+        self.bounds = (
+            (int(cx.min()), int(cx.max()), int(cy.min()), int(cy.max()))
+            if self.size else (0, -1, 0, -1)
+        )
+
+        self.cells = {}
+        for i, key in enumerate(zip(cx.tolist(), cy.tolist())):
+            self.cells.setdefault(key, []).append(i)
+
+    def within(self, lat, lon, radius_km):
+        """Ids of all points that may lie within radius_km of (lat, lon)."""
+        if not isfinite(radius_km):
+            return list(range(self.size))  # unbounded reach: everyone
+        r = radius_km * RADIUS_MARGIN
+        x = lon * self.kx
+        y = lat * self.ky
+        min_cx, max_cx, min_cy, max_cy = self.bounds
+
+        x0 = max(floor((x - r) / self.cell_km), min_cx)
+        x1 = min(floor((x + r) / self.cell_km), max_cx)
+        y0 = max(floor((y - r) / self.cell_km), min_cy)
+        y1 = min(floor((y + r) / self.cell_km), max_cy)
+
+        if (x0, x1, y0, y1) == self.bounds:
+            return list(range(self.size))
+
+        out = []
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                ids = cells.get((cx, cy))
+                if ids:
+                    out.extend(ids)
+        return out
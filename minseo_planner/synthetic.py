@@ -0,0 +1,89 @@
+"""
+Synthetic instances for benchmarks and scale tests.
+
+Relatives are scattered over a box around Seoul with controllable
+count, preferred-day density, window placement/width and visit
+durations. Everything is driven by one seed, so an instance is fully
+described by its arguments. Files are written in the same CSV layout
+as the bundled data.
+"""
+
+import csv
+import random
+
+from minseo_planner.models import Relative, TransportMode, DAY_NAMES
+
+SEOUL_DISTRICTS = [
+    "Gangnam-gu", "Seocho-gu", "Songpa-gu", "Jongno-gu", "Jung-gu", "Yongsan-gu",
+    "Mapo-gu", "Seodaemun-gu", "Gwanak-gu", "Dongjak-gu", "Yeongdeungpo-gu",
+    "Seongdong-gu", "Gwangjin-gu", "Nowon-gu", "Eunpyeong-gu", "Gangseo-gu",
+]
+
+# South-west corner and size (degrees) of the default box (~16 km square)
+SEOUL_ORIGIN = (37.45, 126.95)
+SEOUL_SPAN = 0.15
+
+# Same modes as the bundled transport.csv
+DEFAULT_MODES = [
+    ("Bus", 40, 2, 5),
+    ("Train", 80, 5, 2),
+    ("Bicycle", 15, 0, 1),
+    ("Walking", 5, 0, 0),
+]
+
+
+def generate_relatives(n, seed=0, days_per_relative=2, evening_share=0.7,
+                       window_hours=2, durations=(45, 60, 75, 90), bonus_range=(5, 10),
+                       origin=SEOUL_ORIGIN, span=SEOUL_SPAN):
+    """
+    n relatives named Relative_1 .. Relative_n.
+
+    days_per_relative: preferred days per relative (1-7)
+    evening_share: share of windows starting 18-20h (weekday visiting
+                   hours); the rest start between 10h and 19h
+    window_hours: window width, cut off at 21:00
+    """
+    rng = random.Random(seed)
+    relatives = []
+    for i in range(n):
+        days = rng.sample(list(DAY_NAMES), days_per_relative)
+        if rng.random() < evening_share:
+            start = rng.choice([18, 19, 20])
+        else:
+            start = rng.choice(range(10, 20))
+        relatives.append(Relative(
+            name=f"Relative_{i + 1}",
+            latitude=origin[0] + rng.random() * span,
+            longitude=origin[1] + rng.random() * span,
+            preferred_days=[d for d in DAY_NAMES if d in days],
+            preferred_window=(f"{start:02d}:00", f"{min(start + window_hours, 21):02d}:00"),
+            happiness_bonus=rng.randint(*bonus_range),
+            district=SEOUL_DISTRICTS[i % len(SEOUL_DISTRICTS)],
+            duration=rng.choice(durations),
+        ))
+    return relatives
+
+
+def generate_transport(modes=DEFAULT_MODES):
+    """TransportMode objects from (name, speed, cost_per_km, transfer_time) rows."""
+    return [TransportMode(*row) for row in modes]
+
+
+def write_relatives_csv(path, relatives):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Relative", "District", "Lat", "Lon", "PreferredDays",
+                         "PreferredTime", "Bonus", "Duration"])
+        for r in relatives:
+            writer.writerow([
+                r.name, r.district, r.latitude, r.longitude, ", ".join(r.preferred_days),
+                "-".join(r.preferred_window), r.happiness_bonus, r.duration,
+            ])
+
+
+def write_transport_csv(path, modes):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Mode", "Speed", "CostPerKm", "TransferTime"])
+        for m in modes:
+            writer.writerow([m.name, m.speed, m.cost_per_km, m.transfer_time])
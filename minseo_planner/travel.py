@@ -0,0 +1,155 @@
+
+"""
+Precomputed travel options for Minseo's visit planner.
+
+For every ordered pair of relatives the table stores the transport
+modes allowed by the distance rules together with their travel
+minutes and cost. The greedy loop then only does array lookups
+instead of recomputing haversine and mode arithmetic per candidate.
+
+Layout:
+- band[i, j]        distance band of the pair (selects the allowed modes)
+- minutes[i, j, s]  travel minutes for the s-th allowed mode of the band
+- cost[i, j, s]     travel cost for the s-th allowed mode of the band
+
+Slots beyond the number of modes in a band hold NaN.
+
+With an ODMatrix (see od_matrix.py) its minutes and cost replace the
+haversine estimate for every pair and mode it covers; the distance
+bands still decide which modes are allowed.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+# Above this many relatives, rows are computed on demand (and kept in a
+# bounded cache) instead of materialising the full n x n x slots arrays.
+DENSE_LIMIT = 2000
+ROW_CACHE_SIZE = 256
+BLOCK_ROWS = 256
+
+
+class TravelTable:
+    def __init__(self, distances, modes, band_of, band_modes, dense_limit=DENSE_LIMIT,
+                 od=None, names=None):
+        """
+        distances: n x n distance matrix (km)
+        modes: list of TransportMode
+        band_of: vectorized function mapping distances to band numbers
+        band_modes: per band, tuple of indices into modes (in mode order)
+        od: optional ODMatrix overriding minutes and cost
+        names: relative names in distance-matrix order (needed with od)
+        """
+        self.distances = distances
+        self.modes = list(modes)
+        self.band_of = band_of
+        self.band_modes = [tuple(ids) for ids in band_modes]
+        self.width = max(len(ids) for ids in self.band_modes)
+
+        self._speed = np.array([m.speed for m in self.modes], dtype=np.float64)
+        self._transfer = np.array([m.transfer_time for m in self.modes], dtype=np.float64)
+        self._cost_per_km = np.array([m.cost_per_km for m in self.modes], dtype=np.float64)
+
+        # (bands, width) mode index per slot, -1 where the band has fewer modes
+        self.slot_mode = np.full((len(self.band_modes), self.width), -1, dtype=np.int64)
+        for b, ids in enumerate(self.band_modes):
+            self.slot_mode[b, :len(ids)] = ids
+
+        # OD row of each relative and OD column of each mode (-1: not covered)
+        self.od = od
+        if od is not None:
+            self._od_ids = od.ids_for(names)
+            self._od_columns = od.columns_for(self.modes)
+
+        n = distances.shape[0]
+        self.dense = n <= dense_limit
+        self._rows = OrderedDict()
+
+        if self.dense:
+            self.band = np.empty((n, n), dtype=np.uint8)
+            self.minutes = np.empty((n, n, self.width), dtype=np.float64)
+            self.cost = np.empty((n, n, self.width), dtype=np.float64)
+            for start in range(0, n, BLOCK_ROWS):
+                stop = min(start + BLOCK_ROWS, n)
+                band, minutes, cost = self._compute(distances[start:stop], start)
+                self.band[start:stop] = band
+                self.minutes[start:stop] = minutes
+                self.cost[start:stop] = cost
+
+    
+    # VECTORIZED TRAVEL ARITHMETIC
+
+    def _compute(self, dist, first_row):
+        """
+        Same arithmetic as Scheduler.travel_stats, over whole arrays;
+        dist holds the distance rows from first_row on.
+        """
+        dist = np.asarray(dist, dtype=np.float64)
+        band = self.band_of(dist).astype(np.uint8)
+        slot_mode = self.slot_mode[band]
+        valid = slot_mode >= 0
+        mode = np.where(valid, slot_mode, 0)
+
+        d = dist[..., None]
+        speed = self._speed[mode]
+        hours = np.divide(d, speed, out=np.zeros(mode.shape), where=speed > 0)
+        minutes = hours * 60 + self._transfer[mode]
+        cost = d * self._cost_per_km[mode]
+
+        if self.od is not None:
+            self._apply_od(first_row, mode, valid, minutes, cost)
+
+        minutes[~valid] = np.nan
+        cost[~valid] = np.nan
+        return band, minutes, cost
+
+    def _apply_od(self, first_row, mode, valid, minutes, cost):
+        """Overwrite minutes/cost (in place) where the OD matrix has them."""
+        src = self._od_ids[first_row:first_row + mode.shape[0]]
+        rows = np.flatnonzero(src >= 0)
+        if len(rows) == 0:
+            return
+        dst = self._od_ids
+        column = self._od_columns[mode[rows]]
+
+        block = self.od.rows(src[rows], np.maximum(dst, 0))
+        column_ids = np.maximum(column, 0)
+        od_minutes = np.take_along_axis(block[..., 0], column_ids, axis=2)
+        od_cost = np.take_along_axis(block[..., 1], column_ids, axis=2)
+
+        # Missing pairs (NaN) and uncovered relatives/modes keep haversine
+        use = (valid[rows] & (column >= 0) & (dst >= 0)[None, :, None]
+               & ~np.isnan(od_minutes) & ~np.isnan(od_cost))
+        minutes[rows] = np.where(use, od_minutes, minutes[rows])
+        cost[rows] = np.where(use, od_cost, cost[rows])
+
+    
+    # LOOKUPS
+
+    def row(self, i):
+        """
+        Travel options from relative i to every relative:
+        (band[n], minutes[n, width], cost[n, width]).
+        """
+        if self.dense:
+            return self.band[i], self.minutes[i], self.cost[i]
+
+        row = self._rows.get(i)
+        if row is None:
+            band, minutes, cost = self._compute(self.distances[i:i + 1], i)
+            row = band[0], minutes[0], cost[0]
+            self._rows[i] = row
+            if len(self._rows) > ROW_CACHE_SIZE:
+                self._rows.popitem(last=False)
+        else:
+            self._rows.move_to_end(i)
+        return row
+
+    def options(self, i, j):
+        """List of (mode, minutes, cost) allowed from relative i to j."""
+        band, minutes, cost = self.row(i)
+        return [
+            (self.modes[k], float(minutes[j, s]), float(cost[j, s]))
+            for s, k in enumerate(self.band_modes[band[j]])
+        ]
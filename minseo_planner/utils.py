@@ -4,13 +4,19 @@ Utility functions for Minseo Festival–Week Visit Planner.
 
 Includes:
 - Haversine distance calculation (km)
+- Vectorized (NumPy) haversine and dense distance matrices
 - Time window checking
+- HH:MM <-> minutes-since-midnight conversion
 - General helper utilities
 """
 
 from math import radians, sin, cos, sqrt, atan2
 from datetime import time
 
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
 
 
 # HAVERSINE DISTANCE (KM)
@@ -20,7 +26,7 @@ def haversine(lat1, lon1, lat2, lon2):
     Compute the great-circle distance between two points on Earth (km).
     Uses the Haversine formula.
     """
-    R = 6371.0  # Earth radius in km
+    R = EARTH_RADIUS_KM
 
     lat1_r = radians(lat1)
     lon1_r = radians(lon1)
@@ -40,6 +46,81 @@ def haversine(lat1, lon1, lat2, lon2):
 
 
 
+# VECTORIZED HAVERSINE (KM)
+
+def haversine_many(lat1, lon1, lat2, lon2):
+    """
+    Broadcast version of haversine() over NumPy arrays (degrees in, km out).
+
+    Inputs follow NumPy broadcasting rules, so passing column and row
+    vectors (lat[:, None], lat[None, :]) yields a full pairwise matrix.
+    """
+    lat1 = np.radians(np.asarray(lat1, dtype=np.float64))
+    lon1 = np.radians(np.asarray(lon1, dtype=np.float64))
+    lat2 = np.radians(np.asarray(lat2, dtype=np.float64))
+    lon2 = np.radians(np.asarray(lon2, dtype=np.float64))
+    return _haversine_radians(lat1, lon1, np.cos(lat1), lat2, lon2, np.cos(lat2))
+
+
+def _haversine_radians(lat1, lon1, cos_lat1, lat2, lon2, cos_lat2):
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + cos_lat1 * cos_lat2 * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return EARTH_RADIUS_KM * c
+
+
+def distance_matrix(lats, lons, dtype=np.float64, block_rows=1024):
+    """
+    Dense n x n great-circle distance matrix (km) for the given points.
+
+    Rows are filled in blocks so the temporaries stay bounded at
+    block_rows x n, which keeps 10k+ point matrices within memory.
+    Only the upper triangle is computed; the lower one is mirrored.
+    Use dtype=np.float32 to halve the footprint of large matrices.
+    """
+    lat = np.radians(np.asarray(lats, dtype=np.float64))
+    lon = np.radians(np.asarray(lons, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    n = lat.shape[0]
+
+    out = np.empty((n, n), dtype=dtype)
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        block = _haversine_radians(
+            lat[start:stop, None], lon[start:stop, None], cos_lat[start:stop, None],
+            lat[None, start:], lon[None, start:], cos_lat[None, start:],
+        )
+        out[start:stop, start:] = block
+        out[start:, start:stop] = block.T
+    return out
+
+
+
+# MINUTES SINCE MIDNIGHT
+
+def parse_hhmm(t):
+    """
+    Convert "HH:MM" to integer minutes since midnight.
+    Raises ValueError for malformed input.
+    """
+    hours, minutes = (int(part) for part in t.strip().split(":"))
+    if not (0 <= hours <= 23 and 0 <= minutes <= 59):
+        raise ValueError(f"Invalid time format: {t}")
+    return hours * 60 + minutes
+
+
+def format_hhmm(minutes):
+    """
+    Convert minutes since midnight to "HH:MM".
+    Fractional minutes are truncated, like strftime("%H:%M") on a datetime.
+    """
+    whole = int(minutes) % (24 * 60)
+    return f"{whole // 60:02d}:{whole % 60:02d}"
+
+
+
 # TIME WINDOW CHECK
 
 def within_time_window(arrival_time: time, start: time, end: time) -> bool:
@@ -8,7 +8,6 @@ setuptools.setup(
     packages=setuptools.find_packages(),
     include_package_data=True,
     install_requires=[
-        "networkx",
         "matplotlib",
         "pandas",
         "numpy",
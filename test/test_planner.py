@@ -2,11 +2,31 @@
 
 
 import os
+import subprocess
+import sys
+import io
+import json
+import numpy as np
 import pytest
 from minseo_planner.data_loader import DataLoader
-from minseo_planner.models import Relative, TransportMode
-from minseo_planner.scoring import ScoringEngine
+from minseo_planner.models import Relative, RelativeTable, TransportMode
+from minseo_planner.scoring import ScoringEngine, ScoreState
 from minseo_planner.decorators import measure_runtime
+from minseo_planner.instrumentation import Instrumentation, NULL_INSTRUMENT
+from minseo_planner.utils import (
+    haversine, haversine_many, distance_matrix, parse_hhmm, format_hhmm
+)
+from minseo_planner.scheduler import Scheduler
+from minseo_planner.batch import plan_many
+from minseo_planner import cli
+from minseo_planner.rendering import RouteRenderer
+from minseo_planner.travel import TravelTable
+from minseo_planner.synthetic import generate_relatives, generate_transport, write_relatives_csv
+from minseo_planner.od_matrix import ODMatrix, write_od_matrix
+from minseo_planner import service
+from minseo_planner.result_cache import ResultCache
+from minseo_planner.feasibility import FeasibilityTable
+from minseo_planner.mode_policy import ModePolicy
 
 BASE = os.path.dirname(os.path.abspath(__file__))
 
@@ -124,3 +144,961 @@ def test_fatigue_penalty():
 
     penalty = scoring.compute_fatigue_penalty(schedule)
     assert penalty == -2  # only Sat has 3 visits
+
+
+# ---------------------------------------------------------
+# TEST 6 — Vectorized Distance Matrix
+# ---------------------------------------------------------
+def test_haversine_many_matches_scalar():
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    lats = [r.latitude for r in relatives]
+    lons = [r.longitude for r in relatives]
+
+    D = distance_matrix(lats, lons, block_rows=3)
+    assert D.shape == (len(relatives), len(relatives))
+
+    for i, a in enumerate(relatives):
+        for j, b in enumerate(relatives):
+            expected = haversine(a.latitude, a.longitude, b.latitude, b.longitude)
+            assert D[i, j] == pytest.approx(expected, abs=1e-9)
+
+    row = haversine_many(lats[0], lons[0], lats, lons)
+    assert row == pytest.approx(D[0], abs=1e-9)
+
+
+# ---------------------------------------------------------
+# TEST 7 — Precomputed Travel Table
+# ---------------------------------------------------------
+def test_travel_table_matches_travel_stats():
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+
+    scheduler = Scheduler()
+    table = scheduler.build_travel_table(relatives, modes)
+
+    for i, a in enumerate(relatives):
+        for j, b in enumerate(relatives):
+            if i == j:
+                continue
+            dist = scheduler.distances[i, j]
+            expected = [
+                (m.name,) + scheduler.travel_stats(a, b, m)[1:]
+                for m in scheduler.select_modes_for_distance(dist, modes)
+            ]
+            got = [(m.name, minutes, cost) for m, minutes, cost in table.options(i, j)]
+
+            assert [g[0] for g in got] == [e[0] for e in expected]
+            for g, e in zip(got, expected):
+                assert g[1] == pytest.approx(e[1], abs=1e-9)
+                assert g[2] == pytest.approx(e[2], abs=1e-9)
+
+    # Table is reused when the same inputs are planned again
+    assert scheduler.build_travel_table(list(reversed(relatives)), modes) is table
+
+
+def test_travel_table_lazy_rows_match_dense():
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+
+    scheduler = Scheduler()
+    dense = scheduler.build_travel_table(relatives, modes)
+    lazy = TravelTable(dense.distances, modes, scheduler.distance_band,
+                       dense.band_modes, dense_limit=0)
+
+    for i in range(len(relatives)):
+        for a, b in zip(dense.row(i), lazy.row(i)):
+            np.testing.assert_array_equal(a, b)
+
+
+# ---------------------------------------------------------
+# TEST 8 — Minute-Based Time Model
+# ---------------------------------------------------------
+def test_minutes_roundtrip():
+    assert parse_hhmm("18:30") == 18 * 60 + 30
+    assert format_hhmm(1110) == "18:30"
+    assert format_hhmm(1110.9) == "18:30"  # truncated like strftime
+
+    with pytest.raises(ValueError):
+        parse_hhmm("25:00")
+
+
+def test_scoring_accepts_minutes():
+    scoring = ScoringEngine()
+    r = Relative(
+        name="Test",
+        latitude=0,
+        longitude=0,
+        preferred_days=["Mon"],
+        preferred_window=("18:00", "20:00"),
+        happiness_bonus=10,
+        duration=60
+    )
+
+    assert scoring.compute_visit_score({"arrival": 1200.5, "day": "Mon"}, r) == 10
+    assert scoring.compute_visit_score({"arrival": 1201, "day": "Mon"}, r) == 5
+
+
+def test_greedy_schedule_uses_minutes():
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+
+    scheduler = Scheduler()
+    schedule = scheduler.greedy_schedule(relatives, modes)
+
+    for day, visits in schedule.items():
+        day_start, day_end, max_visits = scheduler.day_limits(day)
+        assert len(visits) <= max_visits
+        for v in visits:
+            assert day_start <= v["arrival"] <= v["departure"] <= day_end
+
+
+# ---------------------------------------------------------
+# TEST 9 — Seeded / Parallel Restarts
+# ---------------------------------------------------------
+def test_seeded_restarts_independent_of_workers():
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+    names = [r.name for r in relatives]
+
+    serial = Scheduler(restarts=20, seed=7, workers=1)
+    schedule_a, totals_a = serial.generate_best_schedule(relatives, modes)
+
+    parallel = Scheduler(restarts=20, seed=7, workers=2)
+    schedule_b, totals_b = parallel.generate_best_schedule(relatives, modes)
+
+    assert schedule_a == schedule_b
+    assert totals_a == totals_b
+    assert [r.name for r in relatives] == names  # caller's list untouched
+    assert serial.last_seed == 7
+
+
+# ---------------------------------------------------------
+# TEST 10 — Incremental (Delta) Scoring
+# ---------------------------------------------------------
+def test_score_state_deltas_match_full_rescore():
+    import random
+
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+
+    scheduler = Scheduler(seed=3)
+    schedule = scheduler.run_restart(relatives, modes, 3, 0)
+    engine = ScoringEngine(alpha=0.05, beta=0.02)
+    state = ScoreState(engine, schedule, relatives)
+
+    assert state.totals == engine.compute_total_score(schedule, relatives)
+
+    rng = random.Random(0)
+    days = list(state.schedule)
+    for _ in range(200):
+        filled = [d for d in days if state.schedule[d]]
+        src = rng.choice(filled)
+        i = rng.randrange(len(state.schedule[src]))
+        dst = rng.choice(days)
+        kind = rng.choice(["move", "swap", "remove_insert"])
+
+        before = state.score
+        if kind == "move":
+            delta = state.delta_move(src, i, dst)
+            state.apply_move(src, i, dst)
+        elif kind == "swap" and state.schedule[dst]:
+            j = rng.randrange(len(state.schedule[dst]))
+            delta = state.delta_swap(src, i, dst, j)
+            state.apply_swap(src, i, dst, j)
+        else:
+            visit = state.schedule[src][i]
+            delta = state.delta_remove(src, i)
+            state.apply_remove(src, i)
+            assert state.score - before == delta
+            before = state.score
+            delta = state.delta_insert(dst, visit, 0)
+            state.apply_insert(dst, visit, 0)
+
+        assert state.score - before == delta
+        assert state.totals == engine.compute_total_score(state.schedule, relatives)
+
+
+# ---------------------------------------------------------
+# TEST 11 — Local Search Improvement
+# ---------------------------------------------------------
+def test_local_search_improves_and_stays_feasible():
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+
+    greedy = Scheduler(restarts=5, seed=11)
+    _, greedy_totals = greedy.generate_best_schedule(relatives, modes)
+
+    scheduler = Scheduler(restarts=5, seed=11, improve="best")
+    schedule, totals = scheduler.generate_best_schedule(relatives, modes)
+
+    assert totals["final_score"] >= greedy_totals["final_score"]
+    assert scheduler.improve_stats["gain"] == pytest.approx(
+        totals["final_score"] - greedy_totals["final_score"]
+    )
+    assert totals == ScoringEngine().compute_total_score(schedule, relatives)
+
+    rel_map = {r.name: r for r in relatives}
+    seen = set()
+    for day, visits in schedule.items():
+        day_start, day_end, max_visits = scheduler.day_limits(day)
+        assert len(visits) <= max_visits
+        for i, v in enumerate(visits):
+            r = rel_map[v["name"]]
+            assert day in r.preferred_days
+            assert day_start <= v["arrival"] <= v["departure"] <= day_end
+            if i > 0:
+                assert r.window_start <= v["arrival"] <= r.window_end
+            assert r.name not in seen
+            seen.add(r.name)
+
+
+def test_local_search_respects_iteration_budget():
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+
+    scheduler = Scheduler(restarts=1, seed=11, improve="best", improve_iterations=3)
+    scheduler.generate_best_schedule(relatives, modes)
+
+    assert scheduler.improve_stats["evaluations"] <= 3
+    assert scheduler.improve_stats["stopped_by"] in ("iterations", "local_optimum")
+
+
+# ---------------------------------------------------------
+# TEST 12 — Exact Solver
+# ---------------------------------------------------------
+def test_exact_solver_proves_optimum():
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+
+    exact = Scheduler(solver="exact", seed=1)
+    schedule, totals = exact.generate_best_schedule(relatives, modes)
+
+    assert exact.exact_stats["optimal"]
+    assert exact.exact_stats["gap"] == 0
+    assert exact.exact_stats["mode_choice"] == "preference"
+    assert totals == ScoringEngine().compute_total_score(schedule, relatives)
+
+    heuristic = Scheduler(restarts=50, seed=1, improve="each")
+    _, heuristic_totals = heuristic.generate_best_schedule(relatives, modes)
+    assert totals["final_score"] >= heuristic_totals["final_score"] - 1e-9
+
+
+def test_exact_solver_time_limit_reports_gap():
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+
+    exact = Scheduler(solver="exact", seed=1, exact_time_limit=0)
+    _, totals = exact.generate_best_schedule(relatives, modes)
+
+    stats = exact.exact_stats
+    assert not stats["optimal"]
+    assert stats["upper_bound"] >= stats["best_value"]
+    assert stats["gap"] == pytest.approx(stats["upper_bound"] - stats["best_value"])
+    assert totals["final_score"] > 0  # greedy incumbent, not an empty week
+
+
+# ---------------------------------------------------------
+# TEST 13 — Anytime Stopping and Search Stats
+# ---------------------------------------------------------
+def test_patience_stops_early_and_matches_parallel():
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+
+    serial = Scheduler(restarts=500, seed=4, patience=10)
+    schedule_a, totals_a = serial.generate_best_schedule(relatives, modes)
+    stats = serial.search_stats
+
+    assert stats["stopped_by"] == "patience"
+    assert stats["restarts_run"] < 500
+    assert stats["restarts_run"] == len(stats["scores"])
+    assert stats["improvements"][-1]["restart"] == stats["best_restart"]
+    assert stats["improvements"][-1]["score"] == totals_a["final_score"]
+    assert stats["distribution"]["max"] == totals_a["final_score"]
+
+    parallel = Scheduler(restarts=500, seed=4, patience=10, workers=2)
+    schedule_b, totals_b = parallel.generate_best_schedule(relatives, modes)
+
+    assert totals_a == totals_b
+    assert schedule_a == schedule_b
+    assert parallel.search_stats["scores"] == stats["scores"]
+
+
+def test_time_budget_stops_run():
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+
+    scheduler = Scheduler(restarts=10 ** 9, seed=4)
+    _, totals = scheduler.generate_best_schedule(relatives, modes, time_budget=0.05)
+
+    assert scheduler.search_stats["stopped_by"] == "time_budget"
+    assert scheduler.search_stats["elapsed"] < 5
+    assert totals["final_score"] == scheduler.search_stats["distribution"]["max"]
+
+    # A budget used up before the first restart still yields a schedule
+    for workers in (1, 2):
+        spent = Scheduler(restarts=100, seed=4, workers=workers)
+        schedule, totals = spent.plan(relatives, modes, time_budget=0)
+        assert schedule is not None and totals["final_score"] is not None
+        assert spent.search_stats["restarts_run"] >= 1
+        assert spent.search_stats["stopped_by"] == "time_budget"
+
+    # A huge restart count over a pool does not lay out every chunk first
+    import tracemalloc
+    tracemalloc.start()
+    pooled = Scheduler(restarts=10 ** 9, seed=4, workers=2, time_budget=0.2)
+    pooled.plan(relatives, modes)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert pooled.search_stats["stopped_by"] == "time_budget"
+    assert peak < 50 * 2 ** 20
+
+
+# ---------------------------------------------------------
+# TEST 14 — Grid Candidate Generation
+# ---------------------------------------------------------
+def test_grid_candidates_match_scan():
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+
+    scan = Scheduler(restarts=20, seed=3)
+    grid = Scheduler(restarts=20, seed=3, candidate_search="grid", grid_cell_km=0.5)
+
+    assert scan.generate_best_schedule(relatives, modes) == grid.generate_best_schedule(relatives, modes)
+
+    nearest = Scheduler(restarts=20, seed=3, candidate_search="grid", candidate_k=1)
+    schedule, _ = nearest.generate_best_schedule(relatives, modes)
+    names = [v["name"] for visits in schedule.values() for v in visits]
+    assert len(names) == len(set(names))
+
+    # A zero-speed mode makes the reach unbounded; the grid then holds everyone
+    teleport = modes + [TransportMode("Teleport", 0, 1, 30)]
+    assert Scheduler(restarts=10, seed=3, candidate_search="grid").plan(relatives, teleport) == \
+        Scheduler(restarts=10, seed=3).plan(relatives, teleport)
+
+
+# ---------------------------------------------------------
+# TEST 15 — Day-Plan Cache
+# ---------------------------------------------------------
+def test_day_plan_cache_matches_uncached():
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+
+    cached = Scheduler(restarts=100, seed=6)
+    uncached = Scheduler(restarts=100, seed=6, day_cache_size=0)
+
+    for index in range(100):
+        assert (cached.run_restart(relatives, modes, 6, index)
+                == uncached.run_restart(relatives, modes, 6, index))
+
+    schedule, totals = cached.generate_best_schedule(relatives, modes)
+    assert (schedule, totals) == uncached.generate_best_schedule(relatives, modes)
+
+    stats = cached.search_stats["day_cache"]
+    assert stats["hits"] > 0
+    assert stats["hit_rate"] == stats["hits"] / (stats["hits"] + stats["misses"])
+    assert uncached.search_stats["day_cache"]["hits"] == 0
+
+
+# ---------------------------------------------------------
+# TEST 16 — RelativeTable and Slotted Relative
+# ---------------------------------------------------------
+def test_relative_table_round_trip():
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    table = RelativeTable.from_relatives(relatives)
+
+    assert len(table) == len(relatives)
+    np.testing.assert_array_equal(table.prefers("Sat"), ["Sat" in r.preferred_days for r in relatives])
+
+    for r, view in zip(relatives, table.relatives()):
+        for field in Relative.__slots__:
+            assert getattr(view, field) == getattr(r, field)
+
+    assert not hasattr(relatives[0], "__dict__")
+    with pytest.raises(AttributeError):
+        relatives[0].chosen_mode = "Bus"
+
+
+# ---------------------------------------------------------
+# TEST 17 — Columnar Loader, Row Errors and Cache
+# ---------------------------------------------------------
+def test_loader_collects_row_errors_and_caches(tmp_path):
+    source = os.path.join(DataLoader().data_dir, "relatives.csv")
+    with open(source, encoding="utf-8") as f:
+        text = f.read()
+    text += (
+        'Bad_Lat,X,north,127.0,"Mon",18:00-20:00,5,60\n'
+        'Bad_Day,X,37.5,127.0,"Funday",18:00-20:00,5,60\n'
+        'Relative_1,X,37.5,127.0,"Mon",18:00-20:00,5,60\n'
+    )
+    path = tmp_path / "relatives.csv"
+    path.write_text(text, encoding="utf-8")
+
+    loader = DataLoader(cache_dir=str(tmp_path / "cache"))
+    table = loader.load_relative_table(str(path))
+
+    assert len(table) == 10
+    assert loader.error_count == 3
+    assert [(e["line"], e["column"]) for e in loader.errors] == [
+        (12, "Lat"), (13, "PreferredDays"), (14, "Relative")
+    ]
+    assert not loader.cache_hit
+
+    warm = loader.load_relative_table(str(path))
+    assert loader.cache_hit and loader.error_count == 3
+    assert warm.names == table.names
+    np.testing.assert_array_equal(warm.latitude, table.latitude)
+    np.testing.assert_array_equal(warm.day_mask, table.day_mask)
+
+    path.write_text(text + 'Extra,X,37.5,127.0,"Mon",18:00-20:00,5,60\n', encoding="utf-8")
+    assert len(loader.load_relative_table(str(path))) == 11
+    assert not loader.cache_hit
+
+    # A damaged cache is parsed again from the CSV and rewritten
+    cache_file, = (tmp_path / "cache").glob("*.npz")
+    cache_file.write_bytes(cache_file.read_bytes()[:200])
+    assert len(loader.load_relative_table(str(path))) == 11
+    assert not loader.cache_hit
+    assert len(loader.load_relative_table(str(path))) == 11
+    assert loader.cache_hit
+    assert [p.name for p in (tmp_path / "cache").iterdir()] == [cache_file.name]
+
+
+# ---------------------------------------------------------
+# TEST 18 — Batch Planning
+# ---------------------------------------------------------
+def test_plan_many_streams_and_isolates_failures():
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+
+    scenarios = [
+        "relatives.csv",
+        {"id": "missing", "relatives": "no_such_file.csv"},
+        {"id": "half", "relatives": relatives[:5], "options": {"seed": 2}},
+    ]
+    results = list(plan_many(scenarios, workers=2, restarts=20, seed=1))
+
+    assert sorted(r["index"] for r in results) == [0, 1, 2]
+    by_id = {r["id"]: r for r in results}
+    assert not by_id["missing"]["ok"]
+    assert "no_such_file.csv" in by_id["missing"]["error"]
+
+    expected = Scheduler(restarts=20, seed=1).plan(relatives, modes)
+    assert (by_id["relatives.csv"]["schedule"], by_id["relatives.csv"]["totals"]) == expected
+    assert by_id["half"]["ok"] and by_id["half"]["relatives"] == 5
+    assert all(r["seconds"] >= 0 for r in results)
+
+
+# ---------------------------------------------------------
+# TEST 19 — Re-scoring Cached Restarts
+# ---------------------------------------------------------
+def test_rescore_matches_fresh_run_and_sweep():
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+
+    scheduler = Scheduler(restarts=200, seed=1)
+    scheduler.plan(relatives, modes)
+
+    for alpha, beta in [(0.2, 0.0), (0.0, 0.5), (0.1, 0.3)]:
+        rescored = scheduler.rescore(relatives, modes, alpha, beta)
+        fresh = Scheduler(restarts=200, seed=1, alpha=alpha, beta=beta).plan(relatives, modes)
+        assert rescored == fresh
+
+    alphas = np.linspace(0, 0.5, 40)
+    betas = np.linspace(0, 0.5, 30)
+    sweep = scheduler.weight_sweep(alphas, betas)
+    assert sweep["winners"].shape == (40, 30)
+
+    terms = scheduler.restart_terms
+    winner = sweep["winners"][7, 11]
+    bonus, minutes, cost, fatigue = terms[winner]
+    assert sweep["scores"][7, 11] == bonus - alphas[7] * minutes - betas[11] * cost + fatigue
+
+    front = {f["restart"] for f in sweep["front"]}
+    assert set(np.unique(sweep["winners"]).tolist()) <= front
+    assert sum(f["wins"] for f in sweep["front"]) == 40 * 30
+
+
+# ---------------------------------------------------------
+# TEST 20 — Command-Line Subcommands and Lazy Imports
+# ---------------------------------------------------------
+def test_package_import_is_lazy():
+    probe = subprocess.run(
+        [sys.executable, "-c",
+         "import sys, minseo_planner; "
+         "print(sorted(m for m in ('numpy', 'pandas', 'matplotlib') if m in sys.modules))"],
+        check=True, capture_output=True, text=True,
+    )
+    assert probe.stdout.strip() == "[]"
+
+
+def test_cli_plan_score_export(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    out = tmp_path / "schedule.json"
+    assert cli.run(["plan", "--seed", "1", "--restarts", "20", "--no-render",
+                    "--out", str(out)]) == 0
+
+    saved = json.loads(out.read_text(encoding="utf-8"))
+    relatives = DataLoader().load_relatives("relatives.csv")
+    modes = DataLoader().load_transport("transport.csv")
+    expected = Scheduler(restarts=20, seed=1).plan(relatives, modes)[1]
+    assert saved["totals"]["final_score"] == pytest.approx(expected["final_score"])
+
+    assert cli.run(["score", "--schedule", str(out)]) == 0
+    csv_path = tmp_path / "schedule.csv"
+    assert cli.run(["export", "--schedule", str(out), "--out", str(csv_path),
+                    "--format", "csv"]) == 0
+    rows = csv_path.read_text(encoding="utf-8").splitlines()
+    assert len(rows) == 1 + sum(len(v) for v in saved["schedule"].values())
+
+    assert cli.run(["plan", "--relatives", str(tmp_path / "missing.csv"),
+                    "--out", str(out), "--no-render"]) == 1
+
+    # No restart ran: an error, and the earlier output is left alone
+    assert cli.run(["plan", "--restarts", "0", "--out", str(out), "--no-render"]) == 1
+    assert json.loads(out.read_text(encoding="utf-8")) == saved
+    assert cli.run(["plan", "--time-budget", "0", "--out", str(tmp_path / "budget.json"),
+                    "--no-render"]) == 0
+
+
+# ---------------------------------------------------------
+# TEST 21 — Route Map Rendering
+# ---------------------------------------------------------
+def test_renderer_skips_unchanged_maps(tmp_path):
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+    schedule, _ = Scheduler(restarts=10, seed=1).plan(relatives, modes)
+    days = [d for d, visits in schedule.items() if visits]
+
+    save_path = str(tmp_path / "route_map.svg")
+    renderer = RouteRenderer(dpi=50)
+    written = renderer.render(schedule, save_path)
+    assert len(written) == 1 + len(days)
+    assert all(os.path.exists(p) and p.endswith(".svg") for p in written)
+
+    assert renderer.render(schedule, save_path) == []
+    assert len(renderer.skipped) == 1 + len(days)
+
+    # Changing one day redraws that day and the combined map only
+    changed = {d: list(v) for d, v in schedule.items()}
+    changed[days[0]] = changed[days[0]][:1]
+    written = renderer.render(changed, save_path)
+    assert sorted(os.path.basename(p) for p in written) == sorted(
+        ["route_map.svg", f"route_map_{days[0]}.svg"]
+    )
+
+
+# ---------------------------------------------------------
+# TEST 22 — Instrumentation
+# ---------------------------------------------------------
+def test_instrumentation_phases_and_counters():
+    sink = io.StringIO()
+    instrument = Instrumentation(sink=sink)
+    loader = DataLoader(instrument=instrument)
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+
+    scheduler = Scheduler(restarts=15, seed=2, day_cache_size=0, instrument=instrument)
+    scheduler.generate_best_schedule(relatives, modes)
+    instrument.flush()
+
+    lines = [json.loads(line) for line in sink.getvalue().splitlines()]
+    restarts = [e for e in lines if e["event"] == "phase" and e["phase"] == "restart"]
+    assert [e["restart"] for e in restarts] == list(range(15))
+
+    summary = lines[-1]
+    assert summary["event"] == "summary"
+    for phase in ("load", "travel_table", "restart", "score", "plan", "generate_best_schedule"):
+        assert summary["phases"][phase]["calls"] >= 1
+    counters = summary["counters"]
+    rejected = (counters["reject_allowed_hours"] + counters["reject_preferred_window"]
+                + counters["reject_departure_overflow"])
+    assert counters["candidates_examined"] > 0 and rejected > 0
+
+    # Restart workers send their phase totals and counters back
+    serial = Instrumentation()
+    Scheduler(restarts=8, seed=2, day_cache_size=0, instrument=serial).plan(relatives, modes)
+    pooled = Instrumentation()
+    Scheduler(restarts=8, seed=2, workers=2, day_cache_size=0, instrument=pooled).plan(relatives, modes)
+    assert pooled.phases["restart"][0] == 8
+    assert pooled.counters == serial.counters
+
+    # Disabled by default: nothing recorded
+    assert Scheduler().instrument is NULL_INSTRUMENT
+    assert NULL_INSTRUMENT.summary() == {"phases": {}, "counters": {}}
+
+
+# ---------------------------------------------------------
+# TEST 23 — Synthetic Instances
+# ---------------------------------------------------------
+def test_synthetic_relatives_are_seeded_and_loadable(tmp_path):
+    relatives = generate_relatives(50, seed=4, days_per_relative=3, durations=(30,))
+    again = generate_relatives(50, seed=4, days_per_relative=3, durations=(30,))
+    assert [(r.latitude, r.preferred_days) for r in relatives] == \
+        [(r.latitude, r.preferred_days) for r in again]
+    assert all(len(r.preferred_days) == 3 and r.duration == 30 for r in relatives)
+
+    path = str(tmp_path / "relatives.csv")
+    write_relatives_csv(path, relatives)
+    loader = DataLoader()
+    loaded = loader.load_relatives(path)
+    assert loader.error_count == 0
+    assert [(r.name, r.preferred_days, r.window_start) for r in loaded] == \
+        [(r.name, r.preferred_days, r.window_start) for r in relatives]
+
+
+# ---------------------------------------------------------
+# TEST 24 — OD Matrix Travel
+# ---------------------------------------------------------
+def test_od_matrix_overrides_haversine(tmp_path):
+    import pickle
+
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+    names = [r.name for r in relatives]
+    n, m = len(names), len(modes)
+
+    # Known minutes/cost for every pair except those leaving the first relative
+    minutes = np.full((n, n, m), 7.0)
+    cost = np.full((n, n, m), 3.0)
+    minutes[0] = np.nan
+    od = write_od_matrix(str(tmp_path / "od.npy"), names, [x.name for x in modes], minutes, cost)
+    assert isinstance(od.data, np.memmap)
+    od = loader.load_od_matrix(str(tmp_path / "od.json"))
+
+    plain = Scheduler()
+    plain.build_travel_table(relatives, modes)
+    scheduler = Scheduler(od_matrix=od)
+    table = scheduler.build_travel_table(relatives, modes)
+    i, j = scheduler.index[names[1]], scheduler.index[names[2]]
+    assert all((t, c) == (7.0, 3.0) for _, t, c in table.options(i, j))
+    assert [mode.name for mode, _, _ in table.options(i, j)] == \
+        [mode.name for mode, _, _ in plain.travel.options(i, j)]
+    first = scheduler.index[names[0]]
+    assert table.options(first, j) == plain.travel.options(first, j)
+
+    # Lazy rows match dense ones; pickling keeps only the path
+    lazy = TravelTable(scheduler.distances, modes, scheduler.distance_band,
+                       table.band_modes, dense_limit=0, od=od, names=names)
+    for a in range(n):
+        for b in range(n):
+            assert lazy.options(a, b) == table.options(a, b)
+    assert isinstance(pickle.loads(pickle.dumps(od)).data, np.memmap)
+
+    schedule, totals = Scheduler(restarts=5, seed=1, od_matrix=od).plan(relatives, modes)
+    legs = [v for visits in schedule.values() for v in visits if v["mode"] != "Start"]
+    assert legs and totals["final_score"] is not None
+
+    # OD travel has no distance bound: grid search falls back to everyone
+    grid = Scheduler(restarts=5, seed=1, od_matrix=od, candidate_search="grid")
+    assert grid.plan(relatives, modes) == (schedule, totals)
+    nearest = Scheduler(restarts=5, seed=1, od_matrix=od, candidate_search="grid", candidate_k=2)
+    names = [v["name"] for visits in nearest.plan(relatives, modes)[0].values() for v in visits]
+    assert len(names) == len(set(names))
+
+
+# ---------------------------------------------------------
+# TEST 25 — Planning Service
+# ---------------------------------------------------------
+def test_service_plans_coalesces_and_reports_latency(tmp_path, monkeypatch):
+    import asyncio
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    socket_path = str(tmp_path / "planner.sock")
+    planner = service.PlanningService(socket_path, workers=0)
+    ready = threading.Event()
+    thread = threading.Thread(target=lambda: asyncio.run(planner.serve(ready)))
+    thread.start()
+    try:
+        assert ready.wait(30)
+        reply = service.request(socket_path, {"command": "plan", "seed": 1, "restarts": 20, "id": 7})
+        assert reply["ok"] and reply["id"] == 7
+        relatives = DataLoader().load_relatives("relatives.csv")
+        modes = DataLoader().load_transport("transport.csv")
+        _, totals = Scheduler(seed=1, restarts=20).plan(relatives, modes)
+        assert reply["result"]["totals"]["final_score"] == pytest.approx(totals["final_score"])
+
+        # Hold the computation until every identical request has arrived
+        gate = threading.Event()
+        real_plan = service._plan_request
+
+        def gated_plan(*args):
+            assert gate.wait(30)
+            return real_plan(*args)
+
+        monkeypatch.setattr(service, "_plan_request", gated_plan)
+        message = {"command": "plan", "seed": 2, "restarts": 20}
+        with ThreadPoolExecutor(3) as pool:
+            replies = [pool.submit(service.request, socket_path, message) for _ in range(3)]
+            while planner.coalesced < 2:
+                time.sleep(0.01)
+            gate.set()
+            scores = {r.result()["result"]["totals"]["final_score"] for r in replies}
+        assert len(scores) == 1
+
+        assert not service.request(socket_path, {"command": "plan", "bogus": 1})["ok"]
+        stats = service.request(socket_path, {"command": "stats"})["result"]
+        assert stats["computed"] == 2 and stats["coalesced"] == 2 and stats["errors"] == 1
+        latency = stats["latency_ms"]["plan"]
+        assert latency["count"] == 5 and latency["p50"] <= latency["p99"] <= latency["max"]
+    finally:
+        service.request(socket_path, {"command": "shutdown"})
+        thread.join(30)
+    assert not thread.is_alive() and not os.path.exists(socket_path)
+
+
+def test_service_exact_request_after_greedy_drops_restart_stats():
+    dataset = service._dataset("relatives.csv", "transport.csv")
+    greedy = service._plan_request(dataset, {"seed": 1, "restarts": 5}, None)
+    assert greedy["search_stats"]["restarts_run"] == 5
+
+    # Same warm scheduler, exact solver: no restart stats carried over
+    exact = service._plan_request(dataset, {"solver": "exact", "exact_time_limit": 5.0}, None)
+    assert exact["search_stats"] == {}
+
+
+# ---------------------------------------------------------
+# TEST 26 — Incremental Re-Planning
+# ---------------------------------------------------------
+def test_replan_keeps_untouched_days():
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+    scheduler = Scheduler(seed=1, restarts=30)
+    schedule, _ = scheduler.plan(relatives, modes)
+
+    day, visits = next((d, v) for d, v in schedule.items() if v)
+    cancelled = visits[0]["name"]
+    repaired, totals = scheduler.replan(schedule, {"cancel": [cancelled]})
+    stats = scheduler.replan_stats
+    assert day in stats["days_resolved"]
+    for d in stats["days_kept"]:
+        assert repaired[d] == schedule[d]
+    names = [v["name"] for vs in repaired.values() for v in vs]
+    assert cancelled not in names and len(names) == len(set(names))
+    assert totals == ScoringEngine().compute_total_score(
+        repaired, [r for r in relatives if r.name != cancelled]
+    )
+
+    # A new relative only reopens their preferred days
+    newcomer = Relative("Newcomer", relatives[0].latitude, relatives[0].longitude,
+                        ["Sat"], ("10:00", "20:00"), 10, "Jung-gu", 45)
+    added, _ = scheduler.replan(repaired, {"add": [newcomer]})
+    assert scheduler.replan_stats["days_resolved"] == ["Sat"]
+    assert {d: v for d, v in added.items() if d != "Sat"} == \
+        {d: v for d, v in repaired.items() if d != "Sat"}
+
+    with pytest.raises(ValueError):
+        scheduler.replan(added, {"cancel": ["Nobody"]})
+
+
+def test_replan_places_added_relative_who_fits():
+    # Greedy re-runs pick by travel time; the newcomer is inserted into
+    # the kept Saturday (or swapped for one visit) instead of dropped
+    relatives = generate_relatives(300)
+    modes = generate_transport()
+    for seed in (0, 7):
+        scheduler = Scheduler(seed=seed, restarts=10)
+        schedule, _ = scheduler.plan(relatives, modes)
+        newcomer = Relative("Newcomer", 37.55, 126.98, ["Sat"], ("10:00", "21:00"),
+                            8, "Jung-gu", 60)
+        repaired, _ = scheduler.replan(schedule, {"add": [newcomer]})
+        assert "Newcomer" in [v["name"] for v in repaired["Sat"]]
+        names = [v["name"] for visits in repaired.values() for v in visits]
+        assert len(names) == len(set(names))
+
+
+# ---------------------------------------------------------
+# TEST 27 — Persistent Result Cache
+# ---------------------------------------------------------
+def test_result_cache_hits_evicts_and_restores_maps(tmp_path):
+    loader = DataLoader()
+    relatives = loader.load_relatives("relatives.csv")
+    modes = loader.load_transport("transport.csv")
+    cache = ResultCache(str(tmp_path / "results"))
+
+    first = Scheduler(seed=3, restarts=20, result_cache=cache)
+    schedule, totals = first.plan(relatives, modes)
+    second = Scheduler(seed=3, restarts=20, result_cache=cache)
+    assert second.plan(relatives, modes) == (schedule, totals)
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    assert second.search_stats["result_cache"] == "hit"
+    assert second.rescore(relatives, modes, 0.1, 0.02)[1]["final_score"] == pytest.approx(
+        Scheduler(seed=3, restarts=20, alpha=0.1).plan(relatives, modes)[1]["final_score"]
+    )
+
+    # Other weights, no seed or a time budget: not this entry / not cached
+    assert Scheduler(seed=3, restarts=20, alpha=0.1).result_key(relatives, modes) is None
+    assert Scheduler(seed=3, restarts=20, alpha=0.1, result_cache=cache).result_key(
+        relatives, modes) != first.result_key(relatives, modes)
+    assert Scheduler(restarts=20, result_cache=cache).result_key(relatives, modes) is None
+    assert Scheduler(seed=3, time_budget=1, result_cache=cache).result_key(relatives, modes) is None
+    in_memory = ODMatrix([r.name for r in relatives], [m.name for m in modes],
+                         np.full((len(relatives), len(relatives), len(modes), 2), 5.0))
+    assert Scheduler(seed=3, od_matrix=in_memory, result_cache=cache).result_key(
+        relatives, modes) is None
+
+    # Maps of a cached result are copied back, not drawn
+    save_path = str(tmp_path / "maps" / "route.png")
+    os.makedirs(os.path.dirname(save_path))
+    drawn = first.plot_route_multi_day(schedule, save_path, dpi=20)
+    for path in drawn:
+        os.remove(path)
+    os.remove(str(tmp_path / "maps" / "route.render.json"))
+    restored = second.plot_route_multi_day(schedule, save_path, dpi=20)
+    assert sorted(restored) == sorted(drawn) and all(os.path.exists(p) for p in restored)
+    assert not os.path.exists(str(tmp_path / "maps" / "route.render.json"))
+
+    # Bypass recomputes; a tiny size limit evicts least recently used entries
+    bypass = ResultCache(cache.directory, bypass=True)
+    Scheduler(seed=3, restarts=20, result_cache=bypass).plan(relatives, modes)
+    assert bypass.stats()["hits"] == 0 and bypass.stats()["stores"] == 1
+    small = ResultCache(cache.directory, max_bytes=1)
+    Scheduler(seed=4, restarts=20, result_cache=small).plan(relatives, modes)
+    assert small.evictions >= 1 and len(small.entries()) <= 1
+
+    # A run that found no schedule is not stored
+    empty = ResultCache(str(tmp_path / "empty"))
+    assert Scheduler(seed=1, restarts=0, result_cache=empty).plan(relatives, modes) == (None, None)
+    assert Scheduler(seed=1, restarts=0, result_cache=empty).plan(relatives, modes) == (None, None)
+    assert empty.stats()["stores"] == 0
+
+
+def test_result_cache_hit_after_other_dataset(tmp_path):
+    modes = DataLoader().load_transport("transport.csv")
+    dataset_a = generate_relatives(40, seed=1)
+    dataset_b = generate_relatives(30, seed=2)   # same names, other places
+    cache = ResultCache(str(tmp_path / "results"))
+    Scheduler(seed=3, restarts=10, result_cache=cache).plan(dataset_b, modes)
+
+    # A's tables must not serve B's re-scoring after a hit
+    scheduler = Scheduler(seed=3, restarts=10, result_cache=cache)
+    scheduler.plan(dataset_a, modes)
+    scheduler.plan(dataset_b, modes)
+    assert scheduler.search_stats["result_cache"] == "hit"
+    fresh = Scheduler(seed=3, restarts=10)
+    fresh.plan(dataset_b, modes)
+    assert scheduler.rescore(dataset_b, modes, 0.1, 0.05) == fresh.rescore(dataset_b, modes, 0.1, 0.05)
+
+    # Re-planning a cached result that never built a table
+    cached = Scheduler(seed=3, restarts=10, result_cache=cache)
+    schedule, _ = cached.plan(dataset_b, modes)
+    assert cached.travel is None
+    name = next(v["name"] for visits in schedule.values() for v in visits)
+    repaired, _ = cached.replan(schedule, {"cancel": [name]})
+    assert name not in {v["name"] for visits in repaired.values() for v in visits}
+
+
+# ---------------------------------------------------------
+# TEST 28 — Feasibility Pre-computation
+# ---------------------------------------------------------
+def test_feasibility_drops_impossible_pairs():
+    def mon(name, window, duration):
+        return Relative(name, 37.5, 127.0, ["Mon"], window, 5, "Jung-gu", duration)
+
+    relatives = [
+        mon("Morning", ("10:00", "12:00"), 45),    # outside Minseo's hours
+        mon("Late", ("20:30", "21:00"), 60),       # cannot finish by 21:00
+        mon("Early", ("18:00", "18:30"), 45),      # closes before a first visit ends
+        mon("Open", ("18:00", "21:00"), 45),
+    ]
+    feasibility = FeasibilityTable(relatives, Scheduler().day_limits)
+    assert feasibility.rejections == {
+        "window_outside_hours": 1, "visit_too_long": 1, "after_first_visit": 1,
+    }
+    assert feasibility.first_only == ["Morning", "Late", "Early"]
+    assert feasibility.followers["Mon"].tolist() == [False, False, False, True]
+    assert not feasibility.prefers["Tue"].any()
+
+    # Same schedules with or without the grid, and new windows at the
+    # same locations are picked up by a scheduler that planned before
+    relatives = generate_relatives(300, seed=5)
+    modes = DataLoader().load_transport("transport.csv")
+    scan = Scheduler(seed=1, restarts=10).plan(relatives, modes)
+    assert Scheduler(seed=1, restarts=10, candidate_search="grid").plan(relatives, modes) == scan
+
+    widened = [Relative(r.name, r.latitude, r.longitude, r.preferred_days, ("10:00", "21:00"),
+                        r.happiness_bonus, r.district, r.duration) for r in relatives]
+    warm = Scheduler(seed=1, restarts=10)
+    warm.plan(relatives, modes)
+    assert warm.plan(widened, modes) == Scheduler(seed=1, restarts=10).plan(widened, modes)
+    assert warm.feasibility.rejected() == 0
+    for day, visits in scan[0].items():
+        for v in visits[1:]:
+            r = next(r for r in relatives if r.name == v["name"])
+            assert r.window_start <= v["arrival"] <= r.window_end
+
+
+# ---------------------------------------------------------
+# TEST 29 — Transport-Mode Policy
+# ---------------------------------------------------------
+def test_mode_policy_bands_and_dominance(tmp_path):
+    loader = DataLoader()
+    modes = loader.load_transport("transport.csv")
+    bundled = loader.load_mode_policy("mode_policy.csv")
+    assert bundled.key() == ModePolicy().key()
+
+    # Same bands as the original rules: <1 walking, 1-3 bicycle, >3 bus/train
+    scheduler = Scheduler(mode_policy=bundled)
+    for dist, expected in [(0.0, ["Walking"]), (0.999, ["Walking"]), (1.0, ["Bicycle"]),
+                           (3.0, ["Bicycle"]), (3.0000001, ["Bus", "Train"]), (40, ["Bus", "Train"])]:
+        assert [m.name for m in scheduler.select_modes_for_distance(dist, modes)] == expected
+    np.testing.assert_array_equal(
+        scheduler.policy.band_of(np.array([0.5, 1.0, 3.0, 3.5])), [0, 1, 1, 2]
+    )
+
+    # A taxi slower than the train and dearer than the bus is never tried
+    taxi = modes + [TransportMode("Taxi", 30, 10, 3)]
+    path = tmp_path / "mode_policy.csv"
+    path.write_text("FromKm,Modes\n>3,bus;Train;TAXI\n0,Walking;Bicycle\n")
+    policy = loader.load_mode_policy(str(path))
+    assert policy.compile(taxi).band_modes == [(2, 3), (0, 1)]
+    assert policy.compile(taxi).pruned == [(), ("Taxi",)]
+    assert ModePolicy(policy.bands, prune_dominated=False).compile(taxi).band_modes[1] == (0, 1, 4)
+
+    relatives = generate_relatives(200, seed=2)
+    pruned = Scheduler(seed=1, restarts=5, mode_policy=policy)
+    assert all(v["mode"] != "Taxi" for visits in pruned.plan(relatives, taxi)[0].values()
+               for v in visits)
+
+    path.write_text("FromKm,Modes\n1,Bicycle\n")
+    with pytest.raises(ValueError):
+        loader.load_mode_policy(str(path))
+
+
+# ---------------------------------------------------------
+# TEST 30 — Vectorized Candidate Evaluation
+# ---------------------------------------------------------
+@pytest.mark.parametrize("preference", ["time", "cost"])
+@pytest.mark.parametrize("options", [{}, {"candidate_search": "grid", "candidate_k": 8}])
+def test_vector_candidate_eval_matches_scalar(preference, options):
+    relatives = generate_relatives(300, seed=7, days_per_relative=4, evening_share=0.4)
+    modes = DataLoader().load_transport("transport.csv")
+
+    results = []
+    for evaluation in ("scalar", "vector"):
+        instrument = Instrumentation()
+        scheduler = Scheduler(seed=2, restarts=6, preference=preference, day_cache_size=0,
+                              candidate_eval=evaluation, instrument=instrument, **options)
+        results.append((scheduler.plan(relatives, modes), instrument.counters))
+    assert results[0] == results[1]